@@ -9,7 +9,6 @@ usando uma lista de domínios suspeitos e técnicas avançadas de detecção.
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
-import re
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 import os
@@ -17,14 +16,23 @@ import requests
 import threading
 import time
 
+from entradas_dnsmasq import CacheEntradas, inteiro_para_ip, para_datetime
+from lista_adulta import AutomatoPalavras, IndiceSufixos, gravar_palavras, ler_hosts, ler_palavras
+
+# Palavras-chave suspeitas (uma por linha): carregadas ao iniciar, se existir,
+# e regravadas quando outra lista é escolhida em "Palavras-chave"
+ARQUIVO_PALAVRAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'palavras_chave.txt')
+
 class AnalisadorDnsmasq(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Analisador dnsmasq")
         self.geometry("1000x600")
         
-        # Cache para domínios adultos
-        self.dominios_adultos = set()
+        # Cache para domínios adultos (indexado por sufixo ao carregar)
+        self.dominios_adultos = IndiceSufixos()
+        # Palavras-chave suspeitas, já compiladas no autômato
+        self.palavras_adultas = AutomatoPalavras()
         self.ultima_atualizacao = None
         self.download_em_progresso = False
         self.download_status = tk.StringVar(value="Lista de domínios não carregada")
@@ -67,6 +75,7 @@ class AnalisadorDnsmasq(tk.Tk):
         tk.Button(btn_frame, text="Analisar 😊", command=self.analisar).pack(side='left', padx=10)
         tk.Button(btn_frame, text="Analisar Domínios 📄", command=self.analisar_dominios).pack(side='left', padx=10)
         tk.Button(btn_frame, text="Atualizar Lista Adulto 🔄", command=self.iniciar_download_lista).pack(side='left', padx=10)
+        tk.Button(btn_frame, text="Palavras-chave 🔑", command=self.selecionar_palavras_chave).pack(side='left', padx=10)
         tk.Button(btn_frame, text="Adulto 🚫", command=self.analisar_adulto).pack(side='left', padx=10)
         tk.Button(btn_frame, text="Salvar Relatório 💾", command=self.salvar_relatorio).pack(side='left', padx=10)
         
@@ -77,9 +86,13 @@ class AnalisadorDnsmasq(tk.Tk):
         self.txt_relatorio = scrolledtext.ScrolledText(self, wrap='none', font=('Courier', 10))
         self.txt_relatorio.pack(fill='both', expand=True, padx=10, pady=5)
         self.relatorio_texto = ''
+        # Logs já lidos: trocar de relatório ou de período não relê o arquivo
+        self.cache_entradas = CacheEntradas()
+        self.entradas = None
         self.entradas_filtradas = []
         
-        # Iniciar download da lista automaticamente
+        # Palavras-chave salvas e download da lista automaticamente
+        self._carregar_palavras_salvas()
         self.after(1000, self.iniciar_download_lista)
 
     def selecionar_arquivo(self):
@@ -91,6 +104,40 @@ class AnalisadorDnsmasq(tk.Tk):
             self.entry_file.delete(0, 'end')
             self.entry_file.insert(0, arquivo)
 
+    def selecionar_palavras_chave(self):
+        arquivo = filedialog.askopenfilename(
+            title="Selecione o arquivo de palavras-chave",
+            filetypes=[("Texto","*.txt"),("Todos","*.*")]
+        )
+        if not arquivo:
+            return
+        try:
+            palavras = ler_palavras(arquivo)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao ler palavras-chave: {e}")
+            return
+        if not palavras:
+            messagebox.showwarning("Atenção", "Nenhuma palavra-chave encontrada no arquivo.")
+            return
+        self.palavras_adultas = AutomatoPalavras(palavras)
+        try:
+            gravar_palavras(palavras, ARQUIVO_PALAVRAS)
+        except Exception as e:
+            messagebox.showwarning("Atenção", f"{len(palavras)} palavras-chave carregadas só nesta sessão; falha ao salvar: {e}")
+            return
+        messagebox.showinfo("Palavras-chave", f"{len(palavras)} palavras-chave carregadas e salvas em {ARQUIVO_PALAVRAS}.")
+
+    def _carregar_palavras_salvas(self):
+        if not os.path.exists(ARQUIVO_PALAVRAS):
+            return
+        try:
+            palavras = ler_palavras(ARQUIVO_PALAVRAS)
+        except Exception as e:
+            self.after(0, lambda erro=e: messagebox.showerror("Erro", f"Falha ao ler {ARQUIVO_PALAVRAS}: {erro}"))
+            return
+        if palavras:
+            self.palavras_adultas = AutomatoPalavras(palavras)
+
     def iniciar_download_lista(self):
         if self.download_em_progresso:
             messagebox.showinfo("Download em andamento", "Já existe um download em andamento. Por favor, aguarde.")
@@ -106,17 +153,7 @@ class AnalisadorDnsmasq(tk.Tk):
             response = requests.get(url)
             response.raise_for_status()
             
-            dominios = set()
-            linhas = response.text.splitlines()
-            
-            for linha in linhas:
-                linha = linha.strip()
-                if linha and not linha.startswith('#'):
-                    partes = linha.split()
-                    if len(partes) >= 2 and partes[0] == '0.0.0.0':
-                        dominios.add(partes[1].lower())
-            
-            self.dominios_adultos = dominios
+            self.dominios_adultos = IndiceSufixos(ler_hosts(response.text))
             self.ultima_atualizacao = datetime.now()
             
             # Atualizar a interface do usuário no thread principal
@@ -137,26 +174,11 @@ class AnalisadorDnsmasq(tk.Tk):
         if not caminho or not os.path.isfile(caminho):
             messagebox.showerror("Erro", "Arquivo inválido ou não selecionado :(")
             return None
-        padrao = re.compile(
-            r'^(?P<mes>\w+)\s+(?P<dia>\d+)\s+(?P<hora>\d+:\d+:\d+).+?'
-            r'query\[(?P<tipo>\w+)\]\s+(?P<dominio>\S+)\s+from\s+(?P<ip>\d+\.\d+\.\d+\.\d+)'
-        )
-        entradas = []
-        ano = datetime.now().year
         try:
-            with open(caminho, 'r', encoding='utf-8', errors='ignore') as f:
-                for linha in f:
-                    m = padrao.search(linha)
-                    if m:
-                        mes = datetime.strptime(m.group('mes'), '%b').month
-                        dia = int(m.group('dia'))
-                        h, mn, s = map(int, m.group('hora').split(':'))
-                        dt = datetime(ano, mes, dia, h, mn, s)
-                        entradas.append({'dt': dt, 'tipo': m.group('tipo'), 'dominio': m.group('dominio').lower(), 'ip': m.group('ip')})
+            return self.cache_entradas.obter(caminho)
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao ler o arquivo: {e}")
             return None
-        return entradas
 
     def _filtrar_periodo(self, entradas):
         periodo = self.var_periodo.get()
@@ -165,7 +187,7 @@ class AnalisadorDnsmasq(tk.Tk):
         elif periodo == 'week': inicio = (agora - timedelta(days=6)).replace(hour=0, minute=0, second=0)
         elif periodo == 'month': inicio = agora.replace(day=1, hour=0, minute=0, second=0)
         else: inicio = None
-        return [e for e in entradas if inicio is None or e['dt'] >= inicio]
+        return entradas.desde(inicio)
 
     def analisar(self):
         entradas = self._ler_entradas()
@@ -173,10 +195,12 @@ class AnalisadorDnsmasq(tk.Tk):
         try: n = int(self.spin_n.get())
         except: n = 10
         filtradas = self._filtrar_periodo(entradas)
-        cont_dom = Counter(e['dominio'] for e in filtradas)
-        cont_ip = Counter(e['ip'] for e in filtradas)
-        cont_hora = Counter(e['dt'].hour for e in filtradas)
-        cont_tipo = Counter(e['tipo'] for e in filtradas)
+        # Contagens pelos ids das colunas; os nomes só são buscados para exibir
+        cont_dom = Counter(entradas.coluna(entradas.dominios, filtradas))
+        cont_ip = Counter(entradas.coluna(entradas.ips, filtradas))
+        cont_hora = Counter(t // 3600 % 24 for t in entradas.coluna(entradas.instantes, filtradas))
+        cont_tipo = Counter(entradas.coluna(entradas.tipos, filtradas))
+        dominios, tipos = entradas.nomes_dominios.nomes, entradas.nomes_tipos.nomes
         total = len(filtradas)
         periodo = self.var_periodo.get()
         agora = datetime.now()
@@ -188,13 +212,13 @@ class AnalisadorDnsmasq(tk.Tk):
                        f"Gerado em: {agora.strftime('%Y-%m-%d %H:%M:%S')}", border,
                        f"Total de consultas: {total}", f"Domínios únicos: {len(cont_dom)}", f"IPs únicos: {len(cont_ip)}", border,
                        f" TOP {n} DOMÍNIOS ", border])
-        for dom, cnt in cont_dom.most_common(n): linhas.append(f" {dom:<30} {cnt:>5}")
+        for dom, cnt in cont_dom.most_common(n): linhas.append(f" {dominios[dom]:<30} {cnt:>5}")
         linhas.extend([border, f" TOP {n} IPS CLIENTES ", border])
-        for ip, cnt in cont_ip.most_common(n): linhas.append(f" {ip:<30} {cnt:>5}")
+        for ip, cnt in cont_ip.most_common(n): linhas.append(f" {inteiro_para_ip(ip):<30} {cnt:>5}")
         linhas.extend([border, f" CONSULTAS POR HORA ", border])
         for h in sorted(cont_hora): linhas.append(f" {h:02d}:00 {' '*25}{cont_hora[h]:>5}")
         linhas.extend([border, f" CONSULTAS POR TIPO ", border])
-        for t, cnt in cont_tipo.items(): linhas.append(f" {t:<30} {cnt:>5}")
+        for t, cnt in cont_tipo.items(): linhas.append(f" {tipos[t]:<30} {cnt:>5}")
         linhas.append(border)
 
         self.relatorio_texto = "\n".join(linhas)
@@ -207,9 +231,10 @@ class AnalisadorDnsmasq(tk.Tk):
     def analisar_dominios(self):
         entradas = self._ler_entradas()
         if entradas is None: return
+        self.entradas = entradas
         self.entradas_filtradas = self._filtrar_periodo(entradas)
         
-        ips_unicos = sorted(set(e['ip'] for e in self.entradas_filtradas))
+        ips_unicos = sorted(inteiro_para_ip(ip) for ip in set(entradas.coluna(entradas.ips, self.entradas_filtradas)))
         self.combo_ip['values'] = ['Todos'] + ips_unicos
         self.combo_ip.current(0)
         
@@ -224,19 +249,20 @@ class AnalisadorDnsmasq(tk.Tk):
         if ip_selecionado == 'Todos':
             filtradas = self.entradas_filtradas
         else:
-            filtradas = [e for e in self.entradas_filtradas if e['ip'] == ip_selecionado]
+            filtradas = self.entradas.do_ip(self.entradas_filtradas, ip_selecionado)
         self._gerar_relatorio_dominios(filtradas)
 
     def _gerar_relatorio_dominios(self, filtradas):
+        entradas = self.entradas
+        dominios, instantes, ips = entradas.dominios, entradas.instantes, entradas.ips
         cont = Counter()
-        last_dt = defaultdict(lambda: datetime.min)
-        last_ip = {}
-        for e in filtradas:
-            dom = e['dominio']
+        ultimo = {}  # id do domínio -> (instante, ip) do último acesso
+        for i in filtradas:
+            dom = dominios[i]
             cont[dom] += 1
-            if e['dt'] >= last_dt[dom]:
-                last_dt[dom] = e['dt']
-                last_ip[dom] = e['ip']
+            anterior = ultimo.get(dom)
+            if anterior is None or instantes[i] >= anterior[0]:
+                ultimo[dom] = (instantes[i], ips[i])
         
         agora = datetime.now()
         periodo = self.var_periodo.get()
@@ -250,10 +276,11 @@ class AnalisadorDnsmasq(tk.Tk):
         border2 = '+' + '-'*40 + '+' + '-'*7 + '+' + '-'*20 + '+' + '-'*15 + '+'
         linhas.extend([border, f"|{hdr}|", border,
                        f"Gerado em: {agora.strftime('%Y-%m-%d %H:%M:%S')}", border, col_head, border2])
+        nomes = entradas.nomes_dominios.nomes
         for dom, cnt in cont.most_common():
-            dt_str = last_dt[dom].strftime('%Y-%m-%d %H:%M:%S')
-            ip = last_ip.get(dom, '')
-            linhas.append(f" {dom:<40} {cnt:>7} {dt_str:>20} {ip:>15}")
+            instante, ip = ultimo[dom]
+            dt_str = para_datetime(instante).strftime('%Y-%m-%d %H:%M:%S')
+            linhas.append(f" {nomes[dom]:<40} {cnt:>7} {dt_str:>20} {inteiro_para_ip(ip):>15}")
         linhas.append(border2)
         
         self.relatorio_texto = "\n".join(linhas)
@@ -273,77 +300,23 @@ class AnalisadorDnsmasq(tk.Tk):
         
         filtradas = self._filtrar_periodo(entradas)
         
-        # Análise avançada de domínios
-        acessos_adultos = []
-        dominios_analisados = {}  # Cache para análises anteriores
-        
-        # Palavras-chave suspeitas adicionais para verificação
-        palavras_chave = [
-            'xxx', 'porn', 'adult', 'sex', 'nude', 'naked', 
-            'escort', 'cam', 'mature', 'fuck', 'xnxx', 'redtube', 
-            'xvideos', 'penis', 'vagina', 'hardcore'
-        ]
+        # Análise avançada: uma vez por domínio distinto (id), não por consulta
+        nomes = entradas.nomes_dominios.nomes
+        razoes = {}
+        for dom in set(entradas.coluna(entradas.dominios, filtradas)):
+            razao = self._classificar_dominio(nomes[dom])
+            if razao is not None:
+                razoes[dom] = razao
         
-        for entrada in filtradas:
-            dominio = entrada['dominio'].lower()
-            
-            # Verifica cache para evitar análises repetidas
-            if dominio in dominios_analisados:
-                if dominios_analisados[dominio]['classificacao'] == 'adulto':
-                    entrada_copy = entrada.copy()
-                    entrada_copy['razao'] = dominios_analisados[dominio]['razao']
-                    acessos_adultos.append(entrada_copy)
-                continue
-            
-            classificacao = 'normal'
-            razao = None
-            
-            # 1. Verificação direta na lista de domínios adultos
-            if dominio in self.dominios_adultos:
-                classificacao = 'adulto'
-                razao = "Correspondência exata na lista"
-            
-            # 2. Verificação de domínio raiz na lista (ignora subdomínios)
-            elif any(dominio.endswith('.' + d) for d in self.dominios_adultos):
-                classificacao = 'adulto'
-                for d in self.dominios_adultos:
-                    if dominio.endswith('.' + d):
-                        razao = f"Domínio raiz '{d}' está na lista"
-                        break
-            
-            # 3. Verificação de subdomínios
-            else:
-                partes = dominio.split('.')
-                for i in range(1, len(partes)):
-                    subdominio = '.'.join(partes[i:])
-                    if subdominio in self.dominios_adultos:
-                        classificacao = 'adulto'
-                        razao = f"Subdomínio '{subdominio}' está na lista"
-                        break
-            
-            # 4. Análise de palavras-chave no domínio
-            if classificacao == 'normal':
-                encontradas = []
-                # Verifica palavras-chave suspeitas
-                for palavra in palavras_chave:
-                    if palavra in dominio:
-                        encontradas.append(palavra)
-                
-                if encontradas:
-                    classificacao = 'adulto'
-                    razao = f"Palavras-chave suspeitas: {', '.join(encontradas)}"
-            
-            # Salva resultado no cache
-            dominios_analisados[dominio] = {
-                'classificacao': classificacao,
-                'razao': razao
-            }
-            
-            # Adiciona à lista de acessos adultos se classificado como tal
-            if classificacao == 'adulto':
-                entrada_copy = entrada.copy()
-                entrada_copy['razao'] = razao
-                acessos_adultos.append(entrada_copy)
+        # Só as consultas classificadas como adulto viram dicionários
+        acessos_adultos = []
+        dominios = entradas.dominios
+        for i in filtradas:
+            razao = razoes.get(dominios[i])
+            if razao is not None:
+                acesso = entradas.entrada(i)
+                acesso['razao'] = razao
+                acessos_adultos.append(acesso)
         
         # Estatísticas
         self.estatisticas_adulto = {
@@ -355,6 +328,24 @@ class AnalisadorDnsmasq(tk.Tk):
         
         self._gerar_relatorio_adulto(acessos_adultos)
 
+    def _classificar_dominio(self, dominio):
+        """
+        Motivo pelo qual o domínio é considerado adulto, ou None se não for.
+        """
+        # 1. Verificação do domínio e dos seus domínios pai na lista
+        encontrado = self.dominios_adultos.procurar(dominio)
+        if encontrado is not None:
+            entrada, exata = encontrado
+            if exata:
+                return "Correspondência exata na lista"
+            return f"Domínio raiz '{entrada}' está na lista"
+        
+        # 2. Análise de palavras-chave no domínio (todas em uma passada)
+        encontradas = self.palavras_adultas.encontrar(dominio)
+        if encontradas:
+            return f"Palavras-chave suspeitas: {', '.join(encontradas)}"
+        return None
+
     def _gerar_relatorio_adulto(self, acessos):
         if not acessos:
             messagebox.showinfo("Informação", "Nenhum acesso a conteúdo adulto detectado.")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mede a velocidade do leitor de logs do dnsmasq (entradas_dnsmasq) em um
+log sintético do tamanho pedido, no formato do syslog do OpenWRT: cerca de
+um terço das linhas são consultas (query[...]), o resto reply/forwarded/
+cached e mensagens do DHCP.
+
+Uso:
+  python3 benchmark_leitor_dnsmasq.py [--tamanho 2048] [--arquivo log.txt]
+                                      [--manter] [--comparar 64]
+
+--comparar N também mede, nos primeiros N MB, o leitor antigo (regex +
+strptime + um dicionário por linha), como referência.
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from entradas_dnsmasq import ler_entradas
+
+MB = 1 << 20
+
+# Blocos distintos de linhas sintéticas, repetidos até atingir o tamanho
+BLOCOS = 64
+LINHAS_POR_BLOCO = 3000
+
+
+def _bloco_sintetico(rng, inicio):
+    dominios = [f"www.site{i}.com" for i in range(5000)] + [f"cdn{i}.exemplo.net" for i in range(500)]
+    clientes = [f"192.168.1.{i}" for i in range(2, 60)]
+    linhas = []
+    instante = inicio
+    while len(linhas) < LINHAS_POR_BLOCO:
+        instante += timedelta(seconds=rng.randint(0, 3))
+        ts = f"{instante:%b} {instante.day:>2} {instante:%H:%M:%S}"
+        dominio = rng.choice(dominios)
+        linhas.append(f"{ts} dnsmasq[1234]: query[{rng.choice(('A', 'A', 'AAAA', 'HTTPS'))}] {dominio} from {rng.choice(clientes)}\n")
+        if rng.random() < 0.7:
+            linhas.append(f"{ts} dnsmasq[1234]: forwarded {dominio} to 8.8.8.8\n")
+            linhas.append(f"{ts} dnsmasq[1234]: reply {dominio} is 93.184.216.{rng.randint(1, 254)}\n")
+        else:
+            linhas.append(f"{ts} dnsmasq[1234]: cached {dominio} is 93.184.216.{rng.randint(1, 254)}\n")
+        if rng.random() < 0.01:
+            linhas.append(f"{ts} dnsmasq-dhcp[1234]: DHCPACK(br-lan) 192.168.1.{rng.randint(2, 59)} aa:bb:cc:dd:ee:ff host\n")
+    return "".join(linhas).encode(), len(linhas)
+
+
+def gerar_log(caminho, tamanho):
+    """
+    Grava um log sintético com pelo menos 'tamanho' bytes. Retorna o total de linhas.
+    """
+    rng = random.Random(42)
+    inicio = datetime.now() - timedelta(days=7)
+    blocos = [_bloco_sintetico(rng, inicio + timedelta(hours=i)) for i in range(BLOCOS)]
+    escritos = linhas = 0
+    with open(caminho, 'wb') as f:
+        while escritos < tamanho:
+            dados, quantidade = blocos[rng.randrange(BLOCOS)]
+            f.write(dados)
+            escritos += len(dados)
+            linhas += quantidade
+    return linhas
+
+
+def ler_regex(caminho, limite):
+    """
+    Leitor antigo do analisador (referência), nos primeiros 'limite' bytes.
+    """
+    padrao = re.compile(
+        r'^(?P<mes>\w+)\s+(?P<dia>\d+)\s+(?P<hora>\d+:\d+:\d+).+?'
+        r'query\[(?P<tipo>\w+)\]\s+(?P<dominio>\S+)\s+from\s+(?P<ip>\d+\.\d+\.\d+\.\d+)'
+    )
+    entradas = []
+    ano = datetime.now().year
+    lidos = linhas = 0
+    with open(caminho, 'r', encoding='utf-8', errors='ignore') as f:
+        for linha in f:
+            lidos += len(linha)
+            linhas += 1
+            if lidos > limite:
+                break
+            m = padrao.search(linha)
+            if m:
+                mes = datetime.strptime(m.group('mes'), '%b').month
+                h, mn, s = map(int, m.group('hora').split(':'))
+                dt = datetime(ano, mes, int(m.group('dia')), h, mn, s)
+                entradas.append({'dt': dt, 'tipo': m.group('tipo'), 'dominio': m.group('dominio').lower(), 'ip': m.group('ip')})
+    return linhas, len(entradas)
+
+
+def _relatorio(nome, linhas, consultas, nbytes, segundos):
+    print(f"{nome}: {linhas:,} linhas ({consultas:,} consultas, {nbytes / MB:,.0f} MB) em {segundos:.2f}s "
+          f"-> {linhas / segundos:,.0f} linhas/s, {nbytes / MB / segundos:,.1f} MB/s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark do leitor de logs do dnsmasq")
+    parser.add_argument('--tamanho', type=int, default=2048, help="tamanho do log sintético em MB")
+    parser.add_argument('--arquivo', help="caminho do log (padrão: arquivo temporário)")
+    parser.add_argument('--manter', action='store_true', help="não apagar o log ao terminar")
+    parser.add_argument('--comparar', type=int, default=0, help="MB lidos também pelo leitor antigo")
+    args = parser.parse_args()
+
+    caminho = args.arquivo or os.path.join(tempfile.gettempdir(), 'dnsmasq_sintetico.log')
+    try:
+        if not os.path.exists(caminho) or os.path.getsize(caminho) < args.tamanho * MB:
+            print(f"Gerando {args.tamanho} MB em {caminho}...")
+            gerar_log(caminho, args.tamanho * MB)
+        tamanho = os.path.getsize(caminho)
+
+        inicio = time.perf_counter()
+        with open(caminho, 'rb') as f:
+            linhas = sum(bloco.count(b'\n') for bloco in iter(lambda: f.read(1 << 24), b''))
+        print(f"Contagem de linhas (limite de E/S): {time.perf_counter() - inicio:.2f}s")
+
+        inicio = time.perf_counter()
+        entradas = ler_entradas(caminho)
+        _relatorio("Leitor em bytes", linhas, len(entradas), tamanho, time.perf_counter() - inicio)
+
+        if args.comparar:
+            limite = min(args.comparar * MB, tamanho)
+            inicio = time.perf_counter()
+            linhas_regex, consultas = ler_regex(caminho, limite)
+            _relatorio("Leitor antigo (regex)", linhas_regex, consultas, limite, time.perf_counter() - inicio)
+    finally:
+        if not args.manter and not args.arquivo and os.path.exists(caminho):
+            os.remove(caminho)
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Armazenamento colunar das consultas lidas de um log do dnsmasq.
+
+Em vez de um dicionário por linha (datetime + strings), cada campo fica em
+um array compacto da biblioteca padrão:
+  - instantes: segundos desde 1970-01-01 (hora local do log, sem fuso);
+  - dominios: id do domínio (minúsculo) na tabela de nomes internados;
+  - ips: IPv4 como inteiro de 32 bits;
+  - tipos: id do tipo de consulta (A, AAAA, ...) na tabela de tipos.
+São ~17 bytes por consulta, e as colunas expõem o protocolo de buffer
+(numpy.frombuffer as lê sem cópia).
+
+O log é lido como bytes, em blocos grandes; as linhas sem "query["
+(reply/forwarded/cached, DHCP...) são descartadas por um teste de
+substring em C. Dia e hora saem de tabelas preenchidas na primeira
+ocorrência de cada valor (sem strptime nem datetime por linha), e o
+trecho "query[TIPO] dominio from ip", que se repete muito, é convertido
+uma única vez em (tipo, domínio, IP), pela mesma expressão regular que o
+analisador usava para a linha inteira.
+"""
+
+import os
+import re
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import compress
+
+EPOCA = datetime(1970, 1, 1)
+
+# Bytes lidos do arquivo por vez
+BLOCO_LEITURA = 1 << 20
+
+# Trechos "query[...] ... from ..." distintos guardados antes de limpar a tabela
+LIMITE_CONSULTAS = 1 << 20
+
+# Bytes iniciais comparados para detectar um log reescrito no mesmo inode
+BYTES_ASSINATURA = 4096
+
+# Logs mantidos em memória pelo CacheEntradas
+MAXIMO_ARQUIVOS = 3
+
+# Trecho da consulta, como na expressão regular original do analisador
+CONSULTA = re.compile(rb'query\[(\w+)\]\s+(\S+)\s+from\s+(\d+\.\d+\.\d+\.\d+)')
+
+MESES = {}
+for _numero, _nome in enumerate(
+        ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), start=1):
+    for _variante in (_nome, _nome.lower(), _nome.upper()):
+        MESES[_variante.encode()] = _numero
+
+
+def para_segundos(dt):
+    return (dt - EPOCA) // timedelta(seconds=1)
+
+
+def para_datetime(segundos):
+    return EPOCA + timedelta(seconds=segundos)
+
+
+def ip_para_inteiro(ip):
+    a, b, c, d = (int(parte) for parte in ip.split('.'))
+    if max(a, b, c, d) > 255:
+        raise ValueError(f"IPv4 inválido: {ip}")
+    return a << 24 | b << 16 | c << 8 | d
+
+
+def inteiro_para_ip(valor):
+    return f"{valor >> 24}.{valor >> 16 & 255}.{valor >> 8 & 255}.{valor & 255}"
+
+
+class TabelaNomes:
+    """
+    Strings internadas: cada nome distinto recebe um id sequencial.
+    """
+
+    def __init__(self):
+        self.nomes = []
+        self.ids = {}
+        self.ids_bytes = {}
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def id(self, nome):
+        i = self.ids.get(nome)
+        if i is None:
+            i = self.ids[nome] = len(self.nomes)
+            self.nomes.append(nome)
+        return i
+
+    def id_bytes(self, bruto, minusculo=False):
+        """
+        id de um nome ainda em bytes, como lido do log; o texto só é
+        decodificado na primeira vez que esses bytes aparecem.
+        """
+        i = self.ids_bytes.get(bruto)
+        if i is None:
+            nome = bruto.decode('utf-8', 'ignore')
+            i = self.ids_bytes[bruto] = self.id(nome.lower() if minusculo else nome)
+        return i
+
+
+class EntradasDnsmasq:
+    """
+    Consultas (query[...]) de um log, uma posição por consulta em cada coluna.
+    As seleções (períodos, IPs) são sequências de posições: um range quando
+    são contíguas, senão um array('I').
+
+    Os filtros não percorrem as colunas em Python: com os instantes em ordem
+    (o caso normal de um log), 'desde' é uma busca binária; fora de ordem
+    (virada de ano, relógio ajustado), e em 'do_ip', a comparação é feita em
+    bloco por map/compress.
+    """
+
+    def __init__(self):
+        self.instantes = array('q')
+        self.dominios = array('I')
+        self.ips = array('I')
+        self.tipos = array('B')
+        self.nomes_dominios = TabelaNomes()
+        self.nomes_tipos = TabelaNomes()
+        self._selecoes = {}  # limite -> (tamanho, seleção), para repetir períodos
+        self._verificados = 0  # instantes iniciais já conferidos quanto à ordem
+        self._ordenado = True  # esses instantes estão em ordem crescente?
+
+    def __len__(self):
+        return len(self.instantes)
+
+    def truncar(self, quantidade):
+        """
+        Descarta as consultas a partir da posição 'quantidade' (os nomes
+        internados ficam, sem efeito nos relatórios).
+        """
+        for coluna in (self.instantes, self.dominios, self.ips, self.tipos):
+            del coluna[quantidade:]
+        self._selecoes.clear()
+        if quantidade < self._verificados:
+            # Um trecho em ordem continua em ordem; fora de ordem, confere de novo
+            self._verificados = quantidade if self._ordenado else 0
+            self._ordenado = True
+
+    def acrescentar(self, instante, tipo, dominio, ip):
+        """
+        instante em segundos (para_segundos), ip como inteiro (ip_para_inteiro).
+        """
+        self.instantes.append(instante)
+        self.tipos.append(self.nomes_tipos.id(tipo))
+        self.dominios.append(self.nomes_dominios.id(dominio.lower()))
+        self.ips.append(ip)
+
+    def entrada(self, i):
+        """
+        A consulta i no formato de dicionário usado pelos relatórios.
+        """
+        return {
+            'dt': para_datetime(self.instantes[i]),
+            'tipo': self.nomes_tipos.nomes[self.tipos[i]],
+            'dominio': self.nomes_dominios.nomes[self.dominios[i]],
+            'ip': inteiro_para_ip(self.ips[i]),
+        }
+
+    # ================================================
+    # Seleções
+    # ================================================
+
+    def ordenado(self):
+        """
+        Indica se os instantes estão em ordem crescente. Só os acrescentados
+        desde a última chamada são conferidos (a comparação com a cópia
+        ordenada roda em C, linear para dados já em ordem).
+        """
+        if self._ordenado and self._verificados < len(self):
+            trecho = self.instantes[max(self._verificados - 1, 0):]
+            self._ordenado = trecho == array('q', sorted(trecho))
+        self._verificados = len(self)
+        return self._ordenado
+
+    def desde(self, inicio=None):
+        """
+        Posições das consultas em 'inicio' (datetime) ou depois (None = todas).
+        """
+        if inicio is None:
+            return range(len(self))
+        limite = para_segundos(inicio)
+        if self.ordenado():
+            return range(bisect_left(self.instantes, limite), len(self))
+        tamanho, selecao = self._selecoes.get(limite, (None, None))
+        if tamanho != len(self):
+            selecao = array('I', compress(range(len(self)), map(limite.__le__, self.instantes)))
+            self._selecoes = {limite: (len(self), selecao)}
+        return selecao
+
+    def do_ip(self, selecao, ip):
+        valor = ip_para_inteiro(ip)
+        return array('I', compress(selecao, map(valor.__eq__, self.coluna(self.ips, selecao))))
+
+    def coluna(self, coluna, selecao):
+        """
+        Valores de uma coluna nas posições selecionadas: a própria coluna se
+        forem todas, uma fatia se forem contíguas.
+        """
+        if isinstance(selecao, range) and selecao.step == 1:
+            if selecao == range(len(self)):
+                return coluna
+            return coluna[selecao.start:selecao.stop]
+        return map(coluna.__getitem__, selecao)
+
+
+class LeitorDnsmasq:
+    """
+    Converte linhas de consulta do syslog do dnsmasq, por exemplo
+      Oct 18 10:00:01 dnsmasq[1234]: query[A] www.exemplo.com from 192.168.1.10
+    nas colunas de EntradasDnsmasq. Linhas que não seguem esse formato
+    (inclusive clientes IPv6) são ignoradas; ver _consulta para as regras.
+    """
+
+    def __init__(self, entradas, ano=None):
+        self.entradas = entradas
+        self.ano = ano or datetime.now().year
+        # Tabelas preenchidas na primeira ocorrência de cada valor
+        self._dias = {}       # b'Oct 18' -> segundos da meia-noite desse dia
+        self._horas = {}      # b'10:00:01' -> segundos desde a meia-noite
+        self._ips = {}        # b'a.b.c.d' -> inteiro (-1 = octeto acima de 255)
+        self._consultas = {}  # b'query[A] x.com from a.b.c.d' -> (tipo, domínio, ip) ou None
+
+    def _instante(self, cabecalho):
+        """
+        Caminho geral para o cabeçalho "Mês dia HH:MM:SS ..." (espaçamento
+        qualquer); no formato de largura fixa do syslog, alimenta as tabelas.
+        """
+        partes = cabecalho.split(None, 3)
+        if len(partes) < 4:
+            return None
+        horario = partes[2].split(b':')
+        if len(horario) != 3 or not all(p.isdigit() for p in horario):
+            return None
+        try:
+            dia = para_segundos(datetime(self.ano, MESES[partes[0]], int(partes[1])))
+            h, mn, s = map(int, horario)
+            hora = para_segundos(datetime(1970, 1, 1, h, mn, s))
+        except (KeyError, ValueError):
+            return None
+        if cabecalho[6:7] == b' ' and cabecalho[:6].split() == partes[:2] and cabecalho[7:15] == partes[2]:
+            self._dias[cabecalho[:6]] = dia
+            self._horas[cabecalho[7:15]] = hora
+        return dia + hora
+
+    def _ip(self, texto):
+        valor = self._ips.get(texto)
+        if valor is None:
+            try:
+                valor = ip_para_inteiro(texto.decode('ascii'))
+            except ValueError:
+                valor = -1
+            self._ips[texto] = valor
+        return valor
+
+    def _consulta(self, trecho):
+        """
+        b'query[TIPO] dominio from a.b.c.d' -> (id do tipo, id do domínio, ip),
+        ou None se o trecho não estiver nesse formato.
+
+        Aceita o mesmo que a expressão regular original: TIPO com letras,
+        dígitos e "_" (query[A_B]), e o IP é o prefixo a.b.c.d do campo
+        (from 10.0.0.12x -> 10.0.0.12). A única regra mais estreita: um
+        octeto acima de 255 (from 999.1.1.1) descarta a linha, porque o IP
+        é guardado como inteiro de 32 bits.
+        """
+        encontrado = CONSULTA.match(trecho)
+        resultado = None
+        if encontrado:
+            tipo, dominio, texto_ip = encontrado.groups()
+            ip = self._ip(texto_ip)
+            if ip >= 0:
+                resultado = (
+                    self.entradas.nomes_tipos.id_bytes(tipo),
+                    self.entradas.nomes_dominios.id_bytes(dominio, minusculo=True),
+                    ip,
+                )
+        if len(self._consultas) >= LIMITE_CONSULTAS:
+            self._consultas.clear()
+        self._consultas[trecho] = resultado
+        return resultado
+
+    def analisar(self, dados):
+        """
+        Lê as consultas de um bloco de bytes com linhas completas.
+        """
+        entradas = self.entradas
+        instantes, tipos = entradas.instantes.append, entradas.tipos.append
+        dominios, ips = entradas.dominios.append, entradas.ips.append
+        dias, horas, consultas = self._dias, self._horas, self._consultas
+        for linha in [linha for linha in dados.split(b'\n') if b'query[' in linha]:
+            q = linha.find(b'query[')
+
+            # Cabeçalho do syslog de largura fixa: "Oct 18 10:00:01 "
+            dia = hora = None
+            if q > 16 and linha[15] == 32:
+                dia = dias.get(linha[:6])
+                hora = horas.get(linha[7:15])
+            if dia is not None and hora is not None:
+                instante = dia + hora
+            else:
+                instante = self._instante(linha[:q])
+                if instante is None:
+                    continue
+
+            trecho = linha[q:]
+            consulta = consultas[trecho] if trecho in consultas else self._consulta(trecho)
+            if consulta is None:
+                continue
+            instantes(instante)
+            tipos(consulta[0])
+            dominios(consulta[1])
+            ips(consulta[2])
+
+    def ler_arquivo(self, caminho, inicio=0):
+        """
+        Lê o arquivo a partir do byte 'inicio' até o fim, em blocos de
+        BLOCO_LEITURA; uma última linha sem "\n" também é lida.
+
+        Retorna (posição logo após a última linha completa, quantidade de
+        consultas até ela): uma leitura posterior a partir dessa posição,
+        depois de EntradasDnsmasq.truncar(quantidade), relê essa última
+        linha se ela ainda estava sendo escrita.
+
+        As tabelas de bytes já vistos só aceleram esta leitura e são
+        descartadas ao final, para não ficarem na memória junto com as
+        entradas (uma leitura posterior as preenche de novo).
+        """
+        try:
+            return self._ler_arquivo(caminho, inicio)
+        finally:
+            self.liberar_tabelas()
+
+    def liberar_tabelas(self):
+        self._ips.clear()
+        self._consultas.clear()
+        self.entradas.nomes_dominios.ids_bytes.clear()
+        self.entradas.nomes_tipos.ids_bytes.clear()
+
+    def _ler_arquivo(self, caminho, inicio):
+        with open(caminho, 'rb') as f:
+            f.seek(inicio)
+            posicao = inicio
+            resto = b''
+            while True:
+                bloco = f.read(BLOCO_LEITURA)
+                if not bloco:
+                    break
+                dados = resto + bloco if resto else bloco
+                corte = dados.rfind(b'\n') + 1
+                self.analisar(dados[:corte])
+                posicao += corte  # 'dados' começa na posição anterior
+                resto = dados[corte:]
+            completas = len(self.entradas)
+            if resto:
+                self.analisar(resto)
+        return posicao, completas
+
+
+def ler_entradas(caminho, ano=None):
+    """
+    Lê as consultas do log (as demais linhas são ignoradas). O syslog não
+    registra o ano: usa 'ano' (padrão: o ano atual).
+    """
+    entradas = EntradasDnsmasq()
+    LeitorDnsmasq(entradas, ano).ler_arquivo(caminho)
+    return entradas
+
+
+class _EstadoArquivo:
+    def __init__(self, st, ano):
+        self.identidade = (st.st_dev, st.st_ino)
+        self.tamanho = self.mtime = None
+        self.posicao = self.completas = 0
+        self.assinatura = b''
+        self.leitor = LeitorDnsmasq(EntradasDnsmasq(), ano)
+
+
+def _inicio_do_arquivo(caminho, tamanho=BYTES_ASSINATURA):
+    with open(caminho, 'rb') as f:
+        return f.read(tamanho)
+
+
+class CacheEntradas:
+    """
+    Consultas já lidas de cada log, mantidas entre as análises e
+    identificadas por caminho, dispositivo/inode, tamanho e mtime:
+      - arquivo inalterado: as entradas voltam sem ler nada;
+      - arquivo que só cresceu: só os bytes acrescentados são lidos;
+      - rotação (outro inode, arquivo menor ou início diferente): relê do zero.
+    Guarda os MAXIMO_ARQUIVOS logs usados mais recentemente.
+    """
+
+    def __init__(self, maximo=MAXIMO_ARQUIVOS):
+        self.maximo = maximo
+        self._estados = {}
+        self.ultima_leitura = None  # (caminho, bytes lidos, do zero?)
+
+    def _continua(self, estado, st, caminho, ano):
+        return (
+            estado.identidade == (st.st_dev, st.st_ino)
+            and st.st_size >= estado.posicao
+            and (ano is None or ano == estado.leitor.ano)
+            and _inicio_do_arquivo(caminho, len(estado.assinatura)) == estado.assinatura
+        )
+
+    def obter(self, caminho, ano=None):
+        """
+        EntradasDnsmasq do log, lendo do arquivo só o que ainda não foi lido.
+        """
+        caminho = os.path.abspath(caminho)
+        st = os.stat(caminho)
+        estado = self._estados.pop(caminho, None)
+        do_zero = estado is None or not self._continua(estado, st, caminho, ano)
+        if do_zero:
+            estado = _EstadoArquivo(st, ano)
+
+        lidos = 0
+        if (st.st_size, st.st_mtime_ns) != (estado.tamanho, estado.mtime):
+            estado.leitor.entradas.truncar(estado.completas)
+            inicio = estado.posicao
+            estado.posicao, estado.completas = estado.leitor.ler_arquivo(caminho, inicio)
+            estado.tamanho, estado.mtime = st.st_size, st.st_mtime_ns
+            estado.assinatura = _inicio_do_arquivo(caminho)
+            lidos = st.st_size - inicio
+
+        self._estados[caminho] = estado
+        while len(self._estados) > self.maximo:
+            del self._estados[next(iter(self._estados))]
+        self.ultima_leitura = (caminho, lidos, do_zero)
+        return estado.leitor.entradas
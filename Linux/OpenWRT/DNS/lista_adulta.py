@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lista de domínios adultos e palavras-chave suspeitas usadas pelo
+analisador de logs do dnsmasq, indexadas para classificar um domínio sem
+percorrer as listas inteiras.
+"""
+
+import os
+
+
+class IndiceSufixos:
+    """
+    Domínios bloqueados em um conjunto (hash) consultado por sufixo: um
+    domínio está coberto se ele ou algum domínio pai (sufixo formado por
+    rótulos inteiros: a.b.exemplo.com -> b.exemplo.com -> exemplo.com -> com)
+    estiver na lista. Cada consulta custa um acesso ao conjunto por rótulo,
+    qualquer que seja o tamanho da lista.
+    """
+
+    def __init__(self, dominios=()):
+        self.dominios = frozenset(dominios)
+
+    def __len__(self):
+        return len(self.dominios)
+
+    def __contains__(self, dominio):
+        return self.procurar(dominio) is not None
+
+    def procurar(self, dominio):
+        """
+        Entrada da lista que cobre o domínio: (dominio, True) se ele próprio
+        está na lista, (raiz, False) para o pai listado mais alto (o mais
+        curto), ou None.
+        """
+        if dominio in self.dominios:
+            return dominio, True
+        ponto = dominio.rfind('.')
+        while ponto != -1:
+            pai = dominio[ponto + 1:]
+            if pai in self.dominios:
+                return pai, False
+            ponto = dominio.rfind('.', 0, ponto)
+        return None
+
+
+def ler_hosts(texto):
+    """
+    Domínios de um arquivo HOSTS de bloqueio (linhas '0.0.0.0 dominio'),
+    em minúsculas; comentários e outras linhas são ignorados.
+    """
+    dominios = set()
+    for linha in texto.splitlines():
+        linha = linha.strip()
+        if linha and not linha.startswith('#'):
+            partes = linha.split()
+            if len(partes) >= 2 and partes[0] == '0.0.0.0':
+                dominios.add(partes[1].lower())
+    return dominios
+
+
+# ================================================
+# Palavras-chave suspeitas
+# ================================================
+
+# Usadas quando nenhum arquivo de palavras-chave é carregado
+PALAVRAS_CHAVE = [
+    'xxx', 'porn', 'adult', 'sex', 'nude', 'naked',
+    'escort', 'cam', 'mature', 'fuck', 'xnxx', 'redtube',
+    'xvideos', 'penis', 'vagina', 'hardcore'
+]
+
+
+class AutomatoPalavras:
+    """
+    Aho-Corasick sobre uma lista de palavras-chave: encontra todas as que
+    aparecem em um texto percorrendo-o uma única vez, qualquer que seja o
+    tamanho da lista.
+
+    As transições já incluem os links de falha (autômato determinístico):
+    cada estado mapeia todo caractere que aparece nas palavras para o
+    próximo estado, e os demais caracteres voltam à raiz (estado 0).
+    """
+
+    def __init__(self, palavras=PALAVRAS_CHAVE):
+        self.palavras = list(palavras)
+        self.transicoes = [{}]
+        saidas = [set()]  # índices (na lista) das palavras que terminam em cada estado
+        for indice, palavra in enumerate(self.palavras):
+            estado = 0
+            for c in palavra:
+                proximo = self.transicoes[estado].get(c)
+                if proximo is None:
+                    proximo = len(self.transicoes)
+                    self.transicoes[estado][c] = proximo
+                    self.transicoes.append({})
+                    saidas.append(set())
+                estado = proximo
+            saidas[estado].add(indice)
+
+        # Links de falha em largura; a trie vira o autômato completo
+        alfabeto = {c for palavra in self.palavras for c in palavra}
+        falha = [0] * len(self.transicoes)
+        fila = list(self.transicoes[0].values())
+        for c in alfabeto:
+            self.transicoes[0].setdefault(c, 0)
+        for estado in fila:
+            saidas[estado] |= saidas[falha[estado]]
+            filhos = self.transicoes[estado]
+            for c in alfabeto:
+                proximo = filhos.get(c)
+                if proximo is None:
+                    filhos[c] = self.transicoes[falha[estado]][c]
+                else:
+                    falha[proximo] = self.transicoes[falha[estado]][c]
+                    fila.append(proximo)
+        self.saidas = [tuple(s) if s else () for s in saidas]
+
+    def __len__(self):
+        return len(self.palavras)
+
+    def encontrar(self, texto):
+        """
+        Palavras que aparecem no texto, uma vez cada, na ordem da lista.
+        """
+        transicoes, saidas = self.transicoes, self.saidas
+        achadas = set(saidas[0])  # palavra vazia
+        estado = 0
+        for c in texto:
+            estado = transicoes[estado].get(c, 0)
+            if saidas[estado]:
+                achadas.update(saidas[estado])
+        return [self.palavras[i] for i in sorted(achadas)]
+
+
+def ler_palavras(caminho):
+    """
+    Palavras-chave de um arquivo texto, uma por linha, em minúsculas;
+    linhas vazias e comentários (#) são ignorados.
+    """
+    palavras = []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            linha = linha.strip().lower()
+            if linha and not linha.startswith('#') and linha not in palavras:
+                palavras.append(linha)
+    return palavras
+
+
+def gravar_palavras(palavras, caminho):
+    """
+    Grava as palavras-chave no formato de ler_palavras (o arquivo anterior
+    só é substituído depois que o novo está completo).
+    """
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.writelines(palavra + '\n' for palavra in palavras)
+    os.replace(temporario, caminho)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testes da leitura de logs do dnsmasq (formato aceito, CacheEntradas) e das
+seleções de EntradasDnsmasq.
+
+Uso: python3 -m unittest test_entradas_dnsmasq  (ou pytest)
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import entradas_dnsmasq
+from entradas_dnsmasq import CacheEntradas, EntradasDnsmasq, ip_para_inteiro, ler_entradas, para_segundos
+
+
+def _linha(i):
+    return f"Oct 18 10:{i // 60 % 60:02d}:{i % 60:02d} dnsmasq[1234]: query[A] site{i}.exemplo.com from 192.168.1.{i % 250 + 1}\n"
+
+
+def _outras(i):
+    return f"Oct 18 10:{i // 60 % 60:02d}:{i % 60:02d} dnsmasq[1234]: reply site{i}.exemplo.com is 93.184.216.34\n"
+
+
+class TestCacheEntradas(unittest.TestCase):
+
+    def setUp(self):
+        self.bloco_original = entradas_dnsmasq.BLOCO_LEITURA
+        # Blocos pequenos, que terminam no meio das linhas
+        entradas_dnsmasq.BLOCO_LEITURA = 37
+        arquivo = tempfile.NamedTemporaryFile(suffix='.log', delete=False)
+        arquivo.close()
+        self.caminho = arquivo.name
+
+    def tearDown(self):
+        entradas_dnsmasq.BLOCO_LEITURA = self.bloco_original
+        os.remove(self.caminho)
+
+    def _acrescentar(self, texto):
+        with open(self.caminho, 'a', encoding='utf-8') as f:
+            f.write(texto)
+
+    def test_posicao_apos_varios_blocos(self):
+        self._acrescentar("".join(_linha(i) + _outras(i) for i in range(30)))
+        leitor = entradas_dnsmasq.LeitorDnsmasq(entradas_dnsmasq.EntradasDnsmasq())
+        posicao, completas = leitor.ler_arquivo(self.caminho)
+        self.assertEqual(posicao, os.path.getsize(self.caminho))
+        self.assertEqual(completas, 30)
+
+    def test_acrescimo_nao_duplica_entradas(self):
+        cache = CacheEntradas()
+        self._acrescentar("".join(_linha(i) + _outras(i) for i in range(30)))
+        self.assertEqual(len(cache.obter(self.caminho)), 30)
+
+        self._acrescentar(_linha(30))
+        entradas = cache.obter(self.caminho)
+        self.assertEqual(len(entradas), 31)
+        self.assertEqual(cache.ultima_leitura[1:], (len(_linha(30)), False))
+        self.assertEqual(entradas.nomes_dominios.nomes[entradas.dominios[-1]], "site30.exemplo.com")
+
+    def test_linha_parcial_completada_depois(self):
+        cache = CacheEntradas()
+        linha = _linha(40)
+        self._acrescentar("".join(_linha(i) for i in range(40)) + linha[:30])
+        self.assertEqual(len(cache.obter(self.caminho)), 40)
+
+        self._acrescentar(linha[30:] + _linha(41))
+        entradas = cache.obter(self.caminho)
+        self.assertEqual(len(entradas), 42)
+        novas = ler_entradas(self.caminho)
+        self.assertEqual(list(entradas.instantes), list(novas.instantes))
+        self.assertEqual(list(entradas.ips), list(novas.ips))
+        self.assertEqual(
+            [entradas.nomes_dominios.nomes[d] for d in entradas.dominios],
+            [novas.nomes_dominios.nomes[d] for d in novas.dominios],
+        )
+
+
+class TestFormatoConsulta(unittest.TestCase):
+    """
+    Regras da expressão regular original do analisador, mais a recusa de
+    octetos acima de 255.
+    """
+
+    LINHAS = (
+        ("query[A] www.Exemplo.com from 192.168.1.10", ('A', 'www.exemplo.com', '192.168.1.10')),
+        ("query[A_B] x.com from 10.0.0.1", ('A_B', 'x.com', '10.0.0.1')),
+        ("query[A] z.com from 10.0.0.12x", ('A', 'z.com', '10.0.0.12')),
+        ("query[PTR] 1.0.0.10.in-addr.arpa from 10.0.0.1.5", ('PTR', '1.0.0.10.in-addr.arpa', '10.0.0.1')),
+        ("query[A] w.com  from\t10.0.0.3 extra", ('A', 'w.com', '10.0.0.3')),
+        ("query[A] y.com from 999.1.1.1", None),
+        ("query[AAAA] v6.com from fe80::1", None),
+        ("query[A]w.com from 10.0.0.2", None),
+        ("query[] w.com from 10.0.0.2", None),
+        ("query[A] w.com to 10.0.0.2", None),
+    )
+
+    def test_linhas_aceitas_e_ignoradas(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as arquivo:
+            for trecho, _ in self.LINHAS:
+                arquivo.write(f"Oct 18 10:00:01 dnsmasq[1234]: {trecho}\n")
+        try:
+            entradas = ler_entradas(arquivo.name)
+        finally:
+            os.remove(arquivo.name)
+        lidas = [entradas.entrada(i) for i in range(len(entradas))]
+        self.assertEqual(
+            [(e['tipo'], e['dominio'], e['ip']) for e in lidas],
+            [esperado for _, esperado in self.LINHAS if esperado],
+        )
+
+
+class TestSelecoes(unittest.TestCase):
+
+    def _entradas(self, horas):
+        entradas = EntradasDnsmasq()
+        for i, hora in enumerate(horas):
+            instante = para_segundos(datetime(2024, 10, 18, hora))
+            entradas.acrescentar(instante, 'A', f'site{i}.com', ip_para_inteiro(f'10.0.0.{i % 2}'))
+        return entradas
+
+    def _conferir(self, entradas, hora):
+        limite = para_segundos(datetime(2024, 10, 18, hora))
+        esperado = [i for i, t in enumerate(entradas.instantes) if t >= limite]
+        selecao = entradas.desde(datetime(2024, 10, 18, hora))
+        self.assertEqual(list(selecao), esperado)
+        self.assertEqual(list(entradas.do_ip(selecao, '10.0.0.1')), [i for i in esperado if i % 2])
+        self.assertEqual(list(entradas.coluna(entradas.dominios, selecao)), [entradas.dominios[i] for i in esperado])
+
+    def test_desde_em_ordem(self):
+        entradas = self._entradas([1, 2, 2, 5, 7])
+        self.assertTrue(entradas.ordenado())
+        self.assertIsInstance(entradas.desde(datetime(2024, 10, 18, 2)), range)
+        for hora in (0, 2, 3, 7, 8):
+            self._conferir(entradas, hora)
+
+    def test_desde_fora_de_ordem(self):
+        entradas = self._entradas([1, 2, 5, 7])
+        entradas.acrescentar(para_segundos(datetime(2024, 10, 18, 3)), 'A', 'x.com', 0)
+        self.assertFalse(entradas.ordenado())
+        for hora in (0, 3, 4, 8):
+            self._conferir(entradas, hora)
+
+        # Sem a consulta fora de ordem, volta à busca binária
+        entradas.truncar(4)
+        self.assertTrue(entradas.ordenado())
+        self._conferir(entradas, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# backtest_lotofacil.py
+# Avalia estratégias de geração de jogos contra todos os concursos do banco:
+# quantas vezes cada conjunto de bilhetes teria feito 11 a 15 pontos.
+#
+# Uso:
+#   python backtest_lotofacil.py [--quantidade 10000] [--restricao 3,4 ...]
+#                                [--bilhetes arquivo.txt] [--inicio N] [--fim N]
+#                                [--processos N] [--melhores 5]
+#
+# --restricao GAP,STD pode ser repetido; cada um vira uma estratégia gerada
+# como em gerar_jogo_com_restricoes (o Std pode ficar vazio: "3,").
+
+import argparse
+import time
+
+import numpy as np
+
+from models.armazem_mascaras import mascara_para_dezenas
+from models.backtest import backtest, bilhetes_aleatorios, bilhetes_com_restricoes
+from models.banco_de_dados import BancoDeDados
+from models.conferencia import PONTUACOES, ler_bilhetes_arquivo
+from models.tabela_faixas import TabelaFaixas
+
+
+def ler_restricao(texto):
+    gap, _, std = texto.partition(",")
+    return (float(gap) if gap.strip() else None, float(std) if std.strip() else None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest de estratégias da Lotofácil")
+    parser.add_argument("--quantidade", type=int, default=10000, help="bilhetes gerados por estratégia")
+    parser.add_argument("--restricao", action="append", default=[], type=ler_restricao,
+                        help="estratégia com restrições GAP,STD (pode repetir)")
+    parser.add_argument("--bilhetes", help="arquivo com bilhetes próprios, um por linha")
+    parser.add_argument("--inicio", type=int, default=1)
+    parser.add_argument("--fim", type=int)
+    parser.add_argument("--processos", type=int, help="processos do pool (padrão: um por CPU)")
+    parser.add_argument("--melhores", type=int, default=5, help="bilhetes listados por estratégia")
+    args = parser.parse_args()
+
+    mascaras = np.array(BancoDeDados().obter_mascaras(), dtype=np.uint32)
+    sorteios = mascaras[max(args.inicio, 1) - 1:args.fim]
+
+    estrategias = {"Aleatória (GeradorDeJogos)": bilhetes_aleatorios(args.quantidade)}
+    if args.restricao:
+        tabela = TabelaFaixas()
+        for gap, std in args.restricao:
+            estrategias[f"Restrições Gap={gap} Std={std}"] = bilhetes_com_restricoes(
+                tabela, args.quantidade, gap, std
+            )
+    if args.bilhetes:
+        bilhetes, invalidas = ler_bilhetes_arquivo(args.bilhetes)
+        print(f"{args.bilhetes}: {len(bilhetes)} bilhetes, {len(invalidas)} linhas inválidas")
+        estrategias[args.bilhetes] = bilhetes
+
+    inicio = time.perf_counter()
+    resultados = backtest(estrategias, sorteios, args.processos)
+    segundos = time.perf_counter() - inicio
+
+    for resultado in resultados:
+        print(resultado.resumo())
+        for i in resultado.melhores(args.melhores):
+            dezenas = " ".join(f"{d:02d}" for d in mascara_para_dezenas(int(resultado.bilhetes[i])))
+            contagens = ", ".join(
+                f"{pontos}: {n}" for pontos, n in zip(PONTUACOES, resultado.histograma[i]) if n
+            )
+            print(f"    {dezenas} -> {contagens or 'nenhum prêmio'}")
+        print()
+
+    cruzamentos = sum(len(r.bilhetes) for r in resultados) * (resultados[0].total_sorteios if resultados else 0)
+    print(f"{cruzamentos} cruzamentos bilhete x sorteio em {segundos:.2f}s")
@@ -1,10 +1,14 @@
 # C:\Users\Marcelo\Documents\Python\Lotofacil\controllers\ui_controller.py
 # Nome do arquivo: ui_controller.py
 
-import tkinter as tk
 from models.jogo import Jogo, GeradorDeJogos
 
-def atualizar_jogo(jogo_labels, jogo=None, historico_listbox=None):
+def atualizar_jogo(jogo_labels, jogo=None, historico=None, ao_atualizar=None):
+    """
+    Exibe o jogo informado (ou um novo jogo aleatório) nos labels. Um jogo
+    novo também entra no 'historico' (HistoricoJogos), se informado.
+    'ao_atualizar(jogo)' é chamado a cada jogo exibido.
+    """
     gerador = GeradorDeJogos()
     novo_jogo = jogo if jogo else gerador.gerar_jogo()
     dezenas = sorted(novo_jogo.dezenas)
@@ -17,10 +21,11 @@ def atualizar_jogo(jogo_labels, jogo=None, historico_listbox=None):
             else:
                 jogo_labels[index].config(text="")
 
-    if historico_listbox is not None and jogo is None:
-        jogo_str = " ".join(map(str, dezenas))
-        if not any(jogo_str == historico_listbox.get(idx) for idx in range(historico_listbox.size())):
-            historico_listbox.insert(tk.END, jogo_str)
+    if historico is not None and jogo is None:
+        historico.adicionar(novo_jogo)
+
+    if ao_atualizar is not None:
+        ao_atualizar(novo_jogo)
 
     return novo_jogo
 
@@ -28,15 +33,9 @@ def resetar_jogo(jogo_labels):
     for label in jogo_labels:
         label.config(text="")
 
-def carregar_jogo_do_historico(event, jogo_labels, historico_listbox):
-    selecao = historico_listbox.curselection()
-    if not selecao:
-        return
-    
-    # Pega apenas a parte dos números (antes do |)
-    jogo_texto = historico_listbox.get(selecao).split('|')[0].strip()
-    dezenas = list(map(int, jogo_texto.split()))
-    
+def carregar_jogo_do_historico(jogo_labels, historico, indice):
+    dezenas = historico.jogo(indice).dezenas
+
     # Atualiza os labels com as dezenas selecionadas
     for i, label in enumerate(jogo_labels):
         if i < len(dezenas):
@@ -0,0 +1,205 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\armazem_mascaras.py
+# Nome do arquivo: armazem_mascaras.py
+
+import mmap
+import os
+import struct
+from array import array
+from threading import RLock
+
+# Cabeçalho: mágico, quantidade de posições, tamanho e mtime do arquivo texto
+MAGICO = b'LFM1'
+CABECALHO = struct.Struct('=4sIqq')
+
+
+def dezenas_para_mascara(dezenas):
+    """
+    Converte uma sequência de dezenas (1..25) em uma máscara de 25 bits,
+    onde o bit (d - 1) indica a presença da dezena d.
+    """
+    mascara = 0
+    for dezena in dezenas:
+        mascara |= 1 << (int(dezena) - 1)
+    return mascara
+
+
+def mascara_para_dezenas(mascara):
+    """
+    Converte uma máscara de 25 bits na lista ordenada de dezenas.
+    """
+    return [i + 1 for i in range(25) if mascara >> i & 1]
+
+
+class ArmazemMascaras:
+    """
+    Armazém binário dos concursos: cada sorteio vira uma máscara de 25 bits
+    gravada como uint32, na posição (concurso - 1). Posições com valor 0
+    indicam concurso ausente.
+
+    O arquivo binário é mapeado em memória (mmap) e mantido em sincronia
+    com o arquivo texto através do tamanho e do mtime gravados no cabeçalho.
+    As leituras recebem visões somente leitura de uma única cópia, refeita
+    só quando o cabeçalho muda.
+    """
+
+    def __init__(self, arquivo_texto, arquivo_binario=None):
+        self.arquivo_texto = arquivo_texto
+        self.arquivo_binario = arquivo_binario or os.path.splitext(arquivo_texto)[0] + '.msk'
+        self.lock = RLock()
+        self._mapa = None
+        self._mascaras = None
+        self._cabecalho = None  # (posições, assinatura do texto) do arquivo mapeado
+        self._copia = None      # array('I') compartilhado pelas leituras
+
+    def _assinatura_texto(self):
+        try:
+            st = os.stat(self.arquivo_texto)
+        except FileNotFoundError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def _ler_cabecalho(self):
+        try:
+            with open(self.arquivo_binario, 'rb') as file:
+                bruto = file.read(CABECALHO.size)
+        except FileNotFoundError:
+            return None
+        if len(bruto) != CABECALHO.size:
+            return None
+        magico, posicoes, tamanho, mtime_ns = CABECALHO.unpack(bruto)
+        if magico != MAGICO:
+            return None
+        return posicoes, (tamanho, mtime_ns)
+
+    def _fechar_mapa(self):
+        # A única visão do mapa é a interna (mascaras() entrega visões da
+        # cópia), então ele pode ser fechado antes de o arquivo ser
+        # substituído ou alterado.
+        if self._mascaras is not None:
+            self._mascaras.release()
+        if self._mapa is not None:
+            self._mapa.close()
+        self._mascaras = None
+        self._mapa = None
+        self._cabecalho = None
+        self._copia = None
+
+    def _mapear(self):
+        with open(self.arquivo_binario, 'rb') as file:
+            self._mapa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, posicoes, tamanho, mtime_ns = CABECALHO.unpack_from(self._mapa)
+        self._cabecalho = (posicoes, (tamanho, mtime_ns))
+        self._mascaras = memoryview(self._mapa)[CABECALHO.size:].cast('I')
+        self._copia = None
+
+    def _gravar(self, mascaras, assinatura):
+        """
+        Grava o arquivo binário de forma atômica (arquivo temporário + replace).
+        """
+        tamanho, mtime_ns = assinatura if assinatura else (0, 0)
+        temporario = self.arquivo_binario + '.tmp'
+        with open(temporario, 'wb') as file:
+            file.write(CABECALHO.pack(MAGICO, len(mascaras), tamanho, mtime_ns))
+            mascaras.tofile(file)
+        self._fechar_mapa()
+        os.replace(temporario, self.arquivo_binario)
+
+    def reconstruir(self):
+        """
+        Lê o arquivo texto uma única vez e regrava o arquivo binário.
+        """
+        with self.lock:
+            assinatura = self._assinatura_texto()
+            mascaras = array('I')
+            if assinatura is not None:
+                with open(self.arquivo_texto, 'r') as file:
+                    for line in file:
+                        parts = line.strip().split(',')
+                        if len(parts) != 16:
+                            continue
+                        posicao = int(parts[0]) - 1
+                        if posicao >= len(mascaras):
+                            mascaras.extend([0] * (posicao + 1 - len(mascaras)))
+                        mascaras[posicao] = dezenas_para_mascara(parts[1:])
+            self._gravar(mascaras, assinatura)
+            self._mapear()
+
+    def acrescentar(self, jogos):
+        """
+        Grava no arquivo binário apenas os concursos informados
+        [(numero, dezenas), ...], sem reler o arquivo texto.
+        Deve ser chamado logo após o arquivo texto receber esses concursos,
+        com o armazém sincronizado ao estado anterior à gravação.
+        """
+        with self.lock:
+            cabecalho = self._ler_cabecalho()
+            if cabecalho is None or not jogos:
+                self.reconstruir()
+                return
+            posicoes = cabecalho[0]
+            maior = max(numero for numero, _ in jogos)
+            tamanho, mtime_ns = self._assinatura_texto()
+            self._fechar_mapa()
+            with open(self.arquivo_binario, 'r+b') as file:
+                if maior > posicoes:
+                    file.seek(0, os.SEEK_END)
+                    file.write(bytes(4 * (maior - posicoes)))
+                for numero, dezenas in jogos:
+                    file.seek(CABECALHO.size + (numero - 1) * 4)
+                    array('I', [dezenas_para_mascara(dezenas)]).tofile(file)
+                file.seek(0)
+                file.write(CABECALHO.pack(MAGICO, max(maior, posicoes), tamanho, mtime_ns))
+            self._mapear()
+
+    def sincronizar(self):
+        """
+        Garante que o arquivo binário corresponde ao arquivo texto atual,
+        reconstruindo-o apenas quando o texto mudou.
+        """
+        with self.lock:
+            assinatura = self._assinatura_texto() or (0, 0)
+            if self._cabecalho is not None and self._cabecalho[1] == assinatura:
+                return  # mapa atual: nem o cabeçalho do arquivo precisa ser relido
+            cabecalho = self._ler_cabecalho()
+            if cabecalho is None or cabecalho[1] != assinatura:
+                self.reconstruir()
+            elif self._mascaras is None:
+                self._mapear()
+
+    def assinatura(self):
+        """
+        Identifica o conteúdo atual do armazém (posições, tamanho e mtime do
+        texto): muda sempre que as máscaras mudam.
+        """
+        with self.lock:
+            self.sincronizar()
+            return self._cabecalho
+
+    def mascaras(self):
+        """
+        Retorna uma visão somente leitura (memoryview de uint32) das máscaras.
+        O índice i corresponde ao concurso i + 1; valor 0 indica ausência.
+
+        A visão é de uma cópia do arquivo mapeado, feita uma vez por versão
+        do armazém e compartilhada entre as chamadas; quando o armazém é
+        regravado, visões antigas continuam válidas com o conteúdo anterior.
+        """
+        with self.lock:
+            self.sincronizar()
+            if self._copia is None:
+                self._copia = array('I', self._mascaras)
+            return memoryview(self._copia).toreadonly()
+
+    def recuperar_todos_jogos(self):
+        """
+        Retorna [(num_concurso, [d1, ..., d15]), ...] com as dezenas ordenadas.
+        """
+        return [
+            (i + 1, mascara_para_dezenas(mascara))
+            for i, mascara in enumerate(self.mascaras())
+            if mascara
+        ]
+
+    def fechar(self):
+        with self.lock:
+            self._fechar_mapa()
@@ -0,0 +1,143 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\backtest.py
+# Nome do arquivo: backtest.py
+
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from models.codec_jogo import TOTAL_COMBINACOES, mascaras_de_ranks, popcount
+from models.conferencia import PONTUACOES, histograma_por_bilhete
+from models.tabela_faixas import faixas_aceitas
+
+# A partir de quantos bilhetes o cruzamento é dividido entre processos
+LIMIAR_PARALELO = 20000
+BILHETES_POR_TAREFA = 10000
+
+# Chance de um bilhete de 15 dezenas fazer k pontos em um sorteio:
+# C(15, k) * C(10, 15 - k) / C(25, 15)
+CHANCE_POR_SORTEIO = np.array(
+    [comb(15, k) * comb(10, 15 - k) / TOTAL_COMBINACOES for k in PONTUACOES]
+)
+
+
+# ================================================
+# Estratégias de geração (em lote)
+# ================================================
+
+def bilhetes_aleatorios(quantidade, rng=None):
+    """
+    Mesma distribuição de GeradorDeJogos (todas as combinações com a mesma
+    chance), gerada de uma vez como máscaras.
+    """
+    rng = rng or np.random.default_rng()
+    return mascaras_de_ranks(rng.integers(0, TOTAL_COMBINACOES, size=quantidade))
+
+
+def bilhetes_com_restricoes(tabela, quantidade, desejado_gap=None, desejado_std=None, rng=None):
+    """
+    Mesma distribuição de gerar_jogo_com_restricoes, gerada de uma vez a
+    partir da TabelaFaixas.
+    """
+    ranks = tabela.sortear_varios(quantidade, *faixas_aceitas(desejado_gap, desejado_std), rng=rng)
+    return mascaras_de_ranks(ranks)
+
+
+# ================================================
+# Cruzamento bilhetes x sorteios
+# ================================================
+
+def matriz_acertos(bilhetes, sorteios):
+    """
+    Matriz completa N x D (uint8) com os acertos de cada bilhete em cada
+    sorteio. Ocupa N * D bytes: para conjuntos grandes use backtest().
+    """
+    bilhetes = np.asarray(bilhetes, dtype=np.uint32)
+    sorteios = np.asarray(sorteios, dtype=np.uint32)
+    return popcount(bilhetes[:, None] & sorteios[None, :])
+
+
+def _histograma_tarefa(argumentos):
+    bilhetes, sorteios = argumentos
+    return histograma_por_bilhete(bilhetes, sorteios)
+
+
+def histograma_paralelo(bilhetes, sorteios, processos=None):
+    """
+    histograma_por_bilhete dividido em tarefas num pool de processos quando
+    há muitos bilhetes (processos=1 força o cálculo no processo atual).
+    """
+    bilhetes = np.asarray(bilhetes, dtype=np.uint32)
+    sorteios = np.asarray(sorteios, dtype=np.uint32)
+    if processos == 1 or len(bilhetes) < LIMIAR_PARALELO:
+        return histograma_por_bilhete(bilhetes, sorteios)
+    tarefas = [
+        (bilhetes[i:i + BILHETES_POR_TAREFA], sorteios)
+        for i in range(0, len(bilhetes), BILHETES_POR_TAREFA)
+    ]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return np.concatenate(list(executor.map(_histograma_tarefa, tarefas)))
+
+
+class ResultadoBacktest:
+    """
+    Desempenho histórico de um conjunto de bilhetes: quantas vezes cada
+    bilhete fez 11 a 15 pontos (histograma N x 5) nos sorteios avaliados.
+    """
+
+    def __init__(self, nome, bilhetes, histograma, total_sorteios):
+        self.nome = nome
+        self.bilhetes = bilhetes
+        self.histograma = histograma
+        self.total_sorteios = total_sorteios
+
+    @property
+    def totais(self):
+        return self.histograma.sum(axis=0)
+
+    @property
+    def esperado(self):
+        """
+        Totais esperados por faixa para bilhetes sorteados ao acaso.
+        """
+        return CHANCE_POR_SORTEIO * len(self.bilhetes) * self.total_sorteios
+
+    @property
+    def premiados(self):
+        """
+        Quantos bilhetes foram premiados ao menos uma vez.
+        """
+        return int(np.count_nonzero(self.histograma.any(axis=1)))
+
+    def melhores(self, quantidade=10):
+        """
+        Índices dos bilhetes com o melhor histórico (mais 15 pontos, depois
+        mais 14, e assim por diante).
+        """
+        return np.lexsort(self.histograma.T)[::-1][:quantidade]
+
+    def resumo(self):
+        linhas = [
+            f"=== {self.nome} ===",
+            f"Bilhetes: {len(self.bilhetes)} | Sorteios: {self.total_sorteios} | "
+            f"Premiados ao menos uma vez: {self.premiados}",
+        ]
+        for coluna in reversed(range(len(PONTUACOES))):
+            linhas.append(
+                f"  {PONTUACOES[coluna]} pontos: {int(self.totais[coluna])} "
+                f"(esperado ao acaso: {self.esperado[coluna]:.1f})"
+            )
+        return "\n".join(linhas)
+
+
+def backtest(estrategias, sorteios, processos=None):
+    """
+    Avalia cada estratégia {nome: máscaras dos bilhetes} contra os sorteios
+    (máscaras) e retorna a lista de ResultadoBacktest, na mesma ordem.
+    """
+    sorteios = np.asarray(sorteios, dtype=np.uint32)
+    sorteios = sorteios[sorteios != 0]
+    return [
+        ResultadoBacktest(nome, bilhetes, histograma_paralelo(bilhetes, sorteios, processos), len(sorteios))
+        for nome, bilhetes in estrategias.items()
+    ]
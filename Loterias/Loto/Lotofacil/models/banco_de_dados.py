@@ -1,23 +1,28 @@
 # C:\Users\Marcelo\Documents\Python\Lotofacil\models\banco_de_dados.py
 # Nome do arquivo: banco_de_dados.py
 
-import requests
-from concurrent.futures import ThreadPoolExecutor
-from tqdm import tqdm
 from threading import Lock
-import random
+
+from models.armazem_mascaras import ArmazemMascaras
+from models.indice_banco import IndiceBanco
+from models.estatisticas import MotorEstatisticas
+from models.snapshot_estatisticas import SnapshotEstatisticas
+from models.vizinhos import buscar_vizinhos
+from models.buscador_concursos import BuscadorConcursos, URL_BASE
+from models.cache_respostas import CacheRespostas
+from models.sincronizacao import DestinoTexto, sincronizar
 
 class BancoDeDados:
-    def __init__(self, filename='banco_de_dados.txt'):
+    def __init__(self, filename='banco_de_dados.txt', url_base=URL_BASE, cache=None):
         self.filename = filename
         self.lock = Lock()
-        self.headers = {
-            "user-agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-                " AppleWebKit/537.36 (KHTML, like Gecko)"
-                " Chrome/131.0.0.0 Safari/537.36"
-            )
-        }
+        self.armazem = ArmazemMascaras(filename)
+        self.indice = IndiceBanco(filename)
+        self.estatisticas = SnapshotEstatisticas(filename, self.armazem)
+        self._motor = None
+        self._assinatura_motor = None
+        self.cache = cache if cache is not None else CacheRespostas()
+        self.buscador = BuscadorConcursos(url_base=url_base, cache=self.cache)
 
     def buscar_concurso(self, numero):
         """
@@ -25,127 +30,36 @@ class BancoDeDados:
         de um determinado concurso da Lotofácil.
         Caso 'numero' seja string vazia (""), tenta buscar o concurso mais recente.
         """
-        url = f"https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/{numero}"
-        try:
-            response = requests.get(url, timeout=1, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            if not data:
-                raise ValueError(f"Resposta vazia para o concurso {numero}")
-            return data
-        except requests.exceptions.RequestException:
-            return None
-        except ValueError:
-            return None
-
-    def criar_atualizar_banco_de_dados(self, status_callback=None, progresso_callback=None):
+        return self.buscador.buscar_um(numero)
+
+    def criar_atualizar_banco_de_dados(self, status_callback=None, progresso_callback=None, offline=False):
         """
         Cria ou atualiza o banco de dados local (arquivo texto) com todos
         os concursos da Lotofácil, do 1 até o mais recente disponível na API.
         
         - status_callback: função para receber mensagens de status
         - progresso_callback: função para receber percentual de progresso e número do concurso
+        - offline: usa apenas o cache de respostas, sem acessar a rede
         """
         try:
-            # Carregar concursos existentes do arquivo
-            try:
-                with open(self.filename, 'r') as file:
-                    dados_existentes = {
-                        int(line.split(",")[0]): line.strip()
-                        for line in file.readlines()
-                    }
-                    # Só pra saber se tinha algo:
-                    ultimo_concurso_local = max(dados_existentes.keys()) if dados_existentes else 0
-            except FileNotFoundError:
-                dados_existentes = {}
-                ultimo_concurso_local = 0
-
-            # Buscar o último concurso disponível na API (string vazia -> concurso mais recente)
-            ultimo_dado = self.buscar_concurso("")
-            if not ultimo_dado:
-                if status_callback:
-                    status_callback(
-                        "Erro ao buscar o último concurso. "
-                        "Verifique sua conexão ou a API."
-                    )
-                return
-
-            ultimo_numero = int(ultimo_dado["numero"])
-
-            # Identificar quais concursos estão ausentes
-            sequencia_completa = set(range(1, ultimo_numero + 1))
-            concursos_existentes = set(dados_existentes.keys())
-            concursos_ausentes = list(sequencia_completa - concursos_existentes)
-            random.shuffle(concursos_ausentes)
-
-            if concursos_ausentes:
-                if status_callback:
-                    status_callback(
-                        f"Concursos ausentes identificados: {len(concursos_ausentes)}"
-                    )
-            else:
-                if status_callback:
-                    status_callback("Banco de dados completo. Nenhum concurso ausente.")
-
-            # Baixar concursos ausentes
-            novos_dados = []
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                futuros = {
-                    executor.submit(self.buscar_concurso, numero): numero
-                    for numero in concursos_ausentes
-                }
-
-                for i, futuro in enumerate(tqdm(futuros, desc="Baixando concursos")):
-                    numero = futuros[futuro]
-                    try:
-                        concurso = futuro.result()
-                        if concurso is None:
-                            if status_callback:
-                                status_callback(
-                                    f"Concurso {numero} não pôde ser baixado. Pulando."
-                                )
-                            continue
-
-                        dezenas = concurso.get("dezenasSorteadasOrdemSorteio")
-                        if dezenas and len(dezenas) == 15:
-                            novos_dados.append((numero, dezenas))
-                            if progresso_callback:
-                                progresso_callback(
-                                    (i + 1) / len(concursos_ausentes) * 100,
-                                    numero
-                                )
-                        else:
-                            if status_callback:
-                                status_callback(
-                                    f"Concurso {numero} com dados inválidos. Pulando."
-                                )
-                    except Exception as e:
-                        if status_callback:
-                            status_callback(
-                                f"Erro ao processar concurso {numero}: {str(e)}"
-                            )
-
-            # Atualizar dados existentes
-            for numero, dezenas in novos_dados:
-                dados_existentes[numero] = f"{numero},{','.join(dezenas)}"
-
-            # Salvar concursos ordenados
-            dados_ordenados = sorted(
-                dados_existentes.values(),
-                key=lambda x: int(x.split(",")[0])
+            destino = DestinoTexto(self)
+            resumo = sincronizar(
+                [destino], self.buscador, offline=offline,
+                status_callback=status_callback,
+                progresso_callback=progresso_callback
             )
-            with self.lock, open(self.filename, 'w') as file:
-                file.write("\n".join(dados_ordenados) + "\n")
+            if resumo is None:
+                return
 
             if status_callback:
                 status_callback("Banco de dados atualizado com sucesso.")
 
             # Verificar se todos os concursos estão presentes
-            concursos_faltando = sequencia_completa - set(dados_existentes.keys())
+            concursos_faltando = destino.ausentes(resumo['ultimo'])
             if concursos_faltando:
                 if status_callback:
                     status_callback(
-                        f"Ainda faltam concursos: {sorted(concursos_faltando)}"
+                        f"Ainda faltam {len(concursos_faltando)} concursos: {concursos_faltando}"
                     )
             else:
                 if status_callback:
@@ -155,53 +69,156 @@ class BancoDeDados:
             if status_callback:
                 status_callback(f"Erro na atualização do banco de dados: {str(e)}")
 
-    def obter_total_concursos(self):
+    def gravar_concursos(self, novos_dados):
+        """
+        Grava [(numero, dezenas), ...] no arquivo texto: acréscimo ao final quando
+        só há concursos novos, compactação quando há lacunas antigas preenchidas.
+        O snapshot de estatísticas recebe só os concursos gravados.
+        Retorna o índice atualizado.
+        """
+        novos_dados = sorted(novos_dados)
+        with self.lock:
+            indice = self.indice.carregar()
+            estatisticas = self.estatisticas.carregar()
+            anteriores = self.armazem.mascaras()
+            substituidos = any(
+                numero <= len(anteriores) and anteriores[numero - 1] for numero, _ in novos_dados
+            )
+
+            if novos_dados and indice['ordenado'] and novos_dados[0][0] > indice['ultimo']:
+                indice = self._acrescentar_concursos(indice, novos_dados)
+            elif novos_dados or not indice['ordenado']:
+                indice = self._compactar_banco(novos_dados)
+            else:
+                return indice
+
+            if substituidos:
+                # Concursos regravados: não dá para descontar os valores antigos
+                self.estatisticas.reconstruir()
+            else:
+                self.estatisticas.acrescentar(estatisticas, novos_dados)
+            return indice
+
+    def reconstruir_do_cache(self, status_callback=None):
+        """
+        Regrava o banco texto inteiro a partir do cache de respostas,
+        sem acessar a rede.
         """
-        Retorna quantas linhas (concursos) há no arquivo (banco_de_dados.txt).
+        novos_dados = [
+            (numero, concurso["dezenasSorteadasOrdemSorteio"])
+            for numero, concurso in self.cache.iterar()
+            if len(concurso.get("dezenasSorteadasOrdemSorteio") or []) == 15
+        ]
+        with self.lock:
+            indice = self._compactar_banco(novos_dados)
+            self.estatisticas.reconstruir()
+        if status_callback:
+            status_callback(
+                f"Banco reconstruído a partir do cache: {indice['total']} concursos."
+            )
+
+    def _acrescentar_concursos(self, indice, novos_dados):
         """
+        Acrescenta ao final do arquivo concursos maiores que o último gravado,
+        atualizando índice e armazém de máscaras sem reler o arquivo.
+        """
+        self.armazem.sincronizar()
+        precisa_quebra = False
         try:
-            with open(self.filename, "r") as file:
-                return len(file.readlines())
+            with open(self.filename, 'rb') as file:
+                file.seek(0, 2)
+                if file.tell() > 0:
+                    file.seek(-1, 2)
+                    precisa_quebra = file.read(1) != b"\n"
         except FileNotFoundError:
-            return 0
+            pass
 
-    def obter_ultimo_concurso(self):
+        with open(self.filename, 'a') as file:
+            if precisa_quebra:
+                file.write("\n")
+            for numero, dezenas in novos_dados:
+                file.write(f"{numero},{','.join(dezenas)}\n")
+
+        self.armazem.acrescentar(novos_dados)
+        return self.indice.acrescentar(indice, [numero for numero, _ in novos_dados])
+
+    def _compactar_banco(self, novos_dados):
         """
-        Retorna o número do último concurso armazenado no arquivo local,
-        ou None se o arquivo estiver vazio ou não existir.
+        Regrava o arquivo inteiro em ordem (usado quando há concursos fora de ordem,
+        como lacunas antigas preenchidas), reconstruindo índice e armazém.
         """
+        dados_existentes = {}
         try:
             with open(self.filename, 'r') as file:
-                dados_existentes = file.readlines()
-                if dados_existentes:
-                    return int(dados_existentes[-1].split(",")[0])
-                else:
-                    return None
+                for line in file:
+                    if line.strip():
+                        dados_existentes[int(line.split(",")[0])] = line.strip()
         except FileNotFoundError:
-            return None
+            pass
+
+        for numero, dezenas in novos_dados:
+            dados_existentes[numero] = f"{numero},{','.join(dezenas)}"
+
+        with open(self.filename, 'w') as file:
+            file.write("\n".join(dados_existentes[n] for n in sorted(dados_existentes)) + "\n")
+
+        self.armazem.reconstruir()
+        return self.indice.reconstruir()
+
+    def obter_total_concursos(self):
+        """
+        Retorna quantos concursos há no banco, segundo o índice auxiliar.
+        """
+        return self.indice.carregar()['total']
+
+    def obter_ultimo_concurso(self):
+        """
+        Retorna o número do último concurso armazenado no banco local,
+        ou None se o arquivo estiver vazio ou não existir.
+        """
+        return self.indice.carregar()['ultimo'] or None
 
     def recuperar_todos_jogos(self):
         """
-        Lê o arquivo e retorna uma lista de tuplas:
+        Retorna uma lista de tuplas, lida do armazém binário de máscaras:
           [(num_concurso, [d1, d2, ..., d15]), ...]
+        As dezenas vêm em ordem crescente (a ordem do sorteio não é mantida).
         """
-        jogos = []
-        try:
-            with open(self.filename, 'r') as file:
-                lines = file.readlines()
-
-            for line in lines:
-                parts = line.strip().split(',')
-                # parts[0] = número do concurso
-                # parts[1..15] = as dezenas
-                if len(parts) == 16:
-                    num_concurso = int(parts[0])
-                    dezenas = [int(x) for x in parts[1:]]
-                    jogos.append((num_concurso, dezenas))
-        except FileNotFoundError:
-            pass
+        return self.armazem.recuperar_todos_jogos()
+
+    def obter_mascaras(self):
+        """
+        Retorna uma visão somente leitura (uint32) com a máscara de 25 bits
+        de cada concurso, indexada por (concurso - 1); 0 indica concurso
+        ausente. Os dados vêm do arquivo mapeado, sem reler o texto.
+        """
+        return self.armazem.mascaras()
 
-        return jogos
+    def buscar_vizinhos(self, dezenas, minimo=11):
+        """
+        Concursos com pelo menos 'minimo' dezenas em comum com o jogo, mais a
+        distribuição de acertos no histórico (ver models/vizinhos.py).
+        """
+        return buscar_vizinhos(self.obter_mascaras(), dezenas, minimo)
+
+    def obter_estatisticas(self):
+        """
+        Retorna o snapshot de estatísticas (frequências, pares, último concurso
+        de cada dezena e janelas móveis), sem percorrer o histórico.
+        """
+        return self.estatisticas.carregar()
+
+    def obter_motor_estatisticas(self):
+        """
+        Retorna o MotorEstatisticas do banco, reaproveitado (com os intervalos
+        já calculados) enquanto as máscaras não mudarem.
+        """
+        with self.armazem.lock:
+            assinatura = self.armazem.assinatura()
+            if self._motor is None or self._assinatura_motor != assinatura:
+                self._motor = MotorEstatisticas(self.obter_mascaras())
+                self._assinatura_motor = assinatura
+            return self._motor
 
     def obter_info_banco(self):
         """
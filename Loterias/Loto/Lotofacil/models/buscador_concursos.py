@@ -0,0 +1,288 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\buscador_concursos.py
+# Nome do arquivo: buscador_concursos.py
+
+import asyncio
+import random
+import time
+from itertools import islice
+
+import aiohttp
+
+URL_BASE = "https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/"
+
+HEADERS = {
+    "user-agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+        " AppleWebKit/537.36 (KHTML, like Gecko)"
+        " Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "accept-encoding": "gzip, deflate",
+}
+
+# Quantos concursos são retirados da sequência por vez (consulta ao cache + fila)
+BLOCO_AGENDA = 256
+
+# Maior espera entre tentativas, em segundos (inclusive a pedida em Retry-After)
+ESPERA_MAXIMA = 30.0
+
+
+class ControleAIMD:
+    """
+    Limite de concorrência adaptativo (AIMD): cresce de forma aditiva a cada
+    resposta bem-sucedida e cai de forma multiplicativa em 429, 5xx ou timeout.
+    """
+
+    def __init__(self, inicial=4, minimo=1, maximo=32, fator_queda=0.5):
+        self.limite = float(inicial)
+        self.minimo = minimo
+        self.maximo = maximo
+        self.fator_queda = fator_queda
+        self.em_uso = 0
+        self.pico = inicial
+        self._ultima_queda = 0.0
+        self._condicao = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condicao:
+            await self._condicao.wait_for(lambda: self.em_uso < int(self.limite))
+            self.em_uso += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._condicao:
+            self.em_uso -= 1
+            self._condicao.notify_all()
+
+    def sucesso(self):
+        # +1 de concorrência por "janela" completa de respostas bem-sucedidas
+        self.limite = min(self.maximo, self.limite + 1.0 / self.limite)
+        self.pico = max(self.pico, int(self.limite))
+
+    def congestionamento(self, intervalo_minimo=0.5):
+        # Uma rajada de erros simultâneos conta como um único evento de queda
+        agora = time.monotonic()
+        if agora - self._ultima_queda >= intervalo_minimo:
+            self.limite = max(self.minimo, self.limite * self.fator_queda)
+            self._ultima_queda = agora
+
+
+class RelatorioBusca:
+    """
+    Métricas de uma rodada de buscas: vazão, latência e erros.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fim = None
+        self.latencias = []
+        self.sucessos = 0
+        self.falhas = 0
+        self.novas_tentativas = 0
+        self.congestionamentos = 0
+        self.do_cache = 0
+
+    def resumo(self, controle=None):
+        duracao = (self.fim or time.perf_counter()) - self.inicio
+        latencias = sorted(self.latencias)
+
+        def percentil(p):
+            if not latencias:
+                return 0.0
+            return latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000
+
+        texto = (
+            f"Concursos baixados: {self.sucessos} | Do cache: {self.do_cache} | Falhas: {self.falhas} | "
+            f"Novas tentativas: {self.novas_tentativas} | Congestionamentos: {self.congestionamentos}\n"
+            f"Tempo: {duracao:.2f}s | Vazão: {self.sucessos / duracao if duracao else 0:.1f} concursos/s | "
+            f"Latência p50: {percentil(0.5):.0f}ms, p95: {percentil(0.95):.0f}ms"
+        )
+        if controle is not None:
+            texto += f"\nConcorrência final: {int(controle.limite)} (pico: {controle.pico})"
+        return texto
+
+
+class BuscadorConcursos:
+    """
+    Busca concursos da API da Caixa com asyncio + aiohttp: uma sessão com
+    conexões keep-alive reaproveitadas, concorrência AIMD e novas tentativas
+    com espera exponencial e jitter.
+
+    Se um CacheRespostas for informado, concursos já apurados são lidos dele
+    e só os que faltam vão à rede; o "último concurso" ("") sempre é buscado.
+    Com offline=True nada vai à rede: o que não estiver no cache conta como falha.
+    """
+
+    def __init__(self, url_base=URL_BASE, concorrencia_inicial=4, concorrencia_maxima=32,
+                 timeout=10, max_tentativas=5, espera_base=0.25, verificar_ssl=True, cache=None,
+                 offline=False):
+        self.url_base = url_base if url_base.endswith("/") else url_base + "/"
+        self.concorrencia_inicial = concorrencia_inicial
+        self.concorrencia_maxima = concorrencia_maxima
+        self.timeout = timeout
+        self.max_tentativas = max_tentativas
+        self.espera_base = espera_base
+        self.verificar_ssl = verificar_ssl
+        self.cache = cache
+        self.offline = offline
+        self.controle = None
+        self.relatorio = RelatorioBusca()
+
+    def _espera(self, tentativa, retry_after=None):
+        if retry_after:
+            try:
+                espera = float(retry_after)
+            except ValueError:
+                espera = None
+            if espera is not None and espera >= 0:  # descarta NaN e negativos
+                return min(espera, ESPERA_MAXIMA)
+        # "Full jitter": espera aleatória entre 0 e base * 2^tentativa
+        return random.uniform(0, min(self.espera_base * (2 ** tentativa), ESPERA_MAXIMA))
+
+    async def _buscar(self, sessao, numero):
+        """
+        Busca um concurso, com novas tentativas. Retorna o JSON ou None.
+        """
+        url = f"{self.url_base}{numero}"
+        for tentativa in range(self.max_tentativas):
+            retry_after = None
+            async with self.controle:
+                inicio = time.perf_counter()
+                try:
+                    async with sessao.get(url) as resposta:
+                        if resposta.status == 200:
+                            data = await resposta.json(content_type=None)
+                            self.relatorio.latencias.append(time.perf_counter() - inicio)
+                            if data:
+                                self.controle.sucesso()
+                                return data
+                        elif resposta.status == 429 or resposta.status >= 500:
+                            retry_after = resposta.headers.get("Retry-After")
+                            self.controle.congestionamento()
+                            self.relatorio.congestionamentos += 1
+                        else:
+                            # 404 e demais 4xx: o concurso não existe, não adianta repetir
+                            return None
+                except (asyncio.TimeoutError, aiohttp.ClientError, ValueError):
+                    self.controle.congestionamento()
+                    self.relatorio.congestionamentos += 1
+
+            if tentativa + 1 < self.max_tentativas:
+                self.relatorio.novas_tentativas += 1
+                await asyncio.sleep(self._espera(tentativa, retry_after))
+        return None
+
+    async def buscar_varios(self, numeros, ao_receber=None):
+        """
+        Busca todos os concursos em 'numeros' e retorna {numero: json}.
+        Concursos que falharem após todas as tentativas ficam de fora.
+
+        'numeros' pode ser qualquer iterável (ex.: Intervalos.numeros()): é
+        consumido em blocos, com o cache consultado bloco a bloco e uma fila
+        limitada alimentando os trabalhadores, sem materializar a sequência.
+
+        - ao_receber(numero, data): chamado a cada concurso concluído
+          (data é None em caso de falha).
+        """
+        iterador = iter(numeros)
+        self.controle = ControleAIMD(
+            inicial=self.concorrencia_inicial, maximo=self.concorrencia_maxima
+        )
+        self.relatorio = RelatorioBusca()
+        resultados = {}
+        para_o_cache = []
+        erros = []
+        fila = asyncio.Queue(maxsize=self.concorrencia_maxima * 4)
+        trabalhadores = []
+        sessao = None
+
+        async def trabalhador():
+            while True:
+                numero = await fila.get()
+                if numero is None:
+                    return
+                if erros:
+                    # Após um erro só esvazia a fila, para o produtor não travar
+                    continue
+                try:
+                    data = await self._buscar(sessao, numero)
+                    if data is None:
+                        self.relatorio.falhas += 1
+                    else:
+                        self.relatorio.sucessos += 1
+                        resultados[numero] = data
+                        if data.get("numero"):
+                            para_o_cache.append((data["numero"], data))
+                    if ao_receber:
+                        ao_receber(numero, data)
+                except Exception as e:
+                    erros.append(e)
+
+        try:
+            while not erros:
+                bloco = list(islice(iterador, BLOCO_AGENDA))
+                if not bloco:
+                    break
+
+                if self.cache is not None:
+                    do_cache = self.cache.obter_varios(n for n in bloco if n != "")
+                    for numero in bloco:
+                        if numero in do_cache:
+                            resultados[numero] = do_cache[numero]
+                            self.relatorio.do_cache += 1
+                            if ao_receber:
+                                ao_receber(numero, do_cache[numero])
+                    bloco = [n for n in bloco if n not in do_cache]
+
+                if self.offline:
+                    for numero in bloco:
+                        self.relatorio.falhas += 1
+                        if ao_receber:
+                            ao_receber(numero, None)
+                    continue
+
+                for numero in bloco:
+                    if sessao is None:
+                        conector = aiohttp.TCPConnector(
+                            limit=self.concorrencia_maxima, keepalive_timeout=30,
+                            ssl=None if self.verificar_ssl else False
+                        )
+                        sessao = aiohttp.ClientSession(
+                            connector=conector,
+                            headers=HEADERS,
+                            timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        )
+                    if len(trabalhadores) < self.concorrencia_maxima:
+                        trabalhadores.append(asyncio.create_task(trabalhador()))
+                    await fila.put(numero)
+
+            for _ in trabalhadores:
+                await fila.put(None)
+            await asyncio.gather(*trabalhadores)
+        finally:
+            for tarefa in trabalhadores:
+                tarefa.cancel()
+            if sessao is not None:
+                await sessao.close()
+            if self.cache is not None:
+                self.cache.gravar_varios(para_o_cache)
+
+        if erros:
+            raise erros[0]
+
+        self.relatorio.fim = time.perf_counter()
+        return resultados
+
+    def buscar_varios_sync(self, numeros, ao_receber=None):
+        """
+        Versão síncrona de buscar_varios (para chamar a partir de threads comuns).
+        """
+        return asyncio.run(self.buscar_varios(numeros, ao_receber))
+
+    def buscar_um(self, numero):
+        """
+        Busca um único concurso (string vazia -> concurso mais recente).
+        """
+        return self.buscar_varios_sync([numero]).get(numero)
+
+    def resumo(self):
+        return self.relatorio.resumo(self.controle)
@@ -0,0 +1,134 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\cache_respostas.py
+# Nome do arquivo: cache_respostas.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from threading import Lock
+
+# Arquivo compartilhado por todos os scripts de Loterias/Loto
+CAMINHO_PADRAO = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'respostas_lotofacil.sqlite3'
+)
+
+
+class CacheRespostas:
+    """
+    Cache em disco (SQLite) das respostas JSON da API, endereçado por conteúdo:
+      - respostas(hash, dados): JSON canônico comprimido com zlib, chave = sha256;
+      - concursos(numero, hash): aponta cada concurso para sua resposta.
+
+    Um concurso apurado nunca muda, então uma vez gravado não é mais baixado.
+    Apenas o endpoint do "último concurso" deve ir sempre à rede.
+    """
+
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        self.caminho = caminho
+        self.lock = Lock()
+        self.conn = sqlite3.connect(caminho, check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS respostas (
+                hash  TEXT PRIMARY KEY,
+                dados BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS concursos (
+                numero INTEGER PRIMARY KEY,
+                hash   TEXT NOT NULL REFERENCES respostas(hash)
+            );
+            """
+        )
+
+    @staticmethod
+    def _codificar(data):
+        canonico = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return hashlib.sha256(canonico).hexdigest(), zlib.compress(canonico, 6)
+
+    @staticmethod
+    def _decodificar(dados):
+        return json.loads(zlib.decompress(dados))
+
+    def obter(self, numero):
+        """
+        Retorna o JSON do concurso ou None se não estiver no cache.
+        """
+        with self.lock:
+            linha = self.conn.execute(
+                "SELECT r.dados FROM concursos c JOIN respostas r ON r.hash = c.hash"
+                " WHERE c.numero = ?",
+                (int(numero),)
+            ).fetchone()
+        return self._decodificar(linha[0]) if linha else None
+
+    def obter_varios(self, numeros):
+        """
+        Retorna {numero: json} para os concursos de 'numeros' presentes no cache.
+        """
+        numeros = [int(n) for n in numeros]
+        resultado = {}
+        with self.lock:
+            for i in range(0, len(numeros), 900):
+                bloco = numeros[i:i + 900]
+                marcadores = ','.join('?' * len(bloco))
+                for numero, dados in self.conn.execute(
+                    "SELECT c.numero, r.dados FROM concursos c JOIN respostas r ON r.hash = c.hash"
+                    f" WHERE c.numero IN ({marcadores})",
+                    bloco
+                ):
+                    resultado[numero] = dados
+        return {numero: self._decodificar(dados) for numero, dados in resultado.items()}
+
+    def gravar(self, numero, data):
+        self.gravar_varios([(numero, data)])
+
+    def gravar_varios(self, itens):
+        """
+        Grava [(numero, json), ...] em uma única transação.
+        """
+        linhas = []
+        for numero, data in itens:
+            hash_, dados = self._codificar(data)
+            linhas.append((int(numero), hash_, dados))
+        if not linhas:
+            return
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO respostas (hash, dados) VALUES (?, ?)",
+                [(hash_, dados) for _, hash_, dados in linhas]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO concursos (numero, hash) VALUES (?, ?)",
+                [(numero, hash_) for numero, hash_, _ in linhas]
+            )
+
+    def numeros(self):
+        """
+        Retorna a lista ordenada dos concursos presentes no cache.
+        """
+        with self.lock:
+            return [n for (n,) in self.conn.execute("SELECT numero FROM concursos ORDER BY numero")]
+
+    def ultimo_numero(self):
+        with self.lock:
+            (ultimo,) = self.conn.execute("SELECT MAX(numero) FROM concursos").fetchone()
+        return ultimo
+
+    def iterar(self):
+        """
+        Percorre (numero, json) de todos os concursos em ordem crescente,
+        permitindo reconstruir qualquer destino sem acessar a rede.
+        """
+        with self.lock:
+            linhas = self.conn.execute(
+                "SELECT c.numero, r.dados FROM concursos c JOIN respostas r ON r.hash = c.hash"
+                " ORDER BY c.numero"
+            ).fetchall()
+        for numero, dados in linhas:
+            yield numero, self._decodificar(dados)
+
+    def fechar(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,101 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\carga_em_lote.py
+# Nome do arquivo: carga_em_lote.py
+
+import time
+from itertools import islice
+
+# Marcador de parâmetro e cláusula de upsert de cada banco suportado
+DIALETOS = {
+    'mysql': {
+        'marcador': '%s',
+        'upsert': 'ON DUPLICATE KEY UPDATE {atribuicoes}',
+        'atribuicao': '{coluna} = VALUES({coluna})',
+        'max_parametros': 65535,
+    },
+    'sqlite': {
+        'marcador': '?',
+        'upsert': 'ON CONFLICT({chave}) DO UPDATE SET {atribuicoes}',
+        'atribuicao': '{coluna} = excluded.{coluna}',
+        'max_parametros': 999,
+    },
+}
+
+
+class ResultadoCarga:
+    def __init__(self, linhas, segundos, lotes):
+        self.linhas = linhas
+        self.segundos = segundos
+        self.lotes = lotes
+
+    @property
+    def linhas_por_segundo(self):
+        return self.linhas / self.segundos if self.segundos else float('inf')
+
+    def __str__(self):
+        return (
+            f"{self.linhas} linhas em {self.lotes} lotes, {self.segundos:.2f}s "
+            f"({self.linhas_por_segundo:.0f} linhas/s)"
+        )
+
+
+def montar_upsert(tabela, colunas, chave, quantidade, dialeto='mysql'):
+    """
+    Monta um INSERT parametrizado com 'quantidade' linhas em VALUES e
+    semântica de upsert sobre a coluna 'chave'.
+    """
+    d = DIALETOS[dialeto]
+    linha = '(' + ', '.join([d['marcador']] * len(colunas)) + ')'
+    atribuicoes = ', '.join(
+        d['atribuicao'].format(coluna=c) for c in colunas if c != chave
+    )
+    return (
+        f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES "
+        + ', '.join([linha] * quantidade)
+        + ' ' + d['upsert'].format(chave=chave, atribuicoes=atribuicoes)
+    )
+
+
+def carregar_em_lote(conn, linhas, tabela='loto', colunas=('data_concurso', 'concurso', 'dezenas'),
+                     chave='concurso', dialeto='mysql', tamanho_lote=500, progresso=None, commit=True):
+    """
+    Insere (ou atualiza) todas as 'linhas' em lotes de INSERT multi-linha,
+    dentro de uma única transação: um round trip por lote e um único commit.
+    Em caso de erro a transação inteira é desfeita e a exceção propagada.
+
+    Com commit=False a transação fica aberta ao final, para quem chama
+    acrescentar outras cargas e fazer o commit uma única vez.
+
+    'linhas' pode ser qualquer iterável (inclusive um gerador lendo de um
+    cursor): só um lote fica em memória por vez.
+
+    - progresso(linhas_gravadas): chamado após cada lote
+    """
+    iterador = iter(linhas)
+    limite = DIALETOS[dialeto]['max_parametros'] // len(colunas)
+    tamanho_lote = max(1, min(tamanho_lote, limite))
+    inicio = time.perf_counter()
+    cursor = conn.cursor()
+    lotes = 0
+    total = 0
+    comando_cheio = montar_upsert(tabela, colunas, chave, tamanho_lote, dialeto)
+    try:
+        while True:
+            bloco = list(islice(iterador, tamanho_lote))
+            if not bloco:
+                break
+            comando = comando_cheio if len(bloco) == tamanho_lote else montar_upsert(
+                tabela, colunas, chave, len(bloco), dialeto
+            )
+            cursor.execute(comando, [valor for linha in bloco for valor in linha])
+            lotes += 1
+            total += len(bloco)
+            if progresso:
+                progresso(total)
+        if commit:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return ResultadoCarga(total, time.perf_counter() - inicio, lotes)
@@ -0,0 +1,140 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\codec_jogo.py
+# Nome do arquivo: codec_jogo.py
+
+from math import comb
+
+import numpy as np
+
+TOTAL_COMBINACOES = comb(25, 15)  # 3.268.760: cabe em 4 bytes (uint32)
+
+# BINOMIAIS[c, i] = C(c, i), para c em 0..25 e i em 0..15
+BINOMIAIS = np.array([[comb(c, i) for i in range(16)] for c in range(26)], dtype=np.int64)
+
+_BITS = np.arange(25, dtype=np.uint32)
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(valores):
+        """
+        Quantidade de bits 1 de cada elemento (vetorizado).
+        """
+        return np.bitwise_count(np.asarray(valores, dtype=np.uint32)).astype(np.uint8)
+else:
+    # NumPy < 2.0: tabela com a contagem de cada número de 16 bits
+    _BITS_16 = np.array([bin(i).count('1') for i in range(1 << 16)], dtype=np.uint8)
+
+    def popcount(valores):
+        """
+        Quantidade de bits 1 de cada elemento (vetorizado).
+        """
+        valores = np.asarray(valores, dtype=np.uint32)
+        return _BITS_16[valores & 0xFFFF] + _BITS_16[valores >> 16]
+
+
+# ================================================
+# Um jogo por vez
+# ================================================
+# O rank é a posição do jogo na ordem colexicográfica das combinações de 15
+# entre 25: com c1 < c2 < ... < c15 (dezena - 1), rank = soma de C(ci, i).
+# Essa ordem coincide com a ordem numérica das máscaras de 25 bits.
+
+def rank_de_dezenas(dezenas):
+    return sum(comb(d - 1, i) for i, d in enumerate(sorted(dezenas), start=1))
+
+
+def dezenas_de_rank(rank):
+    if not 0 <= rank < TOTAL_COMBINACOES:
+        raise ValueError(f"Rank fora do intervalo [0, {TOTAL_COMBINACOES}): {rank}")
+    dezenas = []
+    c = 24
+    for i in range(15, 0, -1):
+        while comb(c, i) > rank:
+            c -= 1
+        rank -= comb(c, i)
+        dezenas.append(c + 1)
+        c -= 1
+    return dezenas[::-1]
+
+
+# ================================================
+# Em lote (NumPy)
+# ================================================
+
+def ranks_de_mascaras(mascaras):
+    """
+    Máscaras de 25 bits (15 bits ligados) -> ranks uint32.
+    """
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    ordem = np.zeros(len(mascaras), dtype=np.int64)  # quantas dezenas já vistas
+    ranks = np.zeros(len(mascaras), dtype=np.int64)
+    for c in range(25):
+        bit = ((mascaras >> np.uint32(c)) & 1).astype(np.int64)
+        ordem += bit
+        ranks += BINOMIAIS[c, ordem] * bit
+    return ranks.astype(np.uint32)
+
+
+def mascaras_de_ranks(ranks):
+    """
+    Ranks -> máscaras de 25 bits, escolhendo as 15 dezenas da maior para a
+    menor com uma busca binária por coluna de BINOMIAIS.
+    """
+    restante = np.asarray(ranks, dtype=np.int64).copy()
+    if np.any((restante < 0) | (restante >= TOTAL_COMBINACOES)):
+        raise ValueError(f"Rank fora do intervalo [0, {TOTAL_COMBINACOES})")
+    mascaras = np.zeros(len(restante), dtype=np.uint32)
+    for i in range(15, 0, -1):
+        c = np.searchsorted(BINOMIAIS[:, i], restante, side='right') - 1
+        restante -= BINOMIAIS[c, i]
+        mascaras |= np.left_shift(np.uint32(1), c.astype(np.uint32))
+    return mascaras
+
+
+def ranks_de_dezenas(matriz):
+    """
+    Matriz N x 15 de dezenas (1 a 25, em qualquer ordem) -> ranks uint32.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint32)
+    mascaras = np.bitwise_or.reduce(np.left_shift(np.uint32(1), matriz - 1), axis=1)
+    return ranks_de_mascaras(mascaras)
+
+
+def dezenas_de_ranks(ranks):
+    """
+    Ranks -> matriz N x 15 com as dezenas em ordem crescente.
+    """
+    bits = (mascaras_de_ranks(ranks)[:, None] >> _BITS) & 1
+    return np.nonzero(bits)[1].reshape(-1, 15).astype(np.uint8) + 1
+
+
+class BitsetRanks:
+    """
+    Conjunto de jogos como um bit por combinação possível (~400 KB):
+    inclusão e consulta O(1), inclusive em lote.
+    """
+
+    def __init__(self, bits=None):
+        self.bits = bits if bits is not None else np.zeros((TOTAL_COMBINACOES + 7) // 8, dtype=np.uint8)
+
+    def __contains__(self, rank):
+        return bool(self.bits[rank >> 3] & (1 << (rank & 7)))
+
+    def __len__(self):
+        return int(popcount(self.bits).sum())
+
+    def adicionar(self, rank):
+        """
+        Inclui o rank. Retorna True se ele ainda não estava no conjunto.
+        """
+        byte, bit = rank >> 3, 1 << (rank & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        return True
+
+    def contem_varios(self, ranks):
+        ranks = np.asarray(ranks, dtype=np.uint32)
+        return (self.bits[ranks >> 3] >> (ranks & 7).astype(np.uint8)) & 1 == 1
+
+    def adicionar_varios(self, ranks):
+        ranks = np.asarray(ranks, dtype=np.uint32)
+        np.bitwise_or.at(self.bits, ranks >> 3, np.left_shift(np.uint8(1), (ranks & 7).astype(np.uint8)))
@@ -0,0 +1,146 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\conferencia.py
+# Nome do arquivo: conferencia.py
+
+import re
+
+import numpy as np
+
+from models.codec_jogo import popcount
+
+PADRAO_NUMERO = re.compile(r'\d+')
+
+# Faixas premiadas da Lotofácil
+PONTUACOES = (11, 12, 13, 14, 15)
+
+# Bilhetes por bloco ao cruzar com vários concursos (limita a matriz em memória)
+BLOCO_BILHETES = 4096
+
+
+def _mascara_de_numeros(numeros):
+    """
+    Máscara de uma lista de dezenas (texto), ou None se não for um bilhete
+    válido: de 15 a 20 dezenas distintas entre 1 e 25.
+    """
+    dezenas = {int(n) for n in numeros}
+    if not 15 <= len(numeros) <= 20 or len(dezenas) != len(numeros):
+        return None
+    if not all(1 <= d <= 25 for d in dezenas):
+        return None
+    return sum(1 << (d - 1) for d in dezenas)
+
+
+def _mascara_de_pares(texto):
+    # Dezenas coladas em pares ("010203..."); comprimento ímpar é inválido
+    if len(texto) % 2:
+        return None
+    return _mascara_de_numeros([texto[i:i + 2] for i in range(0, len(texto), 2)])
+
+
+def ler_bilhetes(texto):
+    """
+    Lê um bilhete por linha (arquivo ou área de transferência), com as
+    dezenas separadas por qualquer caractere ou coladas em pares. Um bilhete
+    válido tem de 15 a 20 dezenas distintas entre 1 e 25; linhas em branco
+    são ignoradas. Também aceita:
+      - linhas do histórico ("01 02 ... | Gap: x, Std: y"): o que vem depois
+        de "|" é descartado;
+      - um bilhete de 15 dezenas em linhas seguidas, como o "Copiar Jogo"
+        (3 linhas de 5); fica registrado na primeira dessas linhas.
+
+    O texto é separado em números direto sobre os bytes, com NumPy; só as
+    linhas com dezenas coladas passam por Python.
+
+    Retorna (mascaras uint32, invalidas), com invalidas = [(nº da linha, texto)].
+    """
+    originais = texto.split('\n')
+    if '|' in texto:
+        texto = '\n'.join(linha.split('|', 1)[0] for linha in originais)
+    dados = np.frombuffer(texto.encode('utf-8', 'replace'), dtype=np.uint8)
+    quebras = np.flatnonzero(dados == 10)
+    total_linhas = len(quebras) + 1
+    inicios_linha = np.concatenate(([0], quebras + 1))
+
+    # Números: sequências de dígitos, localizadas pelas bordas da máscara
+    digito = (dados - 48) < 10
+    anterior = np.concatenate(([False], digito[:-1]))
+    seguinte = np.concatenate((digito[1:], [False]))
+    inicios = np.flatnonzero(digito & ~anterior)
+    comprimentos = np.flatnonzero(digito & ~seguinte) - inicios + 1
+    linha_do_numero = np.searchsorted(quebras, inicios)
+
+    primeiro = dados[inicios].astype(np.int64) - 48
+    segundo = dados[np.minimum(inicios + 1, len(dados) - 1)].astype(np.int64) - 48
+    valores = np.where(comprimentos == 2, primeiro * 10 + segundo, primeiro)
+    fora = (comprimentos > 2) | (valores < 1) | (valores > 25)
+
+    # Máscara de cada linha montada de uma vez; dezenas repetidas somem na
+    # máscara e são detectadas comparando o popcount com a quantidade lida
+    bits = np.where(fora, 0, np.left_shift(1, np.clip(valores - 1, 0, 24))).astype(np.uint32)
+    mascaras = np.zeros(total_linhas, dtype=np.uint32)
+    np.bitwise_or.at(mascaras, linha_do_numero, bits)
+    tamanhos = np.bincount(linha_do_numero, minlength=total_linhas)
+    com_fora = np.bincount(linha_do_numero, weights=fora, minlength=total_linhas) > 0
+    validas = (tamanhos >= 15) & (tamanhos <= 20) & ~com_fora & (popcount(mascaras) == tamanhos)
+
+    # Linhas com algum caractere visível (um byte sentinela cobre a última linha vazia)
+    visiveis = np.concatenate((dados > 32, [False]))
+    preenchidas = np.logical_or.reduceat(visiveis, inicios_linha)
+
+    textos = texto.split('\n')
+    for i in np.flatnonzero(preenchidas & (tamanhos == 1)):
+        numeros = PADRAO_NUMERO.findall(textos[i])
+        if len(numeros[0]) > 2:
+            mascara = _mascara_de_pares(numeros[0])
+            if mascara is not None:
+                mascaras[i] = mascara
+                validas[i] = True
+
+    # Linhas seguidas com menos de 15 dezenas que somam exatamente 15
+    curtas = preenchidas & ~validas & ~com_fora & (tamanhos < 15)
+    agrupadas = np.zeros(total_linhas, dtype=bool)
+    grupo, soma = [], 0
+    for i in np.flatnonzero(curtas).tolist():
+        if grupo and i != grupo[-1] + 1:
+            grupo, soma = [], 0
+        grupo.append(i)
+        soma += int(tamanhos[i])
+        if soma > 15:
+            grupo, soma = [i], int(tamanhos[i])
+        if soma == 15:
+            mascara = np.bitwise_or.reduce(mascaras[grupo])
+            if popcount(mascara) == 15:
+                mascaras[grupo[0]] = mascara
+                validas[grupo[0]] = True
+                agrupadas[grupo[1:]] = True
+            grupo, soma = [], 0
+
+    invalidas = [(int(i) + 1, originais[i].strip()) for i in np.flatnonzero(preenchidas & ~validas & ~agrupadas)]
+    return mascaras[preenchidas & validas], invalidas
+
+
+def ler_bilhetes_arquivo(caminho):
+    with open(caminho, 'r', encoding='utf-8', errors='replace') as file:
+        return ler_bilhetes(file.read())
+
+
+def conferir_sorteio(bilhetes, sorteio):
+    """
+    Acertos de cada bilhete contra um único sorteio (máscara).
+    """
+    return popcount(np.asarray(bilhetes, dtype=np.uint32) & np.uint32(sorteio))
+
+
+def histograma_por_bilhete(bilhetes, sorteios):
+    """
+    Cruza cada bilhete com todos os sorteios e conta, por bilhete, quantas
+    vezes fez 11, 12, 13, 14 e 15 pontos. Retorna matriz N x 5 (int32).
+    """
+    bilhetes = np.asarray(bilhetes, dtype=np.uint32)
+    sorteios = np.asarray(sorteios, dtype=np.uint32)
+    histograma = np.zeros((len(bilhetes), len(PONTUACOES)), dtype=np.int32)
+    for inicio in range(0, len(bilhetes), BLOCO_BILHETES):
+        bloco = bilhetes[inicio:inicio + BLOCO_BILHETES]
+        acertos = popcount(bloco[:, None] & sorteios[None, :])
+        for coluna, pontos in enumerate(PONTUACOES):
+            histograma[inicio:inicio + len(bloco), coluna] = np.count_nonzero(acertos == pontos, axis=1)
+    return histograma
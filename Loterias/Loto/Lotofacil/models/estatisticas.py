@@ -0,0 +1,119 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\estatisticas.py
+# Nome do arquivo: estatisticas.py
+
+import numpy as np
+
+DEZENAS = np.arange(1, 26, dtype=np.int64)
+
+# Mesmos limites de Jogo.avaliar_distribuicao_avg_gap (comparados com '<')
+LIMITES_GAP = np.array([1.2, 1.4, 1.6, 1.8])
+
+# Jogo.avaliar_distribuicao_std compara pstdev com 4, 5, 6 e 7. Com S1 = soma
+# e S2 = soma dos quadrados das 15 dezenas, a variância é D / 225, onde
+# D = 15 * S2 - S1², então std < k  <=>  D < 225 * k²: comparação inteira e exata.
+LIMITES_STD = np.array([225 * k * k for k in (4, 5, 6, 7)], dtype=np.int64)
+
+
+def _mais_comuns(valores):
+    """
+    Equivalente a Counter(valores).most_common(): ordem decrescente de
+    contagem e, nos empates, ordem da primeira ocorrência.
+    """
+    if len(valores) == 0:
+        return []
+    unicos, primeiros, contagens = np.unique(valores, return_index=True, return_counts=True)
+    ordem = np.lexsort((primeiros, -contagens))
+    return [(unicos[i].item(), int(contagens[i])) for i in ordem]
+
+
+def matriz_de_mascaras(mascaras):
+    """
+    Expande máscaras de 25 bits em uma matriz N x 25 booleana
+    (linha = jogo, coluna = dezena - 1).
+    """
+    bits = np.arange(25, dtype=np.uint32)
+    return ((np.asarray(mascaras, dtype=np.uint32)[:, None] >> bits) & 1).astype(bool)
+
+
+def faixas_da_matriz(matriz):
+    """
+    Faixas (1 a 5) de Gap e de Std Dev de cada linha, idênticas às de Jogo.
+    Retorna (faixas_gap, faixas_std) como vetores int8.
+    """
+    menor = np.argmax(matriz, axis=1) + 1
+    maior = 25 - np.argmax(matriz[:, ::-1], axis=1)
+    # A soma das diferenças consecutivas é maior - menor
+    faixas_gap = (np.digitize((maior - menor) / 14, LIMITES_GAP) + 1).astype(np.int8)
+
+    s1 = matriz @ DEZENAS
+    s2 = matriz @ (DEZENAS * DEZENAS)
+    faixas_std = (np.digitize(15 * s2 - s1 * s1, LIMITES_STD) + 1).astype(np.int8)
+    return faixas_gap, faixas_std
+
+
+class MotorEstatisticas:
+    """
+    Estatísticas de Gap e Std Dev do histórico inteiro, calculadas de uma
+    vez com NumPy a partir das máscaras de 25 bits do banco. As faixas
+    (1 a 5) batem exatamente com as de Jogo.
+
+    Consultas por intervalo de concursos são apenas fatias dos vetores
+    já calculados; o resultado de cada fatia é memorizado, então repetir
+    um intervalo (ou pedir outro que cubra os mesmos concursos) é imediato.
+    """
+
+    def __init__(self, mascaras):
+        """
+        mascaras: sequência de uint32 indexada por (concurso - 1); 0 = ausente.
+        """
+        mascaras = np.array(mascaras, dtype=np.uint32)
+        self.mascaras = mascaras
+        self._resultados = {}
+        presentes = np.nonzero(mascaras)[0]
+        self.concursos = presentes + 1
+        self.matriz = matriz_de_mascaras(mascaras[presentes])
+        self.faixas_gap, self.faixas_std = faixas_da_matriz(self.matriz)
+
+    def __len__(self):
+        return len(self.concursos)
+
+    def _fatia(self, inicio=None, fim=None):
+        a = 0 if inicio is None else np.searchsorted(self.concursos, inicio, side='left')
+        b = len(self.concursos) if fim is None else np.searchsorted(self.concursos, fim, side='right')
+        return slice(a, b)
+
+    def calcular(self, inicio=None, fim=None):
+        """
+        Estatísticas dos concursos em [inicio, fim] (None = sem limite).
+
+        Retorna um dicionário com a quantidade de jogos, média/mín/máx das
+        faixas de Gap e Std e as ocorrências de cada faixa e de cada par
+        (Gap, Std), na ordem de Counter.most_common(). Retorna None se não
+        houver concursos no intervalo.
+        """
+        fatia = self._fatia(inicio, fim)
+        chave = (int(fatia.start), int(fatia.stop))
+        if chave not in self._resultados:
+            self._resultados[chave] = self._calcular_fatia(fatia)
+        return self._resultados[chave]
+
+    def _calcular_fatia(self, fatia):
+        gaps = self.faixas_gap[fatia]
+        stds = self.faixas_std[fatia]
+        quantidade = len(gaps)
+        if quantidade == 0:
+            return None
+
+        combinacoes = _mais_comuns(gaps.astype(np.int16) * 8 + stds)
+        return {
+            'quantidade': quantidade,
+            'gap_medio': int(gaps.sum()) / quantidade,
+            'gap_min': int(gaps.min()),
+            'gap_max': int(gaps.max()),
+            'std_medio': int(stds.sum()) / quantidade,
+            'std_min': int(stds.min()),
+            'std_max': int(stds.max()),
+            'gap_contagens': _mais_comuns(gaps),
+            'std_contagens': _mais_comuns(stds),
+            'combinacoes': [((codigo // 8, codigo % 8), total) for codigo, total in combinacoes],
+        }
@@ -0,0 +1,204 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\gerador_paralelo.py
+# Nome do arquivo: gerador_paralelo.py
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from models.codec_jogo import TOTAL_COMBINACOES, BitsetRanks, mascaras_de_ranks, popcount, ranks_de_mascaras
+from models.jogo import Jogo
+from models.tabela_faixas import CAMINHO_PADRAO, TabelaFaixas, faixas_aceitas
+
+# Candidatos sorteados por tarefa (antes dos filtros e da deduplicação)
+LOTE_CANDIDATOS = 20000
+
+# Lotes seguidos sem nenhum jogo novo até concluir que os filtros se esgotaram
+LOTES_SEM_NOVOS = 50
+
+# Bytes do bitset de deduplicação (um bit por combinação)
+TAMANHO_BITSET = (TOTAL_COMBINACOES + 7) // 8
+
+# Dezenas ímpares (1, 3, ..., 25) = bits 0, 2, ..., 24
+MASCARA_IMPARES = sum(1 << (d - 1) for d in range(1, 26, 2))
+
+
+class FiltrosJogo:
+    """
+    Restrições de um jogo gerado em lote:
+      - desejado_gap / desejado_std: como em gerar_jogo_com_restricoes
+        (aplicadas pela TabelaFaixas, antes do sorteio);
+      - impares: (mínimo, máximo) de dezenas ímpares;
+      - soma: (mínimo, máximo) da soma das 15 dezenas.
+    None = sem restrição.
+    """
+
+    def __init__(self, desejado_gap=None, desejado_std=None, impares=None, soma=None):
+        self.desejado_gap = desejado_gap
+        self.desejado_std = desejado_std
+        self.impares = impares
+        self.soma = soma
+
+    def codigos_aceitos(self):
+        """
+        Códigos da TabelaFaixas (faixa_gap * 8 + faixa_std) aceitos.
+        """
+        faixas_gap, faixas_std = faixas_aceitas(self.desejado_gap, self.desejado_std)
+        return [g * 8 + s for g in faixas_gap for s in faixas_std]
+
+    def aplicar(self, mascaras):
+        """
+        Vetor booleano: quais máscaras passam pelos filtros de ímpares e soma.
+        """
+        mascaras = np.asarray(mascaras, dtype=np.uint32)
+        aceitos = np.ones(len(mascaras), dtype=bool)
+        if self.impares is not None:
+            impares = popcount(mascaras & np.uint32(MASCARA_IMPARES))
+            aceitos &= (impares >= self.impares[0]) & (impares <= self.impares[1])
+        if self.soma is not None:
+            soma = np.zeros(len(mascaras), dtype=np.int64)
+            for c in range(25):
+                soma += ((mascaras >> np.uint32(c)) & 1).astype(np.int64) * (c + 1)
+            aceitos &= (soma >= self.soma[0]) & (soma <= self.soma[1])
+        return aceitos
+
+
+# ================================================
+# Trabalhador (um por processo do pool)
+# ================================================
+# Cada processo mantém os ranks aceitos pelos filtros de Gap/Std e uma visão
+# do bitset compartilhado. Só o processo principal escreve no bitset; os
+# trabalhadores o leem para descartar cedo jogos já gerados ou excluídos.
+
+_estado = {}
+
+
+def _bitset_compartilhado(memoria):
+    return BitsetRanks(np.ndarray(TAMANHO_BITSET, dtype=np.uint8, buffer=memoria.buf))
+
+
+def _iniciar_trabalhador(arquivo_tabela, filtros, nome_bitset=None, bitset=None):
+    tabela = TabelaFaixas(arquivo_tabela).carregar()
+    if nome_bitset is not None:
+        memoria = shared_memory.SharedMemory(name=nome_bitset)
+        _estado['memoria'] = memoria  # mantém o mapeamento vivo
+        bitset = _bitset_compartilhado(memoria)
+    _estado['filtros'] = filtros
+    _estado['bitset'] = bitset
+    _estado['aceitos'] = np.flatnonzero(np.isin(tabela, filtros.codigos_aceitos())).astype(np.uint32)
+
+
+def _gerar_lote(quantidade, semente):
+    """
+    Sorteia 'quantidade' candidatos entre os ranks aceitos e devolve
+    (ranks que passaram pelos filtros, sem repetição, na ordem sorteada,
+    quantidade de candidatos avaliados).
+    """
+    aceitos = _estado['aceitos']
+    if not len(aceitos):
+        return np.empty(0, dtype=np.uint32), 0
+    rng = np.random.default_rng(semente)
+    ranks = aceitos[rng.integers(0, len(aceitos), size=quantidade)]
+    _, primeiros = np.unique(ranks, return_index=True)
+    ranks = ranks[np.sort(primeiros)]
+    ranks = ranks[~_estado['bitset'].contem_varios(ranks)]
+    ranks = ranks[_estado['filtros'].aplicar(mascaras_de_ranks(ranks))]
+    return ranks, quantidade
+
+
+# ================================================
+# API de geração
+# ================================================
+
+def gerar_jogos(quantidade, filtros=None, excluir=(), processos=None, cancelar=None,
+                progresso=None, lote=LOTE_CANDIDATOS, arquivo_tabela=CAMINHO_PADRAO):
+    """
+    Gera até 'quantidade' jogos distintos que atendam aos filtros, entregando
+    cada Jogo assim que é encontrado (gerador).
+
+    - excluir: máscaras que não podem sair (ex.: concursos já sorteados,
+      jogos do histórico); entram no bitset de deduplicação desde o início
+    - processos: processos do pool (None = um por CPU; 1 = no processo atual)
+    - cancelar: objeto com is_set() (ex.: threading.Event) consultado entre lotes
+    - progresso(gerados, candidatos): chamado após cada lote
+
+    Termina antes de 'quantidade' se for cancelado ou se LOTES_SEM_NOVOS lotes
+    seguidos não trouxerem nenhum jogo novo (filtros esgotados).
+    """
+    filtros = filtros or FiltrosJogo()
+    TabelaFaixas(arquivo_tabela).carregar()  # constrói a tabela uma única vez, antes do pool
+
+    memoria = None
+    if processos == 1:
+        bitset = BitsetRanks()
+    else:
+        memoria = shared_memory.SharedMemory(create=True, size=TAMANHO_BITSET)
+        bitset = _bitset_compartilhado(memoria)
+        bitset.bits[:] = 0
+    excluir = np.asarray([m for m in excluir if m], dtype=np.uint32)
+    if len(excluir):
+        bitset.adicionar_varios(ranks_de_mascaras(excluir))
+
+    sementes = np.random.SeedSequence()
+    gerados = candidatos = sem_novos = 0
+    executor = None
+    try:
+        if processos == 1:
+            _iniciar_trabalhador(arquivo_tabela, filtros, bitset=bitset)
+
+            def resultados():
+                while True:
+                    yield _gerar_lote(lote, sementes.spawn(1)[0])
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=processos, initializer=_iniciar_trabalhador,
+                initargs=(arquivo_tabela, filtros, memoria.name)
+            )
+            em_andamento = (processos or os.cpu_count() or 1) * 2
+
+            def resultados():
+                pendentes = {executor.submit(_gerar_lote, lote, s) for s in sementes.spawn(em_andamento)}
+                while True:
+                    prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                    for futuro in prontos:
+                        pendentes.add(executor.submit(_gerar_lote, lote, sementes.spawn(1)[0]))
+                        yield futuro.result()
+
+        for ranks, avaliados in resultados():
+            if cancelar is not None and cancelar.is_set():
+                break
+            candidatos += avaliados
+            # Outro lote pode ter entregue os mesmos ranks depois da leitura do bitset
+            novos = ranks[~bitset.contem_varios(ranks)][:quantidade - gerados]
+            bitset.adicionar_varios(novos)
+            for rank in novos.tolist():
+                if cancelar is not None and cancelar.is_set():
+                    return
+                gerados += 1
+                yield Jogo(rank=rank)
+            if progresso is not None:
+                progresso(gerados, candidatos)
+            sem_novos = 0 if len(novos) else sem_novos + 1
+            if gerados >= quantidade or avaliados == 0 or sem_novos >= LOTES_SEM_NOVOS:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if memoria is not None:
+            bitset = None  # libera a visão antes de fechar a memória compartilhada
+            memoria.close()
+            memoria.unlink()
+
+
+def salvar_jogos(jogos, caminho):
+    """
+    Grava os jogos à medida que são gerados, um por linha ("01 02 ... 25",
+    o formato lido por ler_bilhetes). Retorna quantos foram gravados.
+    """
+    total = 0
+    with open(caminho, 'w', encoding='utf-8') as file:
+        for jogo in jogos:
+            file.write(" ".join(f"{d:02d}" for d in jogo.dezenas) + "\n")
+            total += 1
+    return total
@@ -0,0 +1,141 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\historico.py
+# Nome do arquivo: historico.py
+
+import os
+from collections import Counter
+
+import numpy as np
+
+from models.armazem_mascaras import dezenas_para_mascara, mascara_para_dezenas
+from models.codec_jogo import popcount
+from models.conferencia import ler_bilhetes_arquivo
+from models.estatisticas import faixas_da_matriz, matriz_de_mascaras
+from models.jogo import Jogo
+
+
+def _linha_arquivo(mascara):
+    return " ".join(f"{d:02d}" for d in mascara_para_dezenas(mascara)) + "\n"
+
+
+class HistoricoJogos:
+    """
+    Jogos gerados, do mais antigo para o mais recente, sem repetição.
+
+    Cada jogo é guardado como máscara, com as suas faixas de Gap e Std Dev;
+    um conjunto (hash) das máscaras detecta repetidos e as ocorrências de
+    cada par Gap+Std são contadas à medida que os jogos entram. Incluir,
+    consultar e contar custam o mesmo com 10 ou 100 mil jogos.
+
+    Opcionalmente vinculado a um arquivo texto (um jogo por linha, o formato
+    de ler_bilhetes), ao qual cada jogo novo é acrescentado.
+    """
+
+    def __init__(self):
+        self.mascaras = []
+        self.faixas = []  # (faixa_gap, faixa_std) de cada jogo
+        self.combinacoes = Counter()
+        self._conjunto = set()
+        self._ultima_vez = {}  # posição do jogo mais recente de cada par Gap+Std
+        self.arquivo = None
+
+    def __len__(self):
+        return len(self.mascaras)
+
+    def __contains__(self, jogo):
+        mascara = int(jogo) if isinstance(jogo, (int, np.integer)) else dezenas_para_mascara(jogo.dezenas)
+        return mascara in self._conjunto
+
+    def _registrar(self, mascara, faixa_gap, faixa_std):
+        if mascara in self._conjunto:
+            return False
+        self._conjunto.add(mascara)
+        self._ultima_vez[(faixa_gap, faixa_std)] = len(self.mascaras)
+        self.mascaras.append(mascara)
+        self.faixas.append((faixa_gap, faixa_std))
+        self.combinacoes[(faixa_gap, faixa_std)] += 1
+        return True
+
+    def _acrescentar_ao_arquivo(self, mascaras):
+        if self.arquivo and mascaras:
+            with open(self.arquivo, 'a', encoding='utf-8') as file:
+                file.writelines(_linha_arquivo(m) for m in mascaras)
+
+    def adicionar(self, jogo):
+        """
+        Inclui um Jogo. Retorna False (e não inclui) se ele já estiver no histórico.
+        """
+        mascara = dezenas_para_mascara(jogo.dezenas)
+        if not self._registrar(mascara, jogo.avaliar_distribuicao_avg_gap(), jogo.avaliar_distribuicao_std()):
+            return False
+        self._acrescentar_ao_arquivo([mascara])
+        return True
+
+    def adicionar_mascaras(self, mascaras):
+        """
+        Inclui vários jogos (máscaras de 15 dezenas) com as faixas calculadas
+        de uma vez. Retorna quantos eram novos.
+        """
+        mascaras = np.asarray(mascaras, dtype=np.uint32)
+        if not len(mascaras):
+            return 0
+        faixas_gap, faixas_std = faixas_da_matriz(matriz_de_mascaras(mascaras))
+        novas = [
+            m for m, g, s in zip(mascaras.tolist(), faixas_gap.tolist(), faixas_std.tolist())
+            if self._registrar(m, g, s)
+        ]
+        self._acrescentar_ao_arquivo(novas)
+        return len(novas)
+
+    def adicionar_varios(self, jogos):
+        return self.adicionar_mascaras([dezenas_para_mascara(jogo.dezenas) for jogo in jogos])
+
+    # ================================================
+    # Consulta (índice 0 = jogo mais recente, como na tela)
+    # ================================================
+
+    def jogo(self, indice):
+        return Jogo(mascara_para_dezenas(self.mascaras[len(self.mascaras) - 1 - indice]))
+
+    def linha(self, indice):
+        posicao = len(self.mascaras) - 1 - indice
+        faixa_gap, faixa_std = self.faixas[posicao]
+        dezenas = " ".join(map(str, mascara_para_dezenas(self.mascaras[posicao])))
+        return f"{dezenas} | Gap: {faixa_gap:.2f}, Std: {faixa_std:.2f}"
+
+    def mais_comuns(self):
+        """
+        Pares Gap+Std do mais para o menos frequente [((gap, std), n), ...];
+        nos empates, o par que saiu por último vem primeiro.
+        """
+        return sorted(
+            self.combinacoes.items(),
+            key=lambda item: (-item[1], -self._ultima_vez[item[0]])
+        )
+
+    # ================================================
+    # Persistência
+    # ================================================
+
+    def carregar(self, caminho):
+        """
+        Acrescenta os jogos de um arquivo (linhas inválidas e jogos com mais
+        de 15 dezenas são ignorados). Retorna quantos eram novos.
+        """
+        mascaras, _ = ler_bilhetes_arquivo(caminho)
+        arquivo, self.arquivo = self.arquivo, None  # não regrava o que acabou de ler
+        try:
+            return self.adicionar_mascaras(mascaras[popcount(mascaras) == 15])
+        finally:
+            self.arquivo = arquivo
+
+    def vincular_arquivo(self, caminho):
+        """
+        Passa a gravar o histórico em 'caminho' (regravado agora com todos os
+        jogos e depois acrescentado a cada jogo novo); None desvincula.
+        """
+        if caminho:
+            temporario = caminho + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as file:
+                file.writelines(_linha_arquivo(m) for m in self.mascaras)
+            os.replace(temporario, caminho)
+        self.arquivo = caminho
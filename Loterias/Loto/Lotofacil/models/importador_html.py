@@ -0,0 +1,232 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\importador_html.py
+# Nome do arquivo: importador_html.py
+
+import codecs
+import io
+import re
+import zipfile
+from datetime import datetime, timedelta
+from html.parser import HTMLParser
+from xml.etree.ElementTree import iterparse
+
+import requests
+
+from models.sincronizacao import Registro
+
+# Arquivo de resultados completos da Lotofácil (planilha XLSX; páginas HTML
+# salvas, ou um ZIP com o HTML dentro, também são aceitas)
+URL_RESULTADOS = "https://servicebus2.caixa.gov.br/portaldeloterias/api/resultados/download?modalidade=Lotof%C3%A1cil"
+
+TAMANHO_BLOCO = 64 * 1024
+PADRAO_DATA = re.compile(r'^\d{2}/\d{2}/\d{4}$')
+
+# Planilhas (XLSX): namespace do SpreadsheetML e dia zero das datas seriais
+NS_XLSX = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+EPOCA_EXCEL = datetime(1899, 12, 30)
+
+
+def registro_de_celulas(celulas):
+    """
+    Reconhece uma linha da tabela de resultados:
+    concurso, data (dd/mm/aaaa) e as 15 bolas na ordem do sorteio.
+    Retorna um Registro ou None se a linha não for um resultado.
+    """
+    if len(celulas) < 17 or not celulas[0].isdigit() or not PADRAO_DATA.match(celulas[1]):
+        return None
+    bolas = celulas[2:17]
+    if not all(b.isdigit() and 1 <= int(b) <= 25 for b in bolas):
+        return None
+    ordem = [f"{int(b):02d}" for b in bolas]
+    if len(set(ordem)) != 15:
+        return None
+    data = datetime.strptime(celulas[1], '%d/%m/%Y').strftime('%Y/%m/%d')
+    return Registro(int(celulas[0]), data, ordem, sorted(ordem))
+
+
+class ParserResultados(HTMLParser):
+    """
+    Parser incremental da tabela de resultados: recebe o HTML em pedaços
+    (feed) e entrega cada concurso assim que a sua linha (<tr>) termina.
+    Tabelas aninhadas (ex.: cidades ganhadoras) são tratadas por pilha.
+    """
+
+    def __init__(self, ao_registrar):
+        super().__init__(convert_charrefs=True)
+        self.ao_registrar = ao_registrar
+        self.linhas = []           # pilha de linhas abertas: cada uma é uma lista de células
+        self.celulas_abertas = []  # pilha de buffers de texto das células abertas
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self.linhas.append([])
+        elif tag in ('td', 'th') and self.linhas:
+            self.celulas_abertas.append([])
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th') and self.celulas_abertas:
+            texto = ' '.join(''.join(self.celulas_abertas.pop()).split())
+            if self.linhas:
+                self.linhas[-1].append(texto)
+        elif tag == 'tr' and self.linhas:
+            registro = registro_de_celulas(self.linhas.pop())
+            if registro is not None:
+                self.ao_registrar(registro)
+
+    def handle_data(self, data):
+        if self.celulas_abertas:
+            self.celulas_abertas[-1].append(data)
+
+
+def _coluna_xlsx(referencia):
+    # "C12" -> 2 (colunas a partir de 0)
+    coluna = 0
+    for c in referencia:
+        if not c.isalpha():
+            break
+        coluna = coluna * 26 + ord(c.upper()) - 64
+    return coluna - 1
+
+
+def _texto_celula(valor):
+    # Números da planilha vêm como "3" ou "3.0"; datas como número serial
+    try:
+        numero = float(valor)
+    except ValueError:
+        return valor.strip()
+    return str(int(numero)) if numero.is_integer() else valor
+
+
+def linhas_xlsx(arquivo_zip):
+    """
+    Produz o texto das células de cada linha da primeira planilha de um
+    XLSX (ZipFile aberto), lendo o XML em streaming. Células vazias viram "".
+    A coluna de data (a segunda), quando gravada como data serial do Excel,
+    é convertida para dd/mm/aaaa.
+    """
+    nomes = set(arquivo_zip.namelist())
+    compartilhados = []
+    if 'xl/sharedStrings.xml' in nomes:
+        with arquivo_zip.open('xl/sharedStrings.xml') as xml:
+            for _, elemento in iterparse(xml):
+                if elemento.tag == NS_XLSX + 'si':
+                    compartilhados.append(''.join(t.text or '' for t in elemento.iter(NS_XLSX + 't')))
+                    elemento.clear()
+    planilhas = sorted(n for n in nomes if n.startswith('xl/worksheets/sheet') and n.endswith('.xml'))
+    if not planilhas:
+        return
+    planilha = 'xl/worksheets/sheet1.xml' if 'xl/worksheets/sheet1.xml' in nomes else planilhas[0]
+
+    with arquivo_zip.open(planilha) as xml:
+        for _, elemento in iterparse(xml):
+            if elemento.tag != NS_XLSX + 'row':
+                continue
+            celulas = []
+            for celula in elemento.iter(NS_XLSX + 'c'):
+                tipo = celula.get('t')
+                if tipo == 'inlineStr':
+                    valor = ''.join(t.text or '' for t in celula.iter(NS_XLSX + 't'))
+                else:
+                    v = celula.find(NS_XLSX + 'v')
+                    valor = v.text if v is not None and v.text else ''
+                    if tipo == 's' and valor:
+                        valor = compartilhados[int(valor)]
+                    elif tipo == 'd' and valor:  # data ISO 8601
+                        valor = datetime.strptime(valor[:10], '%Y-%m-%d').strftime('%d/%m/%Y')
+                    elif tipo != 'str':
+                        valor = _texto_celula(valor)
+                coluna = _coluna_xlsx(celula.get('r', '')) if celula.get('r') else len(celulas)
+                celulas.extend([''] * (coluna + 1 - len(celulas)))
+                celulas[coluna] = valor.strip()
+            if len(celulas) > 1 and celulas[1].isdigit():
+                celulas[1] = (EPOCA_EXCEL + timedelta(days=int(celulas[1]))).strftime('%d/%m/%Y')
+            elemento.clear()
+            yield celulas
+
+
+def _blocos_de_resposta(origem):
+    """
+    Produz o conteúdo bruto (bytes) da origem em blocos: URL via HTTP em
+    streaming, ou caminho de um arquivo salvo localmente.
+    """
+    if origem.startswith(('http://', 'https://')):
+        with requests.get(origem, stream=True, timeout=30) as resposta:
+            resposta.raise_for_status()
+            yield from resposta.iter_content(TAMANHO_BLOCO)
+    else:
+        with open(origem, 'rb') as f:
+            while True:
+                bloco = f.read(TAMANHO_BLOCO)
+                if not bloco:
+                    break
+                yield bloco
+
+
+def importar(origem=URL_RESULTADOS, ao_registrar=None, copia=None):
+    """
+    Baixa (ou lê) os resultados e devolve a lista de Registros. A origem
+    pode ser a planilha XLSX da Caixa (o padrão), uma página HTML com a
+    tabela de resultados, interpretada em streaming, ou um ZIP com ela.
+
+    - ao_registrar(registro): chamado para cada concurso encontrado
+    - copia: caminho opcional para salvar o conteúdo bruto (HTML ou XLSX)
+    """
+    registros = []
+
+    def registrar(registro):
+        registros.append(registro)
+        if ao_registrar:
+            ao_registrar(registro)
+
+    parser = ParserResultados(registrar)
+    blocos = _blocos_de_resposta(origem)
+    primeiro = next(blocos, b'')
+
+    if primeiro.startswith(b'PK'):
+        # Arquivo compactado: planilha XLSX ou o HTML de resultados dentro do ZIP
+        conteudo = primeiro + b''.join(blocos)
+        if copia:
+            with open(copia, 'wb') as saida:
+                saida.write(conteudo)
+        with zipfile.ZipFile(io.BytesIO(conteudo)) as arquivo_zip:
+            if any(n.startswith('xl/worksheets/') for n in arquivo_zip.namelist()):
+                for celulas in linhas_xlsx(arquivo_zip):
+                    registro = registro_de_celulas(celulas)
+                    if registro is not None:
+                        registrar(registro)
+                return registros
+            nomes = [n for n in arquivo_zip.namelist() if n.lower().endswith(('.htm', '.html'))]
+            if not nomes:
+                raise ValueError("O arquivo baixado não contém uma planilha nem uma página HTML de resultados.")
+            with arquivo_zip.open(nomes[0]) as interno:
+                blocos = iter(lambda: interno.read(TAMANHO_BLOCO), b'')
+                primeiro = next(blocos, b'')
+                _alimentar(parser, primeiro, blocos, None)
+    else:
+        _alimentar(parser, primeiro, blocos, copia)
+
+    parser.close()
+    return registros
+
+
+def _alimentar(parser, primeiro, blocos, copia):
+    # Páginas antigas da Caixa vêm em latin-1; as atuais em utf-8
+    codificacao = 'utf-8'
+    m = re.search(rb'charset=["\']?([\w-]+)', primeiro[:4096], re.I)
+    if m:
+        try:
+            codificacao = codecs.lookup(m.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+    decodificador = codecs.getincrementaldecoder(codificacao)(errors='replace')
+    saida = open(copia, 'wb') if copia else None
+    try:
+        bloco = primeiro
+        while bloco:
+            if saida:
+                saida.write(bloco)
+            parser.feed(decodificador.decode(bloco))
+            bloco = next(blocos, b'')
+        parser.feed(decodificador.decode(b'', final=True))
+    finally:
+        if saida:
+            saida.close()
@@ -0,0 +1,99 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\indice_banco.py
+# Nome do arquivo: indice_banco.py
+
+import json
+import os
+
+from models.intervalos import Intervalos
+
+
+class IndiceBanco:
+    """
+    Índice auxiliar gravado ao lado do banco texto (JSON pequeno) com:
+      - total de concursos, maior concurso e se o arquivo está ordenado;
+      - faixas de concursos ausentes entre 1 e o maior concurso;
+      - tamanho e mtime do arquivo texto, para detectar edições externas.
+    """
+
+    def __init__(self, arquivo_texto, arquivo_indice=None):
+        self.arquivo_texto = arquivo_texto
+        self.arquivo_indice = arquivo_indice or os.path.splitext(arquivo_texto)[0] + '.idx'
+
+    def _assinatura_texto(self):
+        try:
+            st = os.stat(self.arquivo_texto)
+        except FileNotFoundError:
+            return [0, 0]
+        return [st.st_size, st.st_mtime_ns]
+
+    def _salvar(self, indice):
+        indice['assinatura'] = self._assinatura_texto()
+        temporario = self.arquivo_indice + '.tmp'
+        with open(temporario, 'w') as file:
+            json.dump(indice, file)
+        os.replace(temporario, self.arquivo_indice)
+        return indice
+
+    def carregar(self):
+        """
+        Retorna o índice, reconstruindo-o se estiver ausente ou desatualizado.
+        """
+        try:
+            with open(self.arquivo_indice, 'r') as file:
+                indice = json.load(file)
+            if indice.get('assinatura') == self._assinatura_texto():
+                return indice
+        except (FileNotFoundError, ValueError):
+            pass
+        return self.reconstruir()
+
+    def reconstruir(self):
+        """
+        Varre o arquivo texto uma única vez e regrava o índice.
+        """
+        concursos = []
+        try:
+            with open(self.arquivo_texto, 'r') as file:
+                for line in file:
+                    parts = line.strip().split(',')
+                    if len(parts) == 16:
+                        concursos.append(int(parts[0]))
+        except FileNotFoundError:
+            pass
+
+        ordenado = all(a < b for a, b in zip(concursos, concursos[1:]))
+        presentes = Intervalos.de_ordenados(concursos if ordenado else sorted(concursos))
+        ultimo = presentes.ultimo or 0
+        return self._salvar({
+            'total': len(presentes),
+            'ultimo': ultimo,
+            'ordenado': ordenado,
+            'ausentes': presentes.complemento(1, ultimo).para_lista(),
+        })
+
+    @staticmethod
+    def ausentes(indice, ate=None):
+        """
+        Concursos ausentes do índice como Intervalos, incluindo a faixa
+        depois do último concurso gravado até 'ate', se informado.
+        """
+        faltando = Intervalos(indice['ausentes'])
+        if ate is not None:
+            faltando = Intervalos(
+                (inicio, min(fim, ate)) for inicio, fim in faltando if inicio <= ate
+            ).uniao(Intervalos([(indice['ultimo'] + 1, ate)] if ate > indice['ultimo'] else []))
+        return faltando
+
+    def acrescentar(self, indice, novos_concursos):
+        """
+        Atualiza o índice carregado antes da gravação, após concursos maiores
+        que o último terem sido acrescentados ao final do arquivo texto,
+        sem reler o arquivo.
+        """
+        novos = Intervalos.de_ordenados(sorted(novos_concursos))
+        if novos:
+            lacunas = novos.complemento(indice['ultimo'] + 1, novos.ultimo)
+            indice['ausentes'].extend(lacunas.para_lista())
+            indice['total'] += len(novos)
+            indice['ultimo'] = novos.ultimo
+        return self._salvar(indice)
@@ -0,0 +1,124 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\intervalos.py
+# Nome do arquivo: intervalos.py
+
+from bisect import bisect_right
+from heapq import merge
+
+
+class Intervalos:
+    """
+    Conjunto de inteiros guardado como faixas fechadas [ini, fim] ordenadas,
+    disjuntas e não adjacentes (codificação por comprimento de sequência).
+
+    Uma sequência de concursos quase completa ocupa poucas faixas, então
+    lacunas, uniões e diferenças custam O(faixas), não O(concursos).
+    """
+
+    def __init__(self, faixas=()):
+        self.inicios = []
+        self.fins = []
+        for inicio, fim in faixas:
+            self._acrescentar(inicio, fim)
+
+    def _acrescentar(self, inicio, fim):
+        # As faixas precisam chegar em ordem crescente de início
+        if self.fins and inicio <= self.fins[-1] + 1:
+            if fim > self.fins[-1]:
+                self.fins[-1] = fim
+        else:
+            self.inicios.append(inicio)
+            self.fins.append(fim)
+
+    @classmethod
+    def de_ordenados(cls, numeros):
+        """
+        Constrói em uma passada a partir de números em ordem crescente
+        (repetições são toleradas).
+        """
+        intervalos = cls()
+        for numero in numeros:
+            intervalos._acrescentar(numero, numero)
+        return intervalos
+
+    def __iter__(self):
+        return zip(self.inicios, self.fins)
+
+    def __len__(self):
+        return sum(fim - inicio + 1 for inicio, fim in self)
+
+    def __bool__(self):
+        return bool(self.inicios)
+
+    def __contains__(self, numero):
+        i = bisect_right(self.inicios, numero) - 1
+        return i >= 0 and numero <= self.fins[i]
+
+    def __eq__(self, outro):
+        return isinstance(outro, Intervalos) and list(self) == list(outro)
+
+    def __repr__(self):
+        return f"Intervalos({self.para_lista()})"
+
+    def __str__(self):
+        return ", ".join(
+            str(inicio) if inicio == fim else f"{inicio}-{fim}" for inicio, fim in self
+        )
+
+    @property
+    def quantidade_faixas(self):
+        return len(self.inicios)
+
+    @property
+    def ultimo(self):
+        return self.fins[-1] if self.fins else None
+
+    def numeros(self):
+        """
+        Percorre os números em ordem, sem materializá-los.
+        """
+        for inicio, fim in self:
+            yield from range(inicio, fim + 1)
+
+    def para_lista(self):
+        return [[inicio, fim] for inicio, fim in self]
+
+    def complemento(self, inicio, fim):
+        """
+        Faixas de [inicio, fim] que NÃO estão no conjunto (ex.: concursos ausentes).
+        """
+        resultado = Intervalos()
+        esperado = inicio
+        for ini, f in self:
+            if f < esperado:
+                continue
+            if ini > fim:
+                break
+            if ini > esperado:
+                resultado._acrescentar(esperado, ini - 1)
+            esperado = f + 1
+        if esperado <= fim:
+            resultado._acrescentar(esperado, fim)
+        return resultado
+
+    def uniao(self, outro):
+        return Intervalos(merge(self, outro))
+
+    def diferenca(self, outro):
+        """
+        Números deste conjunto que não estão em 'outro'.
+        """
+        if not self:
+            return Intervalos()
+        lacunas = outro.complemento(self.inicios[0], self.fins[-1])
+        resultado = Intervalos()
+        i = j = 0
+        while i < len(self.inicios) and j < len(lacunas.inicios):
+            inicio = max(self.inicios[i], lacunas.inicios[j])
+            fim = min(self.fins[i], lacunas.fins[j])
+            if inicio <= fim:
+                resultado._acrescentar(inicio, fim)
+            if self.fins[i] < lacunas.fins[j]:
+                i += 1
+            else:
+                j += 1
+        return resultado
@@ -4,13 +4,25 @@
 import random
 import statistics
 
+from models.codec_jogo import dezenas_de_rank, rank_de_dezenas
+
 class Jogo:
-    def __init__(self, dezenas=None):
+    def __init__(self, dezenas=None, rank=None):
         if dezenas:
             self.dezenas = sorted(dezenas)
+        elif rank is not None:
+            self.dezenas = dezenas_de_rank(rank)
         else:
             self.dezenas = self.gerar_jogo()
 
+    @property
+    def rank(self):
+        """
+        Posição do jogo na ordem colexicográfica das C(25, 15) combinações
+        (ver models/codec_jogo.py).
+        """
+        return rank_de_dezenas(self.dezenas)
+
     def gerar_jogo(self):
         jogo = random.sample(range(1, 26), 15)
         jogo.sort()
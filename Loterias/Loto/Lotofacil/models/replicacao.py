@@ -0,0 +1,99 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\replicacao.py
+# Nome do arquivo: replicacao.py
+
+from models.carga_em_lote import DIALETOS, carregar_em_lote
+from models.intervalos import Intervalos
+
+COLUNAS = ('concurso', 'data_concurso', 'dezenas')
+
+
+def abrir_cursor_streaming(conn):
+    """
+    Abre um cursor que lê as linhas do servidor sob demanda (sem bufferizar
+    o resultado inteiro no cliente). Para conectores sem essa opção, como o
+    sqlite3, o cursor comum já é preguiçoso.
+    """
+    try:
+        return conn.cursor(buffered=False)
+    except TypeError:
+        return conn.cursor()
+
+
+def listar_intervalos(conn, tabela='loto', chave='concurso'):
+    """
+    Lê as chaves (concursos) existentes na tabela em ordem, já agrupadas em
+    Intervalos numa única passada pelo cursor, sem montar um conjunto.
+    """
+    cursor = abrir_cursor_streaming(conn)
+    try:
+        cursor.execute(f"SELECT {chave} FROM {tabela} ORDER BY {chave}")
+        return Intervalos.de_ordenados(linha[0] for linha in cursor)
+    finally:
+        cursor.close()
+
+
+def montar_consultas(faixas, tabela='loto', colunas=COLUNAS, chave='concurso',
+                     dialeto='mysql', max_in=500):
+    """
+    Gera (sql, parametros) que leem exatamente os concursos das faixas:
+    faixas longas viram BETWEEN, concursos isolados são agrupados em IN (...).
+    """
+    marcador = DIALETOS[dialeto]['marcador']
+    selecao = f"SELECT {', '.join(colunas)} FROM {tabela}"
+    isolados = []
+    for inicio, fim in faixas:
+        if fim - inicio >= 2:
+            yield (
+                f"{selecao} WHERE {chave} BETWEEN {marcador} AND {marcador} ORDER BY {chave}",
+                (inicio, fim)
+            )
+        else:
+            isolados.extend(range(inicio, fim + 1))
+    for i in range(0, len(isolados), max_in):
+        bloco = isolados[i:i + max_in]
+        yield (
+            f"{selecao} WHERE {chave} IN ({', '.join([marcador] * len(bloco))}) ORDER BY {chave}",
+            tuple(bloco)
+        )
+
+
+def _ler_linhas(conn, consultas, tamanho_lote):
+    cursor = abrir_cursor_streaming(conn)
+    try:
+        for sql, parametros in consultas:
+            cursor.execute(sql, parametros)
+            while True:
+                linhas = cursor.fetchmany(tamanho_lote)
+                if not linhas:
+                    break
+                yield from linhas
+    finally:
+        cursor.close()
+
+
+def replicar(origem, destino, tabela='loto', colunas=COLUNAS, chave='concurso',
+             dialeto_origem='mysql', dialeto_destino='mysql', tamanho_lote=500,
+             progresso=None):
+    """
+    Copia para 'destino' as linhas de 'origem' cujas chaves ainda não existem lá.
+
+    1. As chaves das duas tabelas são lidas em ordem como Intervalos e a
+       diferença é feita faixa a faixa;
+    2. As faixas ausentes são lidas com poucas consultas BETWEEN/IN por um
+       cursor em streaming;
+    3. As linhas lidas são gravadas em lotes multi-linha numa única transação.
+
+    Retorna (ausentes como Intervalos, ResultadoCarga).
+    """
+    ausentes = listar_intervalos(origem, tabela, chave).diferenca(listar_intervalos(destino, tabela, chave))
+    if not ausentes:
+        return ausentes, None
+
+    consultas = montar_consultas(ausentes, tabela, colunas, chave, dialeto_origem)
+    resultado = carregar_em_lote(
+        destino,
+        _ler_linhas(origem, consultas, tamanho_lote),
+        tabela=tabela, colunas=colunas, chave=chave,
+        dialeto=dialeto_destino, tamanho_lote=tamanho_lote, progresso=progresso
+    )
+    return ausentes, resultado
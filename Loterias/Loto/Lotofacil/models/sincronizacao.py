@@ -0,0 +1,427 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\sincronizacao.py
+# Nome do arquivo: sincronizacao.py
+
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from datetime import datetime
+
+from tqdm import tqdm
+
+from models.buscador_concursos import BuscadorConcursos
+from models.cache_respostas import CacheRespostas
+from models.carga_em_lote import carregar_em_lote
+from models.intervalos import Intervalos
+from models.replicacao import listar_intervalos
+
+# numero: int | data: 'aaaa/mm/dd' | dezenas_sorteio: ordem do sorteio | dezenas: em ordem crescente
+Registro = namedtuple('Registro', 'numero data dezenas_sorteio dezenas')
+
+
+def registro_de_json(data):
+    """
+    Converte a resposta da API em um Registro, ou None se estiver incompleta.
+    """
+    dezenas = data.get("listaDezenas") or []
+    ordem = data.get("dezenasSorteadasOrdemSorteio") or dezenas
+    if len(dezenas) != 15 or len(ordem) != 15:
+        return None
+    data_sorteio = datetime.strptime(data["dataApuracao"], '%d/%m/%Y').strftime('%Y/%m/%d')
+    return Registro(int(data["numero"]), data_sorteio, list(ordem), sorted(dezenas))
+
+
+class Destino(ABC):
+    """
+    Onde os concursos são gravados. Cada destino informa o que lhe falta
+    (como Intervalos) e recebe apenas esses concursos, em lotes, à medida
+    que chegam. Subclasses implementam gravar().
+    """
+    nome = "destino"
+
+    def existentes(self):
+        return Intervalos()
+
+    def ausentes(self, ultimo):
+        return self.existentes().complemento(1, ultimo)
+
+    @abstractmethod
+    def gravar(self, registros):
+        """
+        Recebe um lote de Registros que faltam neste destino.
+        """
+
+    def fechar(self):
+        """
+        Conclui a gravação. Pode retornar uma mensagem de resumo.
+        """
+        return None
+
+    def abortar(self):
+        """
+        Descarta o que foi recebido e ainda não foi concluído (sincronização
+        interrompida por erro).
+        """
+
+
+class DestinoTexto(Destino):
+    """
+    Banco texto do simulador (banco_de_dados.txt), via BancoDeDados: as lacunas
+    vêm do índice auxiliar e cada lote é gravado assim que chega, por
+    acréscimo ou compactação, enquanto a busca continua.
+    """
+    nome = "banco texto"
+
+    def __init__(self, banco):
+        self.banco = banco
+        self.gravados = 0
+        self._indice = None
+
+    def ausentes(self, ultimo):
+        return self.banco.indice.ausentes(self.banco.indice.carregar(), ate=ultimo)
+
+    def gravar(self, registros):
+        self._indice = self.banco.gravar_concursos([(r.numero, r.dezenas_sorteio) for r in registros])
+        self.gravados += len(registros)
+
+    def fechar(self):
+        indice = self._indice
+        if indice is None:
+            # Nada novo: ainda assim reordena um arquivo editado fora de ordem
+            indice = self.banco.gravar_concursos([])
+        mensagem = f"{self.nome}: {self.gravados} concursos gravados, total {indice['total']}"
+        self.gravados = 0
+        self._indice = None
+        return mensagem
+
+    def abortar(self):
+        # Os lotes já gravados ficam no banco; a próxima sincronização busca o resto
+        self.gravados = 0
+        self._indice = None
+
+
+class DestinoDumpSQL(Destino):
+    """
+    Arquivo .sql gravado em streaming: cada lote recebido vira INSERTs
+    multi-linha (até 'linhas_por_insert' concursos cada), mantendo a memória
+    constante e cada comando abaixo do max_allowed_packet. Com
+    linhas_por_insert=1 gera um INSERT por concurso. O arquivo é sincronizado
+    em disco (fsync) uma vez por lote recebido e ao fechar, não por comando.
+
+    Uma execução interrompida é retomada: os concursos já presentes em
+    comandos completos são reaproveitados e um comando final incompleto é
+    descartado.
+    """
+    nome = "dump SQL"
+    PADRAO_CONCURSO = re.compile(rb"\('[^']*', (\d+), '")
+
+    def __init__(self, caminho='loto.sql', tabela='loto', colunas=('data_concurso', 'concurso', 'dezenas'),
+                 separador=',', linhas_por_insert=500):
+        self.caminho = caminho
+        self.tabela = tabela
+        self.colunas = colunas
+        self.separador = separador
+        self.linhas_por_insert = linhas_por_insert
+        self.pendentes = []
+        self.gravados = 0
+        self._arquivo = None
+        self._existentes = None
+
+    def existentes(self):
+        """
+        Concursos já gravados em comandos completos. Na primeira chamada
+        também corta do arquivo um comando final interrompido.
+        """
+        if self._existentes is None:
+            encontrados = set()
+            completos = set()
+            fim_valido = 0
+            try:
+                with open(self.caminho, 'rb') as f:
+                    posicao = 0
+                    for linha in f:
+                        posicao += len(linha)
+                        m = self.PADRAO_CONCURSO.search(linha)
+                        if m:
+                            completos.add(int(m.group(1)))
+                        if linha.rstrip().endswith(b';'):
+                            encontrados |= completos
+                            completos = set()
+                            fim_valido = posicao
+                    tamanho = posicao
+            except FileNotFoundError:
+                tamanho = 0
+            if fim_valido < tamanho:
+                with open(self.caminho, 'r+b') as f:
+                    f.truncate(fim_valido)
+            self._existentes = Intervalos.de_ordenados(sorted(encontrados))
+        return self._existentes
+
+    def _valores(self, r):
+        return f"('{r.data}', {r.numero}, '{self.separador.join(r.dezenas)}')"
+
+    def _escrever(self, bloco):
+        if self._arquivo is None:
+            self.existentes()
+            self._arquivo = open(self.caminho, 'a')
+        bloco = sorted(bloco, key=lambda r: r.numero, reverse=True)
+        cabecalho = f"INSERT INTO {self.tabela} ({', '.join(self.colunas)}) VALUES"
+        if len(bloco) == 1:
+            self._arquivo.write(f"{cabecalho} {self._valores(bloco[0])};\n")
+        else:
+            self._arquivo.write(cabecalho + "\n" + ',\n'.join(self._valores(r) for r in bloco) + ";\n")
+        self.gravados += len(bloco)
+
+    def _sincronizar(self):
+        if self._arquivo is not None:
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+
+    def gravar(self, registros):
+        self.pendentes.extend(registros)
+        escritos = 0
+        while len(self.pendentes) >= self.linhas_por_insert:
+            self._escrever(self.pendentes[:self.linhas_por_insert])
+            del self.pendentes[:self.linhas_por_insert]
+            escritos += 1
+        if escritos:
+            self._sincronizar()
+
+    def fechar(self):
+        if self.pendentes:
+            self._escrever(self.pendentes)
+            self.pendentes = []
+        if self._arquivo is not None:
+            self._sincronizar()
+            self._arquivo.close()
+            self._arquivo = None
+        mensagem = f"{self.nome}: {self.gravados} concursos gravados em {self.caminho}"
+        self.gravados = 0
+        self._existentes = None
+        return mensagem
+
+    def abortar(self):
+        # Os comandos já gravados ficam (a próxima execução retoma deles)
+        self.pendentes = []
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+        self.gravados = 0
+        self._existentes = None
+
+
+class DestinoBanco(Destino):
+    """
+    Tabela em um banco SQL (MySQL ou SQLite), gravada em lotes com upsert.
+    Todos os lotes de uma sincronização ficam em uma única transação,
+    confirmada em fechar() (ou desfeita em abortar()).
+    """
+
+    def __init__(self, conn, dialeto, tabela='loto', colunas=('data_concurso', 'concurso', 'dezenas'),
+                 tamanho_lote=500):
+        self.conn = conn
+        self.dialeto = dialeto
+        self.tabela = tabela
+        self.colunas = colunas
+        self.tamanho_lote = tamanho_lote
+        self.linhas = 0
+        self.segundos = 0.0
+
+    def existentes(self):
+        return listar_intervalos(self.conn, self.tabela, 'concurso')
+
+    def gravar(self, registros):
+        resultado = carregar_em_lote(
+            self.conn,
+            ((r.data, r.numero, ','.join(r.dezenas)) for r in registros),
+            tabela=self.tabela, colunas=self.colunas, chave='concurso',
+            dialeto=self.dialeto, tamanho_lote=self.tamanho_lote, commit=False
+        )
+        self.linhas += resultado.linhas
+        self.segundos += resultado.segundos
+
+    def fechar(self):
+        inicio = time.perf_counter()
+        try:
+            self.conn.commit()
+        except Exception:
+            self.abortar()
+            raise
+        self.segundos += time.perf_counter() - inicio
+        vazao = self.linhas / self.segundos if self.segundos else 0
+        mensagem = f"{self.nome}: {self.linhas} linhas gravadas em {self.segundos:.2f}s ({vazao:.0f} linhas/s)"
+        self.linhas, self.segundos = 0, 0.0
+        return mensagem
+
+    def abortar(self):
+        self.conn.rollback()
+        self.linhas, self.segundos = 0, 0.0
+
+
+class DestinoMySQL(DestinoBanco):
+    nome = "MySQL"
+
+    def __init__(self, conn, **kwargs):
+        super().__init__(conn, 'mysql', **kwargs)
+
+
+class DestinoSQLite(DestinoBanco):
+    nome = "SQLite"
+
+    def __init__(self, caminho, **kwargs):
+        conn = sqlite3.connect(caminho, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS loto ("
+            " data_concurso TEXT, concurso INTEGER PRIMARY KEY, dezenas TEXT)"
+        )
+        conn.commit()
+        super().__init__(conn, 'sqlite', **kwargs)
+
+
+def sincronizar(destinos, buscador=None, offline=False, tamanho_lote=200,
+                status_callback=None, progresso_callback=None):
+    """
+    Pipeline único de sincronização dos concursos da Lotofácil:
+      1. descobre o último concurso (API, ou cache se offline);
+      2. calcula o que falta em cada destino;
+      3. busca a união dos concursos faltantes (cache + rede, assíncrono);
+      4. em paralelo à busca, uma thread grava os lotes em cada destino.
+
+    Retorna {'ultimo', 'ausentes' (Intervalos), 'falhas'} ou None se o último concurso
+    não puder ser obtido.
+
+    'offline' vale só para esta sincronização: o modo do buscador (que pode
+    ser compartilhado, como o do BancoDeDados) é restaurado ao final.
+    """
+    if buscador is None:
+        buscador = BuscadorConcursos(cache=CacheRespostas())
+    anterior = buscador.offline
+    buscador.offline = offline
+    try:
+        return _sincronizar(destinos, buscador, offline, tamanho_lote, status_callback, progresso_callback)
+    finally:
+        buscador.offline = anterior
+
+
+def _sincronizar(destinos, buscador, offline, tamanho_lote, status_callback, progresso_callback):
+    status = status_callback or (lambda msg: None)
+
+    # 1. Último concurso
+    if offline:
+        ultimo = buscador.cache.ultimo_numero() if buscador.cache is not None else None
+        data_ultimo = None
+    else:
+        dados_ultimo = buscador.buscar_um("")
+        ultimo = int(dados_ultimo["numero"]) if dados_ultimo else None
+        data_ultimo = dados_ultimo.get("dataApuracao") if dados_ultimo else None
+    if not ultimo:
+        status("Erro ao buscar o último concurso. Verifique sua conexão ou a API.")
+        return None
+    status(f"Último concurso: {ultimo}" + (f" ({data_ultimo})" if data_ultimo else ""))
+
+    # 2. Lacunas por destino
+    faltantes = [destino.ausentes(ultimo) for destino in destinos]
+    uniao = Intervalos()
+    for faltam in faltantes:
+        uniao = uniao.uniao(faltam)
+    total = len(uniao)
+    if uniao:
+        status(f"Concursos ausentes identificados: {total} em {uniao.quantidade_faixas} faixa(s)")
+        for destino, faltam in zip(destinos, faltantes):
+            status(f"  - {destino.nome}: {len(faltam)} ({faltam})")
+    else:
+        status("Nenhum concurso ausente.")
+
+    # 4. Estágio de gravação (thread própria, consome a fila enquanto a busca avança)
+    fila = queue.Queue()
+    erros = []
+
+    def despachar(lote):
+        for destino, faltam in zip(destinos, faltantes):
+            registros = [r for r in lote if r.numero in faltam]
+            if registros:
+                destino.gravar(registros)
+
+    def escritor():
+        lote = []
+        try:
+            while True:
+                registro = fila.get()
+                if registro is None:
+                    break
+                lote.append(registro)
+                if len(lote) >= tamanho_lote:
+                    despachar(lote)
+                    lote = []
+            despachar(lote)
+        except Exception as e:
+            erros.append(e)
+            # Continua esvaziando a fila para não travar a busca
+            while fila.get() is not None:
+                pass
+
+    thread_escritor = threading.Thread(target=escritor, daemon=True)
+    thread_escritor.start()
+
+    # 3. Estágio de busca
+    falhas = []
+    barra = tqdm(total=total, desc="Baixando concursos")
+
+    def ao_receber(numero, data):
+        barra.update(1)
+        if data is None:
+            falhas.append(numero)
+            status(f"Concurso {numero} não pôde ser baixado. Pulando.")
+            return
+        registro = registro_de_json(data)
+        if registro is None:
+            falhas.append(numero)
+            status(f"Concurso {numero} com dados inválidos. Pulando.")
+            return
+        fila.put(registro)
+        if progresso_callback:
+            progresso_callback(barra.n / total * 100, numero)
+
+    try:
+        try:
+            if uniao:
+                buscador.buscar_varios_sync(uniao.numeros(), ao_receber)
+                status(buscador.resumo())
+        finally:
+            barra.close()
+            fila.put(None)
+            thread_escritor.join()
+        if erros:
+            raise erros[0]
+    except BaseException:
+        # Nada fica pela metade: transações abertas são desfeitas
+        for destino in destinos:
+            destino.abortar()
+        raise
+
+    for destino in destinos:
+        mensagem = destino.fechar()
+        if mensagem:
+            status(mensagem)
+
+    return {'ultimo': ultimo, 'ausentes': uniao, 'falhas': sorted(falhas)}
+
+
+def gravar_registros(destinos, registros, status_callback=None):
+    """
+    Grava registros já obtidos por outra via (ex.: importação do HTML de
+    resultados) nos destinos, entregando a cada um apenas o que lhe falta.
+    """
+    status = status_callback or (lambda msg: None)
+    registros = sorted(registros, key=lambda r: r.numero)
+    ultimo = registros[-1].numero if registros else 0
+    for destino in destinos:
+        faltam = destino.ausentes(ultimo)
+        destino.gravar([r for r in registros if r.numero in faltam])
+        mensagem = destino.fechar()
+        if mensagem:
+            status(mensagem)
@@ -0,0 +1,131 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\snapshot_estatisticas.py
+# Nome do arquivo: snapshot_estatisticas.py
+
+import os
+
+import numpy as np
+
+from models.armazem_mascaras import dezenas_para_mascara
+from models.estatisticas import matriz_de_mascaras
+
+# Janelas móveis: estatísticas dos últimos N concursos gravados
+JANELAS = (10, 50, 100)
+
+
+def _bits(mascara):
+    return np.array([i for i in range(25) if mascara >> i & 1], dtype=np.intp)
+
+
+class SnapshotEstatisticas:
+    """
+    Estatísticas acumuladas do banco, gravadas em disco (.est, formato npz)
+    ao lado do banco texto:
+      - frequencias: quantas vezes cada dezena saiu (vetor 25);
+      - pares: quantas vezes cada par de dezenas saiu junto (matriz 25 x 25,
+        a diagonal repete as frequências);
+      - ultimo_visto: último concurso em que cada dezena saiu (0 = nunca);
+      - as mesmas frequências e pares para as JANELAS dos últimos concursos.
+
+    Cada concurso novo atualiza o snapshot em tempo constante, sem reler o
+    histórico; tamanho e mtime do arquivo texto detectam edições externas,
+    que levam à reconstrução a partir do armazém de máscaras.
+    """
+
+    def __init__(self, arquivo_texto, armazem, arquivo_snapshot=None):
+        self.arquivo_texto = arquivo_texto
+        self.armazem = armazem
+        self.arquivo_snapshot = arquivo_snapshot or os.path.splitext(arquivo_texto)[0] + '.est'
+
+    def _assinatura_texto(self):
+        try:
+            st = os.stat(self.arquivo_texto)
+        except FileNotFoundError:
+            return [0, 0]
+        return [st.st_size, st.st_mtime_ns]
+
+    def _salvar(self, snapshot):
+        snapshot['assinatura'] = np.array(self._assinatura_texto(), dtype=np.int64)
+        temporario = self.arquivo_snapshot + '.tmp'
+        with open(temporario, 'wb') as file:
+            np.savez(file, **snapshot)
+        os.replace(temporario, self.arquivo_snapshot)
+        return snapshot
+
+    def carregar(self):
+        """
+        Retorna o snapshot (dicionário de arrays), reconstruindo-o se estiver
+        ausente ou desatualizado.
+        """
+        try:
+            with np.load(self.arquivo_snapshot, allow_pickle=False) as dados:
+                snapshot = {chave: dados[chave] for chave in dados.files}
+            if (list(snapshot['assinatura']) == self._assinatura_texto()
+                    and tuple(snapshot['janelas']) == JANELAS):
+                return snapshot
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            pass
+        return self.reconstruir()
+
+    def reconstruir(self):
+        """
+        Recalcula tudo a partir do armazém de máscaras (vetorizado).
+        """
+        mascaras = np.array(self.armazem.mascaras(), dtype=np.uint32)
+        concursos = np.flatnonzero(mascaras) + 1
+        matriz = matriz_de_mascaras(mascaras[concursos - 1]).astype(np.int64)
+
+        ultimo_visto = np.zeros(25, dtype=np.int64)
+        if len(concursos):
+            # Última linha em que cada coluna tem 1 (0 se nunca)
+            ultima_linha = len(matriz) - 1 - np.argmax(matriz[::-1], axis=0)
+            ultimo_visto = np.where(matriz.any(axis=0), concursos[ultima_linha], 0)
+
+        recentes = max(JANELAS)
+        snapshot = {
+            'janelas': np.array(JANELAS, dtype=np.int64),
+            'total': np.int64(len(concursos)),
+            'ultimo': np.int64(concursos[-1] if len(concursos) else 0),
+            'frequencias': matriz.sum(axis=0),
+            'pares': matriz.T @ matriz,
+            'ultimo_visto': ultimo_visto.astype(np.int64),
+            'recentes_concursos': concursos[-recentes:].astype(np.int64),
+            'recentes_mascaras': mascaras[concursos[-recentes:] - 1],
+        }
+        self._atualizar_janelas(snapshot)
+        return self._salvar(snapshot)
+
+    @staticmethod
+    def _atualizar_janelas(snapshot):
+        # No máximo max(JANELAS) máscaras: custo constante por concurso
+        matriz = matriz_de_mascaras(snapshot['recentes_mascaras']).astype(np.int64)
+        snapshot['janela_frequencias'] = np.stack([matriz[-n:].sum(axis=0) for n in JANELAS])
+        snapshot['janela_pares'] = np.stack([matriz[-n:].T @ matriz[-n:] for n in JANELAS])
+
+    def acrescentar(self, snapshot, jogos):
+        """
+        Atualiza o snapshot carregado antes da gravação com concursos que
+        acabaram de entrar no banco [(numero, dezenas), ...] e o regrava.
+        Concursos antigos (lacunas preenchidas) também são aceitos.
+        """
+        recentes_concursos = list(snapshot['recentes_concursos'])
+        recentes_mascaras = list(snapshot['recentes_mascaras'])
+        limite = max(JANELAS)
+        for numero, dezenas in jogos:
+            mascara = dezenas_para_mascara(dezenas)
+            bits = _bits(mascara)
+            snapshot['frequencias'][bits] += 1
+            snapshot['pares'][np.ix_(bits, bits)] += 1
+            snapshot['ultimo_visto'][bits] = np.maximum(snapshot['ultimo_visto'][bits], numero)
+            snapshot['total'] = np.int64(snapshot['total'] + 1)
+            snapshot['ultimo'] = np.int64(max(int(snapshot['ultimo']), numero))
+
+            if len(recentes_concursos) < limite or numero > recentes_concursos[0]:
+                posicao = int(np.searchsorted(recentes_concursos, numero))
+                recentes_concursos.insert(posicao, numero)
+                recentes_mascaras.insert(posicao, mascara)
+                del recentes_concursos[:-limite], recentes_mascaras[:-limite]
+
+        snapshot['recentes_concursos'] = np.array(recentes_concursos, dtype=np.int64)
+        snapshot['recentes_mascaras'] = np.array(recentes_mascaras, dtype=np.uint32)
+        self._atualizar_janelas(snapshot)
+        return self._salvar(snapshot)
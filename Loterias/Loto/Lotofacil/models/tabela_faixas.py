@@ -0,0 +1,128 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\tabela_faixas.py
+# Nome do arquivo: tabela_faixas.py
+
+import os
+import random
+
+import numpy as np
+
+from models.codec_jogo import TOTAL_COMBINACOES, popcount
+from models.estatisticas import faixas_da_matriz, matriz_de_mascaras
+
+CAMINHO_PADRAO = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'faixas_combinacoes.bin'
+)
+
+# Máscaras de 25 bits percorridas por bloco ao construir a tabela
+BLOCO_MASCARAS = 1 << 21
+
+# Tolerâncias aceitas em torno do Gap e do Std Dev desejados
+TOLERANCIA_GAP = 0.1
+TOLERANCIA_STD = 0.3
+
+
+def faixas_aceitas(desejado_gap=None, desejado_std=None):
+    """
+    Faixas (1 a 5) de Gap e de Std Dev dentro da tolerância dos valores
+    desejados (None = qualquer faixa). Retorna (faixas_gap, faixas_std).
+    """
+    faixas = range(1, 6)
+    return (
+        [f for f in faixas if desejado_gap is None or abs(f - desejado_gap) <= TOLERANCIA_GAP],
+        [f for f in faixas if desejado_std is None or abs(f - desejado_std) <= TOLERANCIA_STD],
+    )
+
+
+def _mascaras_em_ordem():
+    """
+    Gera, em blocos, as máscaras de 25 bits com 15 bits ligados em ordem
+    numérica crescente, que é exatamente a ordem colexicográfica (rank).
+    """
+    for inicio in range(0, 1 << 25, BLOCO_MASCARAS):
+        valores = np.arange(inicio, inicio + BLOCO_MASCARAS, dtype=np.uint32)
+        yield valores[popcount(valores) == 15]
+
+
+class TabelaFaixas:
+    """
+    Tabela em disco com 1 byte por combinação (indexada pelo rank colex):
+    faixa_gap * 8 + faixa_std, as mesmas faixas 1 a 5 de Jogo.
+
+    É construída uma única vez (na primeira consulta) e depois apenas
+    mapeada em memória. Na primeira consulta os ranks são agrupados por par
+    de faixas e mantidos em memória; o sorteio dentro do subconjunto pedido
+    é uniforme e O(1) por jogo.
+    """
+
+    def __init__(self, arquivo=CAMINHO_PADRAO):
+        self.arquivo = arquivo
+        self._tabela = None
+        self._ranks = {}
+
+    def construir(self):
+        temporario = self.arquivo + '.tmp'
+        with open(temporario, 'wb') as f:
+            for mascaras in _mascaras_em_ordem():
+                faixas_gap, faixas_std = faixas_da_matriz(matriz_de_mascaras(mascaras))
+                (faixas_gap * 8 + faixas_std).astype(np.uint8).tofile(f)
+        os.replace(temporario, self.arquivo)
+
+    def carregar(self):
+        if self._tabela is None:
+            try:
+                tamanho = os.path.getsize(self.arquivo)
+            except FileNotFoundError:
+                tamanho = None
+            if tamanho != TOTAL_COMBINACOES:
+                self.construir()
+            self._tabela = np.memmap(self.arquivo, dtype=np.uint8, mode='r')
+        return self._tabela
+
+    def ranks(self, faixa_gap, faixa_std):
+        """
+        Ranks (em ordem crescente) das combinações com essas faixas.
+        """
+        if not self._ranks:
+            # Uma ordenação estável agrupa todos os ranks por código de uma vez
+            tabela = self.carregar()
+            ordem = np.argsort(tabela, kind='stable').astype(np.uint32)
+            limites = np.cumsum(np.bincount(tabela, minlength=64))
+            for codigo in range(64):
+                inicio = limites[codigo - 1] if codigo else 0
+                self._ranks[divmod(codigo, 8)] = ordem[inicio:limites[codigo]]
+        return self._ranks.get((faixa_gap, faixa_std), np.empty(0, dtype=np.uint32))
+
+    def sortear(self, faixas_gap=range(1, 6), faixas_std=range(1, 6)):
+        """
+        Sorteia uniformemente uma combinação cujas faixas estejam entre as
+        aceitas. Retorna o seu rank, ou None se não houver nenhuma.
+        """
+        grupos = [self.ranks(g, s) for g in faixas_gap for s in faixas_std]
+        total = sum(len(grupo) for grupo in grupos)
+        if total == 0:
+            return None
+        posicao = random.randrange(total)
+        for grupo in grupos:
+            if posicao < len(grupo):
+                return int(grupo[posicao])
+            posicao -= len(grupo)
+
+    def sortear_varios(self, quantidade, faixas_gap=range(1, 6), faixas_std=range(1, 6), rng=None):
+        """
+        Versão em lote de sortear: 'quantidade' ranks uniformes (com
+        reposição) entre as combinações aceitas, como vetor uint32.
+        """
+        rng = rng or np.random.default_rng()
+        grupos = [self.ranks(g, s) for g in faixas_gap for s in faixas_std]
+        limites = np.cumsum([len(grupo) for grupo in grupos])
+        if not len(limites) or limites[-1] == 0:
+            return np.empty(0, dtype=np.uint32)
+        posicoes = rng.integers(0, limites[-1], size=quantidade)
+        qual = np.searchsorted(limites, posicoes, side='right')
+        ranks = np.empty(quantidade, dtype=np.uint32)
+        for i, grupo in enumerate(grupos):
+            selecionados = qual == i
+            if selecionados.any():
+                inicio = limites[i] - len(grupo)
+                ranks[selecionados] = grupo[posicoes[selecionados] - inicio]
+        return ranks
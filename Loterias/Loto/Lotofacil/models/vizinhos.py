@@ -0,0 +1,46 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\models\vizinhos.py
+# Nome do arquivo: vizinhos.py
+
+import numpy as np
+
+from models.armazem_mascaras import dezenas_para_mascara
+from models.codec_jogo import popcount
+
+
+class ResultadoVizinhos:
+    """
+    Concursos que têm pelo menos 'minimo' dezenas em comum com um jogo,
+    do maior para o menor número de acertos (empates: concurso mais recente
+    primeiro), e a distribuição de acertos em todo o histórico.
+    """
+
+    def __init__(self, minimo, concursos, acertos, distribuicao):
+        self.minimo = minimo
+        self.concursos = concursos
+        self.acertos = acertos
+        self.distribuicao = distribuicao  # distribuicao[k] = concursos com k acertos (0 a 15)
+
+    def __len__(self):
+        return len(self.concursos)
+
+    def __iter__(self):
+        return zip(self.concursos.tolist(), self.acertos.tolist())
+
+
+def buscar_vizinhos(mascaras, dezenas, minimo=11):
+    """
+    Compara o jogo com todos os concursos de uma vez (popcount de
+    jogo & sorteio sobre o armazém de máscaras, indexado por concurso - 1).
+
+    - dezenas: lista de dezenas ou máscara de 25 bits já pronta
+    """
+    mascara = dezenas if isinstance(dezenas, (int, np.integer)) else dezenas_para_mascara(dezenas)
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    concursos = np.flatnonzero(mascaras)
+    acertos = popcount(mascaras[concursos] & np.uint32(mascara))
+
+    distribuicao = np.bincount(acertos, minlength=16)
+    selecionados = np.flatnonzero(acertos >= minimo)
+    ordem = np.lexsort((-concursos[selecionados], -acertos[selecionados].astype(np.int16)))
+    selecionados = selecionados[ordem]
+    return ResultadoVizinhos(minimo, concursos[selecionados] + 1, acertos[selecionados], distribuicao)
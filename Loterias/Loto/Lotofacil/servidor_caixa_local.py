@@ -0,0 +1,99 @@
+# servidor_caixa_local.py
+# Servidor HTTP local que imita a API da Caixa (/portaldeloterias/api/lotofacil/{n})
+# a partir do banco_de_dados.txt, para testar os buscadores sem acessar a internet.
+#
+# Uso:
+#   python servidor_caixa_local.py [--porta 8089] [--taxa-erro 0.1] [--latencia 0.05]
+# e depois:
+#   BancoDeDados(url_base="http://127.0.0.1:8089/portaldeloterias/api/lotofacil/")
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIXO = "/portaldeloterias/api/lotofacil/"
+
+
+def carregar_concursos(arquivo):
+    concursos = {}
+    with open(arquivo, "r") as file:
+        for line in file:
+            parts = line.strip().split(",")
+            if len(parts) == 16:
+                concursos[int(parts[0])] = parts[1:]
+    return concursos
+
+
+def montar_resposta(numero, dezenas):
+    # A data é fictícia (sorteios semanais a partir do concurso 1), só para manter o formato.
+    data = date(2003, 9, 29) + timedelta(days=7 * (numero - 1))
+    return {
+        "numero": numero,
+        "dataApuracao": data.strftime("%d/%m/%Y"),
+        "listaDezenas": sorted(dezenas),
+        "dezenasSorteadasOrdemSorteio": dezenas,
+    }
+
+
+def criar_servidor(concursos, porta=8089, taxa_erro=0.0, latencia=0.0):
+    ultimo = max(concursos) if concursos else 0
+
+    class Manipulador(BaseHTTPRequestHandler):
+        # HTTP/1.1 mantém a conexão aberta (keep-alive) entre requisições
+        protocol_version = "HTTP/1.1"
+
+        def _responder(self, status, corpo=b"", cabecalhos=None):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            for chave, valor in (cabecalhos or {}).items():
+                self.send_header(chave, valor)
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def do_GET(self):
+            if latencia:
+                time.sleep(random.uniform(0, 2 * latencia))
+            if not self.path.startswith(PREFIXO):
+                self._responder(404)
+                return
+            if taxa_erro and random.random() < taxa_erro:
+                if random.random() < 0.5:
+                    self._responder(429, cabecalhos={"Retry-After": "0.1"})
+                else:
+                    self._responder(503)
+                return
+
+            parametro = self.path[len(PREFIXO):].strip("/")
+            numero = int(parametro) if parametro.isdigit() else ultimo
+            if numero not in concursos:
+                self._responder(404)
+                return
+            corpo = json.dumps(montar_resposta(numero, concursos[numero])).encode("utf-8")
+            self._responder(200, corpo)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", porta), Manipulador)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API local da Lotofácil para testes")
+    parser.add_argument("--arquivo", default="banco_de_dados.txt")
+    parser.add_argument("--porta", type=int, default=8089)
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="fração de respostas 429/503")
+    parser.add_argument("--latencia", type=float, default=0.0, help="latência média em segundos")
+    args = parser.parse_args()
+
+    servidor = criar_servidor(
+        carregar_concursos(args.arquivo), args.porta, args.taxa_erro, args.latencia
+    )
+    print(f"Servindo em http://127.0.0.1:{args.porta}{PREFIXO}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.server_close()
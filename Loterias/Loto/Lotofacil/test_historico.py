@@ -0,0 +1,50 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\test_historico.py
+# Nome do arquivo: test_historico.py
+
+"""
+Testes do histórico de jogos gerados (models/historico.py).
+
+Uso (na pasta Lotofacil): python -m unittest test_historico  (ou pytest)
+"""
+
+import unittest
+
+import numpy as np
+
+from models.armazem_mascaras import dezenas_para_mascara
+from models.historico import HistoricoJogos
+from models.jogo import Jogo
+
+DEZENAS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15]
+OUTRAS = [11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25]
+
+
+class TestHistoricoJogos(unittest.TestCase):
+
+    def setUp(self):
+        self.historico = HistoricoJogos()
+        self.historico.adicionar(Jogo(DEZENAS))
+
+    def test_contem_jogo_e_mascara(self):
+        mascara = dezenas_para_mascara(DEZENAS)
+        self.assertIn(Jogo(DEZENAS), self.historico)
+        self.assertIn(mascara, self.historico)
+        self.assertNotIn(Jogo(OUTRAS), self.historico)
+        self.assertNotIn(dezenas_para_mascara(OUTRAS), self.historico)
+
+    def test_contem_mascara_numpy(self):
+        # Máscaras vindas de código vetorizado (armazém, gerador) são np.uint32
+        mascaras = np.array([dezenas_para_mascara(DEZENAS), dezenas_para_mascara(OUTRAS)], dtype=np.uint32)
+        self.assertIn(mascaras[0], self.historico)
+        self.assertNotIn(mascaras[1], self.historico)
+        self.assertIn(np.int64(mascaras[0]), self.historico)
+
+    def test_adicionar_mascaras_numpy_sem_repetir(self):
+        mascaras = np.array([dezenas_para_mascara(DEZENAS), dezenas_para_mascara(OUTRAS)], dtype=np.uint32)
+        self.assertEqual(self.historico.adicionar_mascaras(mascaras), 1)
+        self.assertEqual(len(self.historico), 2)
+        self.assertIn(mascaras[1], self.historico)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# C:\Users\Marcelo\Documents\Python\Lotofacil\views\lista_virtual.py
+# Nome do arquivo: lista_virtual.py
+
+import tkinter as tk
+
+
+class ListaVirtual(tk.Frame):
+    """
+    Listbox que só contém as linhas visíveis: o texto de cada linha é pedido
+    a 'linha(indice)' quando ela aparece e 'total()' informa o tamanho da
+    lista. A barra de rolagem é controlada aqui, então redesenhar custa o
+    mesmo com 15 ou 100 mil linhas.
+
+    'ao_selecionar(indice)' recebe o índice na lista completa.
+    """
+
+    def __init__(self, master, total, linha, ao_selecionar=None, width=50, height=15):
+        super().__init__(master)
+        self.total = total
+        self.linha = linha
+        self.ao_selecionar = ao_selecionar
+        self.altura = height
+        self.topo = 0
+
+        self.scrollbar = tk.Scrollbar(self, command=self._rolar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox = tk.Listbox(self, width=width, height=height, exportselection=False)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH)
+        self.listbox.bind("<<ListboxSelect>>", self._selecionado)
+        self.listbox.bind("<MouseWheel>", lambda e: self._mover(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self._mover(-1))  # roda do mouse no Linux
+        self.listbox.bind("<Button-5>", lambda e: self._mover(1))
+        self.atualizar()
+
+    def _mover(self, linhas):
+        self.topo += linhas
+        self.atualizar()
+        return "break"
+
+    def _rolar(self, acao, quantidade, unidade=None):
+        if acao == tk.MOVETO:
+            self.topo = int(float(quantidade) * self.total())
+        elif unidade == tk.PAGES:
+            self.topo += int(quantidade) * self.altura
+        else:
+            self.topo += int(quantidade)
+        self.atualizar()
+
+    def _selecionado(self, event):
+        selecao = self.listbox.curselection()
+        if selecao and self.ao_selecionar is not None:
+            self.ao_selecionar(self.topo + selecao[0])
+
+    def atualizar(self, topo=None):
+        """
+        Redesenha as linhas visíveis (opcionalmente a partir de 'topo').
+        """
+        if topo is not None:
+            self.topo = topo
+        total = self.total()
+        self.topo = max(0, min(self.topo, total - self.altura))
+        fim = min(self.topo + self.altura, total)
+        self.listbox.delete(0, tk.END)
+        if fim > self.topo:
+            self.listbox.insert(0, *[self.linha(i) for i in range(self.topo, fim)])
+        if total:
+            self.scrollbar.set(self.topo / total, fim / total)
+        else:
+            self.scrollbar.set(0, 1)
@@ -1,12 +1,16 @@
 # C:\Users\Marcelo\Documents\Python\Lotofacil\views\tela_principal.py
 
+import os
 import tkinter as tk
 from threading import Thread, Event
 import tkinter.messagebox as mb
 import tkinter.simpledialog as sd
-from collections import Counter
+import tkinter.filedialog as fd
 import re
 
+import numpy as np
+
+from models.armazem_mascaras import mascara_para_dezenas
 from models.banco_de_dados import BancoDeDados
 from controllers.ui_controller import (
     atualizar_jogo,
@@ -15,14 +19,64 @@ from controllers.ui_controller import (
     copiar_para_area_transferencia,
     exibir_info_banco_de_dados
 )
+from models.conferencia import (
+    PONTUACOES,
+    conferir_sorteio,
+    histograma_por_bilhete,
+    ler_bilhetes,
+    ler_bilhetes_arquivo
+)
+from models.gerador_paralelo import FiltrosJogo, gerar_jogos, salvar_jogos
+from models.historico import HistoricoJogos
 from models.jogo import Jogo
+from models.tabela_faixas import TabelaFaixas, faixas_aceitas
+from views.lista_virtual import ListaVirtual
 
 thread_running = Event()
+geracao_ativa = Event()
+geracao_cancelar = Event()
+estatisticas_cancelar = Event()  # trocado a cada consulta (a anterior é interrompida)
+tabela_faixas = TabelaFaixas()
+
+# Máximo de bilhetes listados individualmente na conferência em lote
+MAX_LISTADOS = 50
+
+# Pares de dezenas listados na tela de frequências
+MAX_PARES = 10
+
+# Acertos mínimos para listar concursos a cada jogo gerado
+VIZINHOS_MINIMO = 14
+
+# Jogos inseridos de uma vez no histórico durante a geração em lote
+JOGOS_POR_INSERCAO = 200
+
+# Linhas inseridas no status por volta do loop do Tk ao exibir relatórios
+LINHAS_POR_BLOCO = 40
+
+# Arquivo do histórico quando "Manter histórico" está marcado
+ARQUIVO_HISTORICO = 'historico_jogos.txt'
 
 def atualizar_status(status_text, message):
     status_text.insert(tk.END, message + "\n")
     status_text.see(tk.END)
 
+def exibir_em_blocos(root, status_text, linhas, cancelar):
+    """
+    Insere as linhas (já terminadas em "\n") no status em blocos de
+    LINHAS_POR_BLOCO, um bloco por volta do loop do Tk, para a janela
+    continuar respondendo. Pode ser chamada de outra thread.
+    """
+    def inserir_bloco(inicio):
+        if cancelar.is_set():
+            atualizar_status(status_text, "Exibição interrompida.")
+            return
+        status_text.insert(tk.END, "".join(linhas[inicio:inicio + LINHAS_POR_BLOCO]))
+        status_text.see(tk.END)
+        if inicio + LINHAS_POR_BLOCO < len(linhas):
+            root.after(1, inserir_bloco, inicio + LINHAS_POR_BLOCO)
+
+    root.after(0, inserir_bloco, 0)
+
 def limpar_e_formatar_entrada(entrada):
     """
     Remove caracteres não numéricos e separa os números em pares de dois dígitos.
@@ -88,6 +142,95 @@ def conferir_jogos_dialog(status_text, root):
         acertos = len(set(jogo) & set(jogo_campeao))
         atualizar_status(status_text, f"Jogo {idx}: {' '.join(jogo)} -> Acertos: {acertos}\n")
 
+def conferir_em_lote_dialog(status_text, db, root):
+    """
+    Confere muitos bilhetes de uma vez (um por linha, de arquivo ou da área
+    de transferência) contra um concurso ou um intervalo de concursos.
+    Formatos aceitos: ver ler_bilhetes.
+    """
+    do_arquivo = mb.askyesnocancel(
+        "Conferir em Lote",
+        "Ler os bilhetes de um arquivo?\n(Sim = arquivo, Não = área de transferência)\n\n"
+        "Um bilhete por linha (15 a 20 dezenas), linhas do histórico ou jogos\n"
+        "copiados com \"Copiar Jogo\" (3 linhas de 5 dezenas).",
+        parent=root
+    )
+    if do_arquivo is None:
+        atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
+        return
+    try:
+        if do_arquivo:
+            caminho = fd.askopenfilename(
+                parent=root, title="Arquivo de bilhetes",
+                filetypes=[("Texto", "*.txt *.csv"), ("Todos", "*.*")]
+            )
+            if not caminho:
+                atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
+                return
+            bilhetes, invalidas = ler_bilhetes_arquivo(caminho)
+        else:
+            bilhetes, invalidas = ler_bilhetes(root.clipboard_get())
+    except (OSError, tk.TclError) as e:
+        mb.showerror("Erro", f"Não foi possível ler os bilhetes: {e}", parent=root)
+        return
+
+    atualizar_status(status_text, f"Bilhetes lidos: {len(bilhetes)} | Linhas inválidas: {len(invalidas)}")
+    for numero, texto in invalidas[:10]:
+        atualizar_status(status_text, f"  Linha {numero} ignorada: {texto}")
+    if not len(bilhetes):
+        return
+
+    sorteios = np.array(db.obter_mascaras(), dtype=np.uint32)
+    ultimo = int(np.flatnonzero(sorteios)[-1]) + 1 if sorteios.any() else None
+    if ultimo is None:
+        atualizar_status(status_text, "Nenhum jogo encontrado no banco de dados.\n")
+        return
+
+    faixa = sd.askstring(
+        "Conferir em Lote",
+        f"Concurso (ex.: {ultimo}) ou intervalo (ex.: 1-{ultimo}):",
+        initialvalue=str(ultimo), parent=root
+    )
+    if not faixa:
+        atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
+        return
+    limites = re.findall(r'\d+', faixa)
+    if not 1 <= len(limites) <= 2:
+        mb.showerror("Erro", "Informe um concurso ou um intervalo inicial-final.", parent=root)
+        return
+    inicio, fim = max(int(limites[0]), 1), int(limites[-1])
+    selecionados = np.flatnonzero(sorteios[inicio - 1:fim]) + inicio
+    if not len(selecionados):
+        atualizar_status(status_text, f"Nenhum concurso no intervalo [{inicio}..{fim}].\n")
+        return
+
+    msg = "=== Conferência em Lote ===\n"
+    if len(selecionados) == 1:
+        concurso = int(selecionados[0])
+        acertos = conferir_sorteio(bilhetes, sorteios[concurso - 1])
+        msg += f"Concurso {concurso}: {' '.join(f'{d:02d}' for d in mascara_para_dezenas(int(sorteios[concurso - 1])))}\n"
+        for pontos in reversed(PONTUACOES):
+            msg += f"  {pontos} pontos: {int(np.count_nonzero(acertos == pontos))} bilhetes\n"
+        premiados = np.flatnonzero(acertos >= PONTUACOES[0])
+        for i in premiados[np.argsort(-acertos[premiados], kind='stable')][:MAX_LISTADOS]:
+            msg += f"  Bilhete {i + 1}: {' '.join(f'{d:02d}' for d in mascara_para_dezenas(int(bilhetes[i])))} -> {acertos[i]} pontos\n"
+    else:
+        histograma = histograma_por_bilhete(bilhetes, sorteios[selecionados - 1])
+        msg += f"Concursos {selecionados[0]} a {selecionados[-1]} ({len(selecionados)} sorteios)\n"
+        for coluna, pontos in reversed(list(enumerate(PONTUACOES))):
+            msg += f"  {pontos} pontos: {int(histograma[:, coluna].sum())} vezes\n"
+        # Bilhetes ordenados do melhor para o pior histórico (15 pontos primeiro)
+        ordem = np.lexsort(histograma.T)[::-1]
+        for i in ordem[:MAX_LISTADOS]:
+            if not histograma[i].any():
+                break
+            contagens = ", ".join(
+                f"{pontos}: {histograma[i, coluna]}" for coluna, pontos in enumerate(PONTUACOES) if histograma[i, coluna]
+            )
+            msg += f"  Bilhete {i + 1}: {contagens}\n"
+    msg += "-----------------------------------------\n"
+    atualizar_status(status_text, msg)
+
 def atualizar_banco_thread(status_text, db, info_label):
     try:
         thread_running.set()
@@ -107,106 +250,276 @@ def atualizar_banco_thread(status_text, db, info_label):
     finally:
         thread_running.clear()
 
-def gerar_jogo_com_restricoes(desejado_gap=None, desejado_std=None, max_tentativas=10000):
+def gerar_jogo_com_restricoes(desejado_gap=None, desejado_std=None):
     """
-    Gera jogos aleatórios até encontrar um cuja 'avg_gap' e/ou 'std_dev'
-    estejam dentro da tolerância dos valores desejados.
+    Sorteia, uniformemente entre todas as combinações, um jogo cuja 'avg_gap'
+    e/ou 'std_dev' estejam dentro da tolerância dos valores desejados, usando
+    a tabela pré-calculada de faixas. Retorna None só se nenhuma combinação
+    atender às restrições.
     """
-    for _ in range(max_tentativas):
-        jogo = Jogo()
-        avg_gap = jogo.avaliar_distribuicao_avg_gap()
-        std_dev = jogo.avaliar_distribuicao_std()
-
-        ok_gap = desejado_gap is None or abs(avg_gap - desejado_gap) <= 0.1
-        ok_std = desejado_std is None or abs(std_dev - desejado_std) <= 0.3
+    rank = tabela_faixas.sortear(*faixas_aceitas(desejado_gap, desejado_std))
+    return Jogo(rank=rank) if rank is not None else None
 
-        if ok_gap and ok_std:
-            return jogo
-    return None
+def linhas_estatisticas(est):
+    """
+    Relatório de MotorEstatisticas.calcular(), linha a linha.
+    """
+    linhas = [
+        "=== Estatísticas do Banco de Dados ===\n",
+        f"Jogos analisados: {est['quantidade']}\n",
+        "\n",
+        f"- Média do Average Gap: {est['gap_medio']:.2f}\n",
+        f"  (Mín: {est['gap_min']:.2f} | Máx: {est['gap_max']:.2f})\n",
+        "\n",
+        f"- Média do Std Dev: {est['std_medio']:.2f}\n",
+        f"  (Mín: {est['std_min']:.2f} | Máx: {est['std_max']:.2f})\n",
+        "\n",
+        "=== Ocorrências de Average Gap ===\n",
+    ]
+    linhas += [f"  Gap {gap:.2f}: {count} jogos\n" for gap, count in est['gap_contagens']]
+
+    linhas.append("\n=== Ocorrências de Std Dev ===\n")
+    linhas += [f"  Std Dev {std:.2f}: {count} jogos\n" for std, count in est['std_contagens']]
+
+    # Combinações de Gap + Std Dev
+    linhas.append("\n=== Ocorrências de Gap+Std ===\n")
+    linhas += [
+        f"  {{ {gap_val:.2f} , {std_val:.2f} }}: {cnt} jogos\n"
+        for (gap_val, std_val), cnt in est['combinacoes']
+    ]
+    linhas.append("-----------------------------------------\n")
+    return linhas
 
 def exibir_estatisticas(status_text, db, root):
+    """
+    Pergunta o intervalo e calcula as estatísticas numa thread (motor e
+    intervalos memorizados pelo banco); o relatório entra no status em
+    blocos. "Parar" ou uma nova consulta interrompem a anterior.
+    """
+    global estatisticas_cancelar
     usar_todos = mb.askyesno(
         "Estatísticas",
         "Deseja ver estatísticas de TODOS os concursos?\n(Sim = todos, Não = escolher intervalo)",
         parent=root
     )
 
-    todos_jogos = db.recuperar_todos_jogos()
-    if not todos_jogos:
+    if not db.obter_total_concursos():
         atualizar_status(status_text, "Nenhum jogo encontrado no banco de dados.\n")
         return
 
     if usar_todos:
-        concursos_filtrados = todos_jogos
+        inicio = fim = None
     else:
         inicio = sd.askinteger("Intervalo", "Concurso inicial:", minvalue=1, parent=root)
         fim    = sd.askinteger("Intervalo", "Concurso final:",  minvalue=1, parent=root)
         if inicio is None or fim is None:
             atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
             return
-        concursos_filtrados = [
-            (num, dz) for (num, dz) in todos_jogos
-            if inicio <= num <= fim
-        ]
-        if not concursos_filtrados:
-            atualizar_status(
-                status_text,
+
+    estatisticas_cancelar.set()
+    cancelar = estatisticas_cancelar = Event()
+
+    def tarefa():
+        try:
+            # Faixas de Gap e Std Dev (vetorizado, ver models/estatisticas.py)
+            est = db.obter_motor_estatisticas().calcular(inicio, fim)
+        except Exception as e:
+            root.after(0, atualizar_status, status_text, f"Erro ao calcular estatísticas: {e}")
+            return
+        if cancelar.is_set():
+            return
+        if est is None:
+            root.after(
+                0, atualizar_status, status_text,
                 f"Nenhum concurso no intervalo [{inicio}..{fim}].\nVerifique se digitou corretamente."
             )
             return
+        # A linha vazia final corresponde ao "\n" de atualizar_status
+        exibir_em_blocos(root, status_text, linhas_estatisticas(est) + ["\n"], cancelar)
 
-    # ================================================
-    # Bloco: cálculo de avg_gaps e std_devs
-    # ================================================
-    avg_gaps = []
-    std_devs = []
-    for (_, dezenas) in concursos_filtrados:
-        jogo_obj = Jogo(dezenas=dezenas)
-        avg_gaps.append(round(jogo_obj.avaliar_distribuicao_avg_gap(), 2))
-        std_devs.append(round(jogo_obj.avaliar_distribuicao_std(), 2))
-
-    quantidade = len(avg_gaps)
-    if quantidade == 0:
-        atualizar_status(status_text, "Nenhum jogo válido para calcular estatísticas.\n")
+    Thread(target=tarefa, daemon=True).start()
+
+def exibir_frequencias(status_text, db):
+    """
+    Frequência, atraso e pares mais sorteados de cada dezena, lidos do
+    snapshot de estatísticas (não percorre o histórico).
+    """
+    snap = db.obter_estatisticas()
+    total, ultimo = int(snap['total']), int(snap['ultimo'])
+    if total == 0:
+        atualizar_status(status_text, "Nenhum jogo encontrado no banco de dados.\n")
         return
 
-    avg_gap_medio = sum(avg_gaps) / quantidade
-    std_dev_medio = sum(std_devs) / quantidade
-    avg_gap_min, avg_gap_max = min(avg_gaps), max(avg_gaps)
-    std_dev_min, std_dev_max = min(std_devs), max(std_devs)
+    janelas = [int(n) for n in snap['janelas']]
+    msg = (
+        "=== Frequências e Atrasos ===\n"
+        f"Concursos: {total} | Último: {ultimo}\n\n"
+        "Dezena | Vezes |   %   | Atraso | " + " | ".join(f"Últ. {n}" for n in janelas) + "\n"
+    )
+    for i in range(25):
+        atraso = ultimo - int(snap['ultimo_visto'][i])
+        recentes = " | ".join(f"{int(snap['janela_frequencias'][j][i]):>7}" for j in range(len(janelas)))
+        msg += (
+            f"  {i + 1:02d}   | {int(snap['frequencias'][i]):>5} | "
+            f"{100 * snap['frequencias'][i] / total:5.1f} | {atraso:>6} | {recentes}\n"
+        )
 
-    # ================================================
-    # Bloco: estatísticas separadas (Gap e Std)
-    # ================================================
-    gap_counts     = Counter(avg_gaps).most_common()
-    std_dev_counts = Counter(std_devs).most_common()
+    pares = np.triu(snap['pares'], k=1)
+    msg += "\n=== Pares mais sorteados ===\n"
+    for indice in np.argsort(pares, axis=None)[::-1][:MAX_PARES]:
+        a, b = divmod(int(indice), 25)
+        msg += f"  {{ {a + 1:02d} , {b + 1:02d} }}: {int(pares[a, b])} concursos\n"
+    msg += "-----------------------------------------\n"
+    atualizar_status(status_text, msg)
 
-    msg = (
-        "=== Estatísticas do Banco de Dados ===\n"
-        f"Jogos analisados: {quantidade}\n\n"
-        f"- Média do Average Gap: {avg_gap_medio:.2f}\n"
-        f"  (Mín: {avg_gap_min:.2f} | Máx: {avg_gap_max:.2f})\n\n"
-        f"- Média do Std Dev: {std_dev_medio:.2f}\n"
-        f"  (Mín: {std_dev_min:.2f} | Máx: {std_dev_max:.2f})\n\n"
-        "=== Ocorrências de Average Gap ===\n"
+def mostrar_vizinhos(status_text, db, dezenas, minimo=VIZINHOS_MINIMO):
+    """
+    Mostra quantos concursos tiveram 11 a 15 dezenas em comum com o jogo e
+    lista os que tiveram pelo menos 'minimo'.
+    """
+    resultado = db.buscar_vizinhos(dezenas, minimo)
+    if not resultado.distribuicao.any():
+        return
+    distribuicao = " | ".join(f"{k}: {resultado.distribuicao[k]}" for k in reversed(PONTUACOES))
+    msg = f"Jogo {' '.join(f'{d:02d}' for d in sorted(dezenas))} no histórico -> {distribuicao}"
+    for concurso, acertos in list(resultado)[:MAX_LISTADOS]:
+        msg += f"\n  Concurso {concurso}: {acertos} acertos"
+    atualizar_status(status_text, msg)
+
+def vizinhos_dialog(status_text, db, root, jogo_labels):
+    dezenas = [int(label.cget("text")) for label in jogo_labels if label.cget("text")]
+    if not dezenas:
+        mb.showerror("Erro", "Nenhum jogo na tela. Gere ou carregue um jogo primeiro.", parent=root)
+        return
+    minimo = sd.askinteger(
+        "Concursos Vizinhos",
+        "Listar concursos com pelo menos quantas dezenas em comum?",
+        initialvalue=13, minvalue=0, maxvalue=15, parent=root
     )
-    for gap, count in gap_counts:
-        msg += f"  Gap {gap:.2f}: {count} jogos\n"
+    if minimo is None:
+        atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
+        return
+    mostrar_vizinhos(status_text, db, dezenas, minimo)
+    atualizar_status(status_text, "----------------------------------------")
 
-    msg += "\n=== Ocorrências de Std Dev ===\n"
-    for std, count in std_dev_counts:
-        msg += f"  Std Dev {std:.2f}: {count} jogos\n"
+def _ler_faixa(texto):
+    """
+    "7-8" -> (7, 8); "8" -> (8, 8); vazio -> None (sem restrição).
+    """
+    numeros = [int(n) for n in re.findall(r'\d+', texto or '')]
+    if not numeros:
+        return None
+    if len(numeros) > 2:
+        raise ValueError(texto)
+    return (min(numeros), max(numeros))
+
+def gerar_varios_dialog(status_text, db, root, historico, historico_lista, desejado_gap=None, desejado_std=None):
+    """
+    Gera muitos jogos distintos em segundo plano (pool de processos), com os
+    filtros de Gap/Std da tela mais ímpares, soma e exclusão de concursos já
+    sorteados. Os jogos vão para um arquivo ou para o histórico à medida que
+    são encontrados; "Parar" interrompe.
+    """
+    if geracao_ativa.is_set():
+        mb.showinfo("Gerar Vários", "Já há uma geração em andamento.", parent=root)
+        return
+    quantidade = sd.askinteger(
+        "Gerar Vários", "Quantos jogos distintos?",
+        initialvalue=1000, minvalue=1, maxvalue=1000000, parent=root
+    )
+    if quantidade is None:
+        atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
+        return
+    try:
+        impares = _ler_faixa(sd.askstring(
+            "Gerar Vários", "Dezenas ímpares (ex.: 7-8; vazio = qualquer):", parent=root
+        ))
+        soma = _ler_faixa(sd.askstring(
+            "Gerar Vários", "Soma das dezenas (ex.: 180-210; vazio = qualquer):", parent=root
+        ))
+    except ValueError:
+        mb.showerror("Erro", "Informe um valor ou um intervalo mínimo-máximo.", parent=root)
+        return
+    excluir = list(db.obter_mascaras()) if mb.askyesno(
+        "Gerar Vários", "Excluir jogos que já foram sorteados?", parent=root
+    ) else []
+    para_arquivo = mb.askyesnocancel(
+        "Gerar Vários", "Gravar os jogos em um arquivo?\n(Sim = arquivo, Não = histórico)", parent=root
+    )
+    if para_arquivo is None:
+        atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
+        return
+    caminho = None
+    if para_arquivo:
+        caminho = fd.asksaveasfilename(
+            parent=root, title="Salvar jogos", defaultextension=".txt",
+            filetypes=[("Texto", "*.txt"), ("Todos", "*.*")]
+        )
+        if not caminho:
+            atualizar_status(status_text, "Operação cancelada pelo usuário.\n")
+            return
+    else:
+        excluir += historico.mascaras  # só jogos que ainda não estão no histórico
+
+    filtros = FiltrosJogo(desejado_gap, desejado_std, impares=impares, soma=soma)
 
     # ================================================
-    # Bloco: combinações de Gap + Std Dev
+    # Geração em segundo plano; a tela só é tocada via root.after
     # ================================================
-    combo_counts = Counter(zip(avg_gaps, std_devs))
-    msg += "\n=== Ocorrências de Gap+Std ===\n"
-    for (gap_val, std_val), cnt in combo_counts.most_common():
-        msg += f"  {{ {gap_val:.2f} , {std_val:.2f} }}: {cnt} jogos\n"
-
-    msg += "-----------------------------------------\n"
-    atualizar_status(status_text, msg)
+    def status(msg):
+        root.after(0, atualizar_status, status_text, msg)
+
+    def inserir_no_historico(jogos):
+        historico.adicionar_varios(jogos)
+        historico_lista.atualizar(0)
+
+    def tarefa():
+        try:
+            jogos = gerar_jogos(
+                quantidade, filtros, excluir=excluir, cancelar=geracao_cancelar,
+                progresso=lambda gerados, candidatos: status(
+                    f"Gerados {gerados}/{quantidade} ({candidatos} candidatos avaliados)"
+                )
+            )
+            if caminho:
+                total = salvar_jogos(jogos, caminho)
+                destino = caminho
+            else:
+                total, lote = 0, []
+                for jogo in jogos:
+                    lote.append(jogo)
+                    if len(lote) >= JOGOS_POR_INSERCAO:
+                        root.after(0, inserir_no_historico, lote)
+                        total, lote = total + len(lote), []
+                if lote:
+                    root.after(0, inserir_no_historico, lote)
+                    total += len(lote)
+                destino = "histórico"
+            if geracao_cancelar.is_set():
+                status(f"Geração interrompida: {total} jogos em {destino}.")
+            elif total < quantidade:
+                status(f"Filtros esgotados: só {total} jogos distintos encontrados ({destino}).")
+            else:
+                status(f"{total} jogos gerados em {destino}.")
+        except Exception as e:
+            status(f"Erro na geração em lote: {e}")
+        finally:
+            status("----------------------------------------")
+            geracao_ativa.clear()
+
+    geracao_cancelar.clear()
+    geracao_ativa.set()
+    atualizar_status(status_text, f"Gerando {quantidade} jogos em segundo plano...")
+    Thread(target=tarefa, daemon=True).start()
+
+def parar_tarefas(status_text):
+    """
+    Interrompe a geração em lote e a exibição de estatísticas em andamento.
+    """
+    estatisticas_cancelar.set()
+    if geracao_ativa.is_set():
+        geracao_cancelar.set()
+        atualizar_status(status_text, "Interrompendo a geração...")
 
 def como_interpretar():
     texto = (
@@ -263,17 +576,29 @@ def create_main_screen():
     historico_frame = tk.Frame(root)
     historico_frame.grid(row=2, column=5, rowspan=2, padx=20, pady=10)
     tk.Label(historico_frame, text="Histórico de Jogos", font=("Arial", 12, "bold")).pack(anchor="w", pady=(0,5))
-    scrollbar = tk.Scrollbar(historico_frame)
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    historico_listbox = tk.Listbox(
-        historico_frame, width=50, height=15, yscrollcommand=scrollbar.set
-    )
-    historico_listbox.pack(side=tk.LEFT, fill=tk.BOTH)
-    historico_listbox.bind(
-        "<<ListboxSelect>>",
-        lambda e: carregar_jogo_do_historico(e, jogo_labels, historico_listbox)
+    historico = HistoricoJogos()
+    manter_historico_var = tk.BooleanVar(value=os.path.exists(ARQUIVO_HISTORICO))
+    if manter_historico_var.get():
+        historico.carregar(ARQUIVO_HISTORICO)
+        historico.arquivo = ARQUIVO_HISTORICO
+    historico_lista = ListaVirtual(
+        historico_frame, total=lambda: len(historico), linha=historico.linha,
+        ao_selecionar=lambda indice: carregar_jogo_do_historico(jogo_labels, historico, indice)
     )
-    scrollbar.config(command=historico_listbox.yview)
+    historico_lista.pack(fill=tk.BOTH)
+
+    def alternar_manter_historico():
+        if manter_historico_var.get():
+            historico.vincular_arquivo(ARQUIVO_HISTORICO)
+        else:
+            historico.vincular_arquivo(None)
+            if os.path.exists(ARQUIVO_HISTORICO):
+                os.remove(ARQUIVO_HISTORICO)
+
+    tk.Checkbutton(
+        historico_frame, text="Manter histórico entre execuções",
+        variable=manter_historico_var, command=alternar_manter_historico
+    ).pack(anchor="w")
 
     # Banco de dados
     db = BancoDeDados(filename='banco_de_dados.txt')
@@ -301,19 +626,28 @@ def create_main_screen():
     # ================================================
     # Função interna: gera jogo e exibe valores + contagem
     # ================================================
+    def mostrar_vizinhos_do_jogo(jogo):
+        mostrar_vizinhos(status_text, db, jogo.dezenas)
+
+    # (desejado_gap, desejado_std) das entradas, se "Usar valores?" estiver marcado
+    def ler_restricoes():
+        if not use_custom_values_var.get():
+            return None, None
+        try:
+            desejado_gap = float(gap_entry.get().strip()) if gap_entry.get().strip() else None
+            desejado_std = float(dev_entry.get().strip()) if dev_entry.get().strip() else None
+        except ValueError:
+            atualizar_status(status_text, "Valores inválidos para Gap/Std. Gerando sem restrições.")
+            return None, None
+        return desejado_gap, desejado_std
+
     def gerar_jogo_exibir_valores():
         # Bloco: geração com restrições
         if use_custom_values_var.get():
-            try:
-                desejado_gap = float(gap_entry.get().strip()) if gap_entry.get().strip() else None
-                desejado_std = float(dev_entry.get().strip()) if dev_entry.get().strip() else None
-            except ValueError:
-                atualizar_status(status_text, "Valores inválidos para Gap/Std. Gerando jogo normal.")
-                desejado_gap = desejado_std = None
-
+            desejado_gap, desejado_std = ler_restricoes()
             jogo = gerar_jogo_com_restricoes(desejado_gap, desejado_std)
             if jogo:
-                atualizar_jogo(jogo_labels, jogo=jogo)
+                atualizar_jogo(jogo_labels, jogo=jogo, ao_atualizar=mostrar_vizinhos_do_jogo)
                 avg_gap = jogo.avaliar_distribuicao_avg_gap()
                 std_dev = jogo.avaliar_distribuicao_std()
                 atualizar_status(
@@ -323,10 +657,8 @@ def create_main_screen():
                     f"Gap: {avg_gap:.2f} | Std: {std_dev:.2f}\n"
                     "----------------------------------------"
                 )
-                historico_listbox.insert(
-                    0,
-                    f"{' '.join(map(str, jogo.dezenas))} | Gap: {avg_gap:.2f}, Std: {std_dev:.2f}"
-                )
+                historico.adicionar(jogo)
+                historico_lista.atualizar(0)
                 return  # evita fallback
             else:
                 atualizar_status(
@@ -335,7 +667,7 @@ def create_main_screen():
                 )
 
         # Bloco: geração sem restrições (fallback)
-        jogo = atualizar_jogo(jogo_labels, jogo=None)
+        jogo = atualizar_jogo(jogo_labels, jogo=None, ao_atualizar=mostrar_vizinhos_do_jogo)
         if jogo:
             avg_gap = jogo.avaliar_distribuicao_avg_gap()
             std_dev = jogo.avaliar_distribuicao_std()
@@ -345,36 +677,29 @@ def create_main_screen():
                 f"Gap: {avg_gap:.2f} | Std: {std_dev:.2f}\n"
                 "----------------------------------------"
             )
-            historico_listbox.insert(
-                0,
-                f"{' '.join(map(str, jogo.dezenas))} | Gap: {avg_gap:.2f}, Std: {std_dev:.2f}"
-            )
+            historico.adicionar(jogo)
+            historico_lista.atualizar(0)
         else:
             atualizar_status(status_text, "Nenhum jogo foi retornado por atualizar_jogo.")
 
-        # Bloco: contar ocorrências de Gap+Std no histórico
-        combo = Counter()
-        for item in historico_listbox.get(0, tk.END):
-            try:
-                partes = item.split('|')[1].strip()
-                gap_p, std_p = partes.split(',')
-                g = float(gap_p.split(':')[1]); s = float(std_p.split(':')[1])
-                combo[(round(g,2), round(s,2))] += 1
-            except:
-                continue
-
+        # Bloco: ocorrências de Gap+Std no histórico (contadas a cada inclusão)
         atualizar_status(status_text, "=== Ocorrências de Gap+Std ===")
-        for (g, s), c in combo.most_common():
+        for (g, s), c in historico.mais_comuns():
             atualizar_status(status_text, f"{{ {g:.2f} , {s:.2f} }} = {c}x")
         atualizar_status(status_text, "----------------------------------------\n")
 
     # Botões de ação
     tk.Button(button_frame, text="Gerar Jogo", command=gerar_jogo_exibir_valores).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Gerar Vários", command=lambda: gerar_varios_dialog(status_text, db, root, historico, historico_lista, *ler_restricoes())).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Parar", command=lambda: parar_tarefas(status_text)).pack(side=tk.LEFT, padx=10)
     tk.Button(button_frame, text="Copiar Jogo", command=lambda: copiar_para_area_transferencia(root, jogo_labels)).pack(side=tk.LEFT, padx=10)
     tk.Button(button_frame, text="Resetar Jogo", command=lambda: resetar_jogo(jogo_labels)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Vizinhos", command=lambda: vizinhos_dialog(status_text, db, root, jogo_labels)).pack(side=tk.LEFT, padx=10)
     tk.Button(button_frame, text="Conferir Jogos", command=lambda: conferir_jogos_dialog(status_text, root)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Conferir em Lote", command=lambda: conferir_em_lote_dialog(status_text, db, root)).pack(side=tk.LEFT, padx=10)
     tk.Button(button_frame, text="Atualizar Banco", command=lambda: Thread(target=atualizar_banco_thread, args=(status_text, db, info_label)).start()).pack(side=tk.LEFT, padx=10)
     tk.Button(button_frame, text="Ver Estatísticas", command=lambda: exibir_estatisticas(status_text, db, root)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Frequências", command=lambda: exibir_frequencias(status_text, db)).pack(side=tk.LEFT, padx=10)
     tk.Button(button_frame, text="Como Interpretar", command=como_interpretar).pack(side=tk.LEFT, padx=10)
     tk.Button(button_frame, text="Sair", command=root.quit).pack(side=tk.LEFT, padx=10)
 
@@ -0,0 +1,73 @@
+# Compara a carga antiga do att_loto.py (um INSERT + commit por concurso)
+# com a carga em lote (INSERT multi-linha parametrizado, um único commit),
+# usando um SQLite em arquivo como substituto local do MySQL.
+#
+# Uso: python bench_carga_loto.py [--lote=500]
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Lotofacil"))
+from models.carga_em_lote import carregar_em_lote
+
+TAMANHO_LOTE = 500
+for arg in sys.argv[1:]:
+    if arg.startswith("--lote="):
+        TAMANHO_LOTE = int(arg.split("=", 1)[1])
+
+ESQUEMA = "CREATE TABLE loto (data_concurso TEXT, concurso INTEGER PRIMARY KEY, dezenas TEXT)"
+
+
+def carregar_sorteios():
+    arquivo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Lotofacil", "banco_de_dados.txt")
+    sorteios = []
+    with open(arquivo, "r") as f:
+        for linha in f:
+            partes = linha.strip().split(",")
+            if len(partes) == 16:
+                numero = int(partes[0])
+                data = (date(2003, 9, 29) + timedelta(days=7 * (numero - 1))).strftime("%Y/%m/%d")
+                sorteios.append((data, numero, ",".join(sorted(partes[1:]))))
+    return sorteios
+
+
+def conectar(pasta, nome):
+    conn = sqlite3.connect(os.path.join(pasta, nome))
+    conn.execute("PRAGMA synchronous = FULL")
+    conn.execute(ESQUEMA)
+    conn.commit()
+    return conn
+
+
+def carga_linha_a_linha(conn, sorteios):
+    cursor = conn.cursor()
+    inicio = time.perf_counter()
+    for data_sorteio, numero, dezenas in sorteios:
+        sql = f"INSERT INTO loto (data_concurso, concurso, dezenas) VALUES ('{data_sorteio}', {numero}, '{dezenas}')"
+        cursor.execute(sql)
+        conn.commit()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    sorteios = carregar_sorteios()
+    with tempfile.TemporaryDirectory() as pasta:
+        conn = conectar(pasta, "linha_a_linha.db")
+        segundos = carga_linha_a_linha(conn, sorteios)
+        conn.close()
+        print(f"Linha a linha: {len(sorteios)} linhas, {segundos:.2f}s ({len(sorteios) / segundos:.0f} linhas/s)")
+
+        conn = conectar(pasta, "em_lote.db")
+        resultado = carregar_em_lote(conn, sorteios, dialeto="sqlite", tamanho_lote=TAMANHO_LOTE)
+        print(f"Em lote:       {resultado}")
+
+        # Segunda carga sobre a mesma tabela: exercita o upsert por concurso
+        resultado_upsert = carregar_em_lote(conn, sorteios, dialeto="sqlite", tamanho_lote=TAMANHO_LOTE)
+        (total,) = conn.execute("SELECT COUNT(*) FROM loto").fetchone()
+        conn.close()
+        print(f"Upsert:        {resultado_upsert} (total na tabela: {total})")
+        print(f"Ganho: {segundos / resultado.segundos:.0f}x")
@@ -1,41 +1,45 @@
-import io
-import time
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-url = "https://loterias.caixa.gov.br/Paginas/Lotofacil.aspx"
-driver = webdriver.Chrome()
-
-driver.get(url)
-
-# Espera até que o link com o texto desejado esteja visível na página
-link = WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.LINK_TEXT, "Resultados da Lotofácil por ordem crescente.")))
-
-# Clica no link
-link.click()
-
-# Espera 30 segundos para o download do conteúdo da página
-time.sleep(30)
-
-# Salva o conteúdo da página em um objeto de memória
-page_content = driver.page_source
-
-# Define o caminho do arquivo de saída
-file_path = 'lf.html'
+import sys
+import time
 
-# Grava o conteúdo da página em um arquivo com nome e extensão padrão
+# Importador HTTP + leitor da planilha XLSX / parser HTML em streaming
+# (Lotofacil/models/importador_html.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Lotofacil"))
+from models.importador_html import URL_RESULTADOS, importar
+from models.sincronizacao import DestinoDumpSQL, gravar_registros
+
+# Uso:
+#   python loto_do_html.py [url_ou_arquivo_salvo] [--sql=loto.sql]
+# Sem argumentos baixa a planilha de resultados da Caixa e a salva em lf.xlsx.
+# Com um arquivo local (ex.: um lf.xlsx ou lf.html salvo antes) funciona sem internet.
+argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+origem = argumentos[0] if argumentos else URL_RESULTADOS
+destino_sql = None
+for arg in sys.argv[1:]:
+    if arg.startswith("--sql="):
+        destino_sql = arg.split("=", 1)[1]
+
+# Define o caminho do arquivo de saída (cópia bruta do que foi baixado)
+file_path = None
+if origem.startswith(('http://', 'https://')):
+    file_path = 'lf.xlsx' if origem == URL_RESULTADOS else 'lf.html'
+
+inicio = time.perf_counter()
 try:
-    with io.open(file_path, 'w', encoding='utf-8') as f:
-        f.write(page_content)
-    if os.path.isfile(file_path):
-        full_path = os.path.abspath(file_path)
-        print("Arquivo gravado com sucesso em:", full_path)
-    else:
-        print("Erro ao gravar o arquivo:", file_path, "não existe")
+    registros = importar(origem, copia=file_path)
 except Exception as e:
-    print("Erro ao gravar o arquivo:", e)
+    print("Erro ao importar os resultados:", e)
+    sys.exit(1)
+duracao = time.perf_counter() - inicio
+
+if not registros:
+    print("Nenhum resultado encontrado em:", origem)
+    sys.exit(1)
+
+print(f"{len(registros)} concursos lidos em {duracao:.2f}s "
+      f"(concursos {registros[0].numero} a {registros[-1].numero}).")
+if file_path and os.path.isfile(file_path):
+    print("Arquivo gravado com sucesso em:", os.path.abspath(file_path))
 
-driver.quit()
+if destino_sql:
+    gravar_registros([DestinoDumpSQL(destino_sql)], registros, status_callback=print)
@@ -1,47 +1,28 @@
-import requests
-import json
 import os
-import certifi
-import urllib3
-from datetime import datetime
+import sys
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Pipeline de sincronização compartilhado (Lotofacil/models/sincronizacao.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Lotofacil'))
+from models.buscador_concursos import BuscadorConcursos
+from models.cache_respostas import CacheRespostas
+from models.sincronizacao import DestinoDumpSQL, sincronizar
 
-url_base = 'https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/'
+# Concursos já apurados vêm do cache; com --offline nada é buscado na rede
+offline = '--offline' in sys.argv
 
-# Número do último concurso
-try:
-    ultimo_concurso = requests.get(url_base, verify=False).json()['numero']
-except requests.exceptions.RequestException as e:
-    print(f"Erro ao buscar o último concurso: {e}")
-    exit()
-
-# Lista para armazenar as informações dos sorteios
-sorteios = []
-
-# Loop pelos concursos anteriores ao último sorteado
-for concurso in range(ultimo_concurso, 0, -1):
-    url = url_base + str(concurso)
-    try:
-        response = requests.get(url, verify=False)
-    except requests.exceptions.RequestException as e:
-        print(f"Erro ao buscar o concurso {concurso}: {e}")
-        continue
-    if response.status_code == 200:
-        data = response.json()
-        # Converte a data de string para objeto datetime e formata para o padrão aaaa/mm/dd
-        data_sorteio = datetime.strptime(data["dataApuracao"], '%d/%m/%Y').strftime('%Y/%m/%d')
-        numero = data['numero']
-        dezenas = ', '.join(data['listaDezenas'])
-        sorteios.append((data_sorteio, numero, dezenas))
+# O loto.sql é retomado de onde parou; --novo apaga e gera de novo
+if '--novo' in sys.argv and os.path.exists('loto.sql'):
+    os.remove('loto.sql')
 
-# Armazena as informações em um arquivo loto.sql
+# Armazena as informações em um arquivo loto.sql (um INSERT por concurso)
 try:
-    if os.path.exists('loto.sql'):
-        os.remove('loto.sql')
-    with open('loto.sql', 'w') as f:
-        for sorteio in sorteios:
-            f.write(f"INSERT INTO loto (data_sorteio, concurso, jogo) VALUES ('{sorteio[0]}', {sorteio[1]}, '{sorteio[2]}');\n")
+    sincronizar(
+        [DestinoDumpSQL('loto.sql', colunas=('data_sorteio', 'concurso', 'jogo'),
+                        separador=', ', linhas_por_insert=1)],
+        BuscadorConcursos(cache=CacheRespostas(), verificar_ssl=False),
+        offline=offline,
+        status_callback=print,
+    )
 except OSError as e:
     print(f"Erro ao criar o arquivo loto.sql: {e}")
     exit()
@@ -1,58 +1,31 @@
-import requests
 import os
+import sys
 from tqdm import tqdm
-import urllib3
-from datetime import datetime
 
-# Remover avisos de SSL
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Pipeline de sincronização compartilhado (Lotofacil/models/sincronizacao.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Lotofacil'))
+from models.buscador_concursos import BuscadorConcursos
+from models.cache_respostas import CacheRespostas
+from models.sincronizacao import DestinoDumpSQL, sincronizar
 
-# Configurações da conexão
-session = requests.Session()
-session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=100, pool_maxsize=100))
-session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=100, pool_maxsize=100))
-session.headers.update({'Accept-Encoding': 'gzip, deflate'})
-session.keep_alive = False
+# Concursos já apurados vêm do cache; com --offline nada é buscado na rede
+offline = '--offline' in sys.argv
 
-url_base = 'https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/'
-
-# Número do último concurso
-try:
-    ultimo_concurso = session.get(url_base, verify=False).json()['numero']
-except requests.exceptions.RequestException as e:
-    print(f"Erro ao buscar o último concurso: {e}")
-    exit()
-
-# Loop pelos concursos anteriores ao último sorteado
-sorteios = []
-comandos_insert = []
-for concurso in tqdm(range(ultimo_concurso, 0, -1), desc='Baixando resultados da lotofacil'):
-    url = url_base + str(concurso)
-    try:
-        response = session.get(url, stream=True, verify=False)
-        response.raise_for_status()  # Levanta uma exceção para erros de conexão
-        data = response.json()
-        # Converte a data de string para objeto datetime e formata para o padrão aaaa/mm/dd
-        data_sorteio = datetime.strptime(data["dataApuracao"], '%d/%m/%Y').strftime('%Y/%m/%d')
-        numero = data['numero']
-        dezenas = ','.join(data['listaDezenas'])
-        sorteios.append((data_sorteio, numero, dezenas))
-        comandos_insert.append(f"('{data_sorteio}', {numero}, '{dezenas}')")
-        tqdm.write(f"Concurso {concurso} baixado com sucesso!")
-    except (requests.exceptions.RequestException, ValueError) as e:
-        tqdm.write(f"Erro ao buscar o concurso {concurso}: {e}")
-
-# Verifica se o arquivo já existe e exclui
-if os.path.exists('loto.sql'):
+# O loto.sql é retomado de onde parou; --novo apaga e gera de novo
+if '--novo' in sys.argv and os.path.exists('loto.sql'):
     os.remove('loto.sql')
 
-# Cria o arquivo e grava os comandos INSERT INTO
+# Grava o loto.sql em INSERTs multi-linha de até 500 concursos, à medida que chegam
 try:
-    with open('loto.sql', 'w') as f:
-        f.write("INSERT INTO loto (data_concurso, concurso, dezenas) VALUES\n")
-        f.write(',\n'.join(comandos_insert))
-        f.write(';')
+    resumo = sincronizar(
+        [DestinoDumpSQL('loto.sql')],
+        BuscadorConcursos(cache=CacheRespostas(), verificar_ssl=False),
+        offline=offline,
+        status_callback=tqdm.write,
+    )
 except OSError as e:
     tqdm.write(f"Erro ao escrever no arquivo loto.sql: {e}")
+    resumo = None
 
-tqdm.write("Download concluído com sucesso!")
+if resumo is not None:
+    tqdm.write("Download concluído com sucesso!")